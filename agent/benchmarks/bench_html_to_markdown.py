@@ -0,0 +1,159 @@
+"""
+Benchmark of the HTML to markdown conversion over a corpus of saved web pages.
+
+Compares the lxml conversion (`html_to_markdown`) with the original BeautifulSoup
++ prettify one (`html_to_markdown_bs4`) and reports the time per page, the peak
+Python memory and the resident memory growth of each implementation.
+
+Usage (from the `agent` folder):
+
+    # Save the homepages listed in benchmarks/homepages.txt into a corpus folder
+    python -m benchmarks.bench_html_to_markdown --fetch benchmarks/homepages.txt --corpus benchmarks/corpus
+
+    # Run the benchmark on the saved pages
+    python -m benchmarks.bench_html_to_markdown --corpus benchmarks/corpus
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import statistics
+import subprocess
+import tracemalloc
+from difflib import SequenceMatcher
+from urllib.parse import urlsplit
+
+IMPLEMENTATIONS = {
+    "bs4": "html_to_markdown_bs4",
+    "lxml": "html_to_markdown",
+}
+
+
+def load_corpus(corpus_dir):
+    pages = {}
+    for file_name in sorted(os.listdir(corpus_dir)):
+        if file_name.endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, file_name), encoding="utf-8", errors="replace") as f:
+                pages[file_name] = f.read()
+    return pages
+
+
+def fetch_corpus(urls_file, corpus_dir):
+    from sample_agent.tools.base.web_fetcher import fetch_url
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    with open(urls_file) as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    for url in urls:
+        result = fetch_url(url)
+        if not result.text:
+            print(f"Skipping {url}: {result.reason} ({result.status_code})")
+            continue
+        file_name = urlsplit(url).netloc.replace(":", "_") + ".html"
+        with open(os.path.join(corpus_dir, file_name), "w", encoding="utf-8") as f:
+            f.write(result.text)
+        print(f"Saved {url} ({len(result.text) / 1024:.0f} KB)")
+
+
+def _max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def run_worker(implementation, corpus_dir, repeat):
+    """
+    Benchmarks one implementation, runs in its own process so memory numbers are not shared.
+    """
+    from sample_agent.tools.base import markdown_scraper_tool
+
+    convert = getattr(markdown_scraper_tool, IMPLEMENTATIONS[implementation])
+    pages = load_corpus(corpus_dir)
+    base_rss = _max_rss_mb()
+
+    # Timings, best of `repeat` runs per page
+    timings = {}
+    outputs = {}
+    for name, html in pages.items():
+        durations = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            outputs[name] = convert(html)
+            durations.append((time.perf_counter() - started_at) * 1000)
+        timings[name] = min(durations)
+    rss_growth = _max_rss_mb() - base_rss
+
+    # Peak Python memory, measured separately as tracing slows the conversion down
+    peak_memory = 0
+    for html in pages.values():
+        tracemalloc.start()
+        convert(html)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    json.dump({
+        "timings": timings,
+        "outputs": outputs,
+        "peak_memory_mb": peak_memory / (1024 * 1024),
+        "rss_growth_mb": rss_growth,
+    }, sys.stdout)
+
+
+def run_benchmark(corpus_dir, repeat):
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        print(f"No .html pages found in {corpus_dir}")
+        return
+    total_kb = sum(len(html) for html in pages.values()) / 1024
+    print(f"Corpus: {len(pages)} pages, {total_kb:.0f} KB\n")
+
+    results = {}
+    for implementation in IMPLEMENTATIONS:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_html_to_markdown",
+             "--worker", implementation, "--corpus", corpus_dir, "--repeat", str(repeat)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[implementation] = json.loads(output)
+
+    print(f"{'Implementation':<16}{'mean ms/page':>14}{'median ms/page':>16}{'p95 ms/page':>13}{'peak py MB':>12}{'RSS +MB':>10}{'output chars':>14}")
+    for implementation, result in results.items():
+        timings = sorted(result["timings"].values())
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        output_chars = sum(len(markdown) for markdown in result["outputs"].values())
+        print(
+            f"{implementation:<16}{statistics.mean(timings):>14.1f}{statistics.median(timings):>16.1f}{p95:>13.1f}"
+            f"{result['peak_memory_mb']:>12.1f}{result['rss_growth_mb']:>10.1f}{output_chars:>14}"
+        )
+
+    # How close the new markdown is to the original one, lower chars with a high
+    # similarity means only boilerplate was removed
+    similarities = [
+        SequenceMatcher(None, results["bs4"]["outputs"][name], results["lxml"]["outputs"][name], autojunk=False).quick_ratio()
+        for name in pages
+    ]
+    identical = sum(results["bs4"]["outputs"][name] == results["lxml"]["outputs"][name] for name in pages)
+    speedup = statistics.mean(results["bs4"]["timings"].values()) / max(statistics.mean(results["lxml"]["timings"].values()), 1e-9)
+    print(f"\nSpeedup: {speedup:.1f}x, identical outputs: {identical}/{len(pages)}, mean similarity: {statistics.mean(similarities):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML to markdown conversion")
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "corpus"), help="Folder of saved .html pages")
+    parser.add_argument("--fetch", help="File with one URL per line to download into the corpus folder")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of conversions per page, the best one is kept")
+    parser.add_argument("--worker", choices=IMPLEMENTATIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.corpus, args.repeat)
+    elif args.fetch:
+        fetch_corpus(args.fetch, args.corpus)
+    else:
+        run_benchmark(args.corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
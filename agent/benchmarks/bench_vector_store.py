@@ -0,0 +1,106 @@
+"""
+Benchmark of the case studies vector store backends (NumPy vs Chroma).
+
+Reports the import time, the cold start (open the index and run the first query)
+and the query latency of each backend. Embeddings are deterministic fake vectors so
+only the stores are measured, not the embedding API.
+
+Usage (from the `agent` folder):
+
+    python -m benchmarks.bench_vector_store --documents 50 --queries 200
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BACKENDS = ("numpy", "chroma")
+BACKEND_IMPORTS = {
+    "numpy": "import sample_agent.tools.vector_index",
+    "chroma": "import sample_agent.tools.vector_index; import langchain_chroma",
+}
+EMBEDDING_SIZE = 768
+
+
+def _embeddings():
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    return DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+
+def measure_import_time(backend):
+    # Fresh interpreter each time, modules already imported would hide the cost
+    code = f"import time; started_at = time.perf_counter(); {BACKEND_IMPORTS[backend]}; print(time.perf_counter() - started_at)"
+    return float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout) * 1000
+
+
+def build_index(backend, index_path, documents):
+    from langchain_core.documents import Document
+    from sample_agent.tools.vector_index import create_vector_store
+
+    store = create_vector_store(backend, index_path, _embeddings())
+    docs = [Document(page_content=text, metadata={"source": f"doc-{i}"}) for i, text in enumerate(documents)]
+    store.add_documents(docs, ids=[f"doc-{i}" for i in range(len(docs))])
+
+
+def run_worker(backend, index_path, queries):
+    """
+    Opens an existing index in a fresh process and times the cold start and the queries.
+    """
+    started_at = time.perf_counter()
+    from sample_agent.tools.vector_index import create_vector_store
+
+    store = create_vector_store(backend, index_path, _embeddings())
+    store.similarity_search(queries[0], k=1)
+    cold_start = (time.perf_counter() - started_at) * 1000
+
+    latencies = []
+    for query in queries:
+        query_started_at = time.perf_counter()
+        store.similarity_search(query, k=1)
+        latencies.append((time.perf_counter() - query_started_at) * 1000)
+    json.dump({"cold_start_ms": cold_start, "latencies_ms": latencies}, sys.stdout)
+
+
+def run_benchmark(number_documents, number_queries):
+    documents = [f"Case study {i}: " + " ".join(f"topic{(i * j) % 97}" for j in range(200)) for i in range(number_documents)]
+    queries = [f"lead research report {i} topic{i % 97}" for i in range(number_queries)]
+    print(f"{number_documents} documents, {number_queries} queries, {EMBEDDING_SIZE} dimensions\n")
+    print(f"{'Backend':<10}{'import ms':>12}{'cold start ms':>16}{'median query ms':>18}{'p95 query ms':>15}")
+
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as index_path:
+            try:
+                import_time = measure_import_time(backend)
+                build_index(backend, index_path, documents)
+            except (ImportError, subprocess.CalledProcessError) as e:
+                print(f"{backend:<10}skipped ({e})")
+                continue
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_vector_store", "--worker", backend, "--index", index_path],
+                input=json.dumps(queries), check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            latencies = sorted(result["latencies_ms"])
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"{backend:<10}{import_time:>12.0f}{result['cold_start_ms']:>16.1f}{statistics.median(latencies):>18.3f}{p95:>15.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the case studies vector store backends")
+    parser.add_argument("--documents", type=int, default=50, help="Number of indexed documents")
+    parser.add_argument("--queries", type=int, default=200, help="Number of timed queries")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--index", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.index, json.load(sys.stdin))
+    else:
+        run_benchmark(args.documents, args.queries)
+
+
+if __name__ == "__main__":
+    main()
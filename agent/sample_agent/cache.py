@@ -0,0 +1,298 @@
+import os
+import json
+import zlib
+import time
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Default folder for all local caches, can be changed with AGENT_CACHE_DIR
+CACHE_DIR = os.getenv(
+    "AGENT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+
+
+class SQLiteCache:
+    """
+    Persistent key/value store backed by a local SQLite file.
+
+    Values are stored as JSON. Entries expire after `ttl` seconds and the least
+    recently used entries are evicted once `max_entries` or `max_bytes` is exceeded.
+    The connection is shared between threads and guarded by a lock.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=None, max_bytes=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries(accessed_at)")
+
+    def _is_expired(self, created_at, now, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        return ttl is not None and now - created_at > ttl
+
+    def get(self, key, ttl=None):
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+        `ttl` overrides the store freshness window for this lookup.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._is_expired(created_at, now, ttl):
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._decode(value)
+
+    def set(self, key, value):
+        """
+        Stores `value` under `key` and evicts old entries if the store is over its limits.
+        """
+        blob = self._encode(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._evict(now)
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict(self, now):
+        # Drop expired entries first
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+
+        # Then least recently used entries above the count limit
+        if self.max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+        # And least recently used entries above the size limit
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                to_free = total - self.max_bytes
+                stale_keys = []
+                for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                    stale_keys.append((key,))
+                    to_free -= size
+                    if to_free <= 0:
+                        break
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+
+    def _encode(self, value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def _decode(self, blob):
+        return json.loads(blob)
+
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CompressedSQLiteCache(SQLiteCache):
+    """
+    `SQLiteCache` storing compressed JSON blobs, with zstd when the `zstandard`
+    package is installed and zlib otherwise. Each blob starts with a one byte
+    codec marker so stores written with either codec stay readable.
+    """
+
+    ZSTD, ZLIB = b"z", b"d"
+
+    def __init__(self, path, ttl=None, max_entries=None, max_bytes=None, level=3):
+        super().__init__(path, ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        self.level = level
+        # zstd contexts are not thread safe
+        self._codec = threading.local()
+
+    def _encode(self, value):
+        data = super()._encode(value)
+        if zstandard is not None:
+            compressor = getattr(self._codec, "compressor", None)
+            if compressor is None:
+                compressor = self._codec.compressor = zstandard.ZstdCompressor(level=self.level)
+            return self.ZSTD + compressor.compress(data)
+        return self.ZLIB + zlib.compress(data, self.level)
+
+    def _decode(self, blob):
+        marker, data = bytes(blob[:1]), blob[1:]
+        if marker == self.ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Cache entry is zstd compressed but 'zstandard' is not installed")
+            decompressor = getattr(self._codec, "decompressor", None)
+            if decompressor is None:
+                decompressor = self._codec.decompressor = zstandard.ZstdDecompressor()
+            data = decompressor.decompress(data)
+        else:
+            data = zlib.decompress(data)
+        return super()._decode(data)
+
+
+class TTLCache:
+    """
+    In-memory cache with a freshness window that coalesces concurrent lookups.
+
+    While a value is being computed, other threads or asyncio tasks asking for the
+    same key wait for that computation instead of starting their own ("single-flight").
+    Only values accepted by `cache_if` are stored, failures are never cached.
+    """
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key):
+        """
+        Returns (found, value, future, is_owner) and registers a new in-flight
+        computation when the caller has to compute the value itself.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value, None, False
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, None, future, False
+
+            future = Future()
+            self._inflight[key] = future
+            self.misses += 1
+            return False, None, future, True
+
+    def _complete(self, key, future, value=None, error=None, cache_if=None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and (cache_if is None or cache_if(value)):
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_compute(self, key, compute, cache_if=None):
+        found, value, future, is_owner = self._lookup(key)
+        if found:
+            return value
+        if not is_owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            self._complete(key, future, error=e)
+            raise
+        self._complete(key, future, value, cache_if=cache_if)
+        return value
+
+    async def aget_or_compute(self, key, compute, cache_if=None):
+        """
+        Async version of `get_or_compute`, `compute` is a coroutine function.
+        """
+        found, value, future, is_owner = self._lookup(key)
+        if found:
+            return value
+        if not is_owner:
+            return await asyncio.wrap_future(future)
+        try:
+            value = await compute()
+        except BaseException as e:
+            self._complete(key, future, error=e)
+            raise
+        self._complete(key, future, value, cache_if=cache_if)
+        return value
+
+    def get(self, key):
+        """
+        Returns the fresh value of `key`, or None, without waiting for in-flight computations.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+            }
@@ -4,6 +4,7 @@ through our FastAPI integration. However, you can also host in LangGraph platfor
 """
 
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 load_dotenv() # pylint: disable=wrong-import-position
 
@@ -12,8 +13,18 @@ import uvicorn
 from copilotkit.integrations.fastapi import add_fastapi_endpoint
 from copilotkit import CopilotKitRemoteEndpoint, LangGraphAgent
 from sample_agent.agent import graph
+from sample_agent.tools.rag_tool import preload_vector_store
 
-app = FastAPI()
+# Open the case studies vector store at startup instead of during the first lead
+PRELOAD_VECTOR_STORE = os.getenv("PRELOAD_VECTOR_STORE", "true").lower() in ("1", "true", "yes")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PRELOAD_VECTOR_STORE:
+        preload_vector_store()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 sdk = CopilotKitRemoteEndpoint(
     agents=[
         LangGraphAgent(
@@ -1,50 +1,63 @@
 from langgraph.graph import END, StateGraph
-from nodes import OutReachAutomationNodes
-from state import GraphState
-from tools.leads_loader.lead_loader_base import LeadLoaderBase
+from sample_agent.nodes import OutReachAutomationNodes, LEADS_CONCURRENCY
+from sample_agent.state import GraphState, LeadState
+from sample_agent.tools.leads_loader.lead_loader_base import LeadLoaderBase
+
+# Nodes with an async implementation, named with an "a" prefix (e.g. `ascore_lead`)
+ASYNC_NODES = {
+    "fetch_linkedin_profile_data",
+    "review_company_website",
+    "analyze_blog_content",
+    "analyze_social_media_content",
+    "analyze_recent_news",
+    "generate_full_lead_research_report",
+    "generate_digital_presence_report",
+    "score_lead",
+    "generate_custom_outreach_report",
+    "generate_personalized_email",
+    "generate_interview_script",
+}
 
 
 class OutReachAutomation:
-    def __init__(self, loader: LeadLoaderBase):
+    def __init__(self, loader: LeadLoaderBase, parallel=LEADS_CONCURRENCY > 1, max_concurrency=LEADS_CONCURRENCY):
         # Initialize the automation workflow by building the graph
-        self.app = self.build_graph(loader)
+        self.app = self.build_graph(loader, parallel, max_concurrency)
 
-    def build_graph(self, loader:LeadLoaderBase):
+    def build_graph(self, loader:LeadLoaderBase, parallel=False, max_concurrency=LEADS_CONCURRENCY):
         """
         Constructs the state graph for the outreach automation workflow.
         """
-        # Create the main graph with a predefined state
-        graph = StateGraph(GraphState)
-        
         # Initialize the nodes with the provided lead loader
         nodes = OutReachAutomationNodes(loader)
+        return self.build_workflow(nodes, GraphState, parallel, max_concurrency).compile()
+
+    @classmethod
+    def build_workflow(cls, nodes: OutReachAutomationNodes, state_schema=GraphState, parallel=False,
+                       max_concurrency=LEADS_CONCURRENCY, use_async=False):
+        """
+        Constructs the (uncompiled) workflow graph over `state_schema`, shared by the CLI
+        and the served agent.
+
+        In sequential mode leads are processed one after another in a loop. In parallel
+        mode every lead is fanned out to its own lead subgraph run, with at most
+        `max_concurrency` leads processed at the same time. With `use_async` the
+        research and writing nodes use their async implementations.
+        """
+        if parallel:
+            return cls.build_parallel_workflow(nodes, state_schema, max_concurrency, use_async)
+
+        # Create the main graph with a predefined state
+        graph = StateGraph(state_schema)
 
         # **Step 1: Adding nodes to the graph**
         # Fetch new leads from the CRM
         graph.add_node("get_new_leads", nodes.get_new_leads)
         graph.add_node("check_for_remaining_leads", nodes.check_for_remaining_leads)
+        graph.add_node("summarize_run", nodes.summarize_run)
 
-        # Research phase: gather data and insights about the lead
-        graph.add_node("fetch_linkedin_profile_data", nodes.fetch_linkedin_profile_data)
-        graph.add_node("review_company_website", nodes.review_company_website)
-        graph.add_node("collect_company_information", nodes.collect_company_information)
-        graph.add_node("analyze_blog_content", nodes.analyze_blog_content)
-        graph.add_node("analyze_social_media_content", nodes.analyze_social_media_content)
-        graph.add_node("analyze_recent_news", nodes.analyze_recent_news)
-        graph.add_node("generate_full_lead_research_report", nodes.generate_full_lead_research_report)
-        graph.add_node("generate_digital_presence_report", nodes.generate_digital_presence_report)
-        graph.add_node("score_lead", nodes.score_lead)
-
-        # Outreach preparation phase
-        graph.add_node("create_outreach_materials", nodes.create_outreach_materials)
-        graph.add_node("generate_custom_outreach_report", nodes.generate_custom_outreach_report)
-        graph.add_node("generate_personalized_email", nodes.generate_personalized_email)
-        graph.add_node("generate_interview_script", nodes.generate_interview_script)
-
-        # Reporting and finalization
-        graph.add_node("save_reports_to_google_docs", nodes.save_reports_to_google_docs)
-        graph.add_node("await_reports_creation", nodes.await_reports_creation)
-        graph.add_node("update_CRM", nodes.update_CRM)
+        # Research, outreach and reporting nodes
+        cls.add_lead_pipeline(graph, nodes, use_async)
 
         # **Step 2: Setting up edges between nodes**
 
@@ -60,10 +73,81 @@ class OutReachAutomation:
             nodes.check_if_there_more_leads,
             {
                 "Found leads": "fetch_linkedin_profile_data",  # Proceed if leads are found
-                "No more leads": END  # Terminate if no leads remain
+                "No more leads": "summarize_run"  # Report the run metrics and terminate if no leads remain
             }
         )
 
+        # Loop back to check for remaining leads
+        graph.add_edge("update_CRM", "check_for_remaining_leads")
+        graph.add_edge("summarize_run", END)
+        return graph
+
+    @classmethod
+    def build_lead_graph(cls, nodes: OutReachAutomationNodes, use_async=False):
+        """
+        Constructs the subgraph processing a single lead, from research to CRM update.
+        """
+        graph = StateGraph(LeadState)
+        cls.add_lead_pipeline(graph, nodes, use_async)
+        graph.set_entry_point("fetch_linkedin_profile_data")
+        graph.add_edge("update_CRM", END)
+        return graph.compile()
+
+    @classmethod
+    def build_parallel_workflow(cls, nodes: OutReachAutomationNodes, state_schema=GraphState,
+                                max_concurrency=LEADS_CONCURRENCY, use_async=False):
+        """
+        Constructs the graph fanning leads out to concurrent lead subgraph runs.
+        """
+        lead_graph = cls.build_lead_graph(nodes, use_async)
+        if use_async:
+            process_lead = nodes.make_async_lead_processor(lead_graph, max_concurrency)
+        else:
+            process_lead = nodes.make_lead_processor(lead_graph, max_concurrency)
+
+        graph = StateGraph(state_schema)
+        graph.add_node("get_new_leads", nodes.get_new_leads)
+        graph.add_node("process_lead", process_lead)
+        graph.add_node("summarize_run", nodes.summarize_run)
+
+        graph.set_entry_point("get_new_leads")
+        graph.add_conditional_edges("get_new_leads", nodes.fan_out_leads, ["process_lead", "summarize_run"])
+        graph.add_edge("process_lead", "summarize_run")
+        graph.add_edge("summarize_run", END)
+        return graph
+
+    @staticmethod
+    def add_lead_pipeline(graph: StateGraph, nodes: OutReachAutomationNodes, use_async=False):
+        """
+        Adds the per-lead nodes and edges, from `fetch_linkedin_profile_data` to `update_CRM`.
+        With `use_async` the nodes of ASYNC_NODES use their async implementations, so
+        concurrent agent sessions share the server event loop.
+        """
+        def node(name):
+            return getattr(nodes, f"a{name}" if use_async and name in ASYNC_NODES else name)
+
+        # Research phase: gather data and insights about the lead
+        graph.add_node("fetch_linkedin_profile_data", node("fetch_linkedin_profile_data"))
+        graph.add_node("review_company_website", node("review_company_website"))
+        graph.add_node("collect_company_information", node("collect_company_information"))
+        graph.add_node("analyze_blog_content", node("analyze_blog_content"))
+        graph.add_node("analyze_social_media_content", node("analyze_social_media_content"))
+        graph.add_node("analyze_recent_news", node("analyze_recent_news"))
+        graph.add_node("generate_full_lead_research_report", node("generate_full_lead_research_report"))
+        graph.add_node("generate_digital_presence_report", node("generate_digital_presence_report"))
+        graph.add_node("score_lead", node("score_lead"))
+
+        # Outreach preparation phase
+        graph.add_node("create_outreach_materials", node("create_outreach_materials"))
+        graph.add_node("generate_custom_outreach_report", node("generate_custom_outreach_report"))
+        graph.add_node("generate_personalized_email", node("generate_personalized_email"))
+        graph.add_node("generate_interview_script", node("generate_interview_script"))
+
+        # Reporting and finalization
+        graph.add_node("save_reports_to_google_docs", node("save_reports_to_google_docs"))
+        graph.add_node("await_reports_creation", node("await_reports_creation"))
+        graph.add_node("update_CRM", node("update_CRM"))
+
         # Research phase transitions
         graph.add_edge("fetch_linkedin_profile_data", "review_company_website")
         graph.add_edge("review_company_website", "collect_company_information")
@@ -102,9 +186,3 @@ class OutReachAutomation:
 
         # Save reports and update the CRM
         graph.add_edge("save_reports_to_google_docs", "update_CRM")
-
-        # Loop back to check for remaining leads
-        graph.add_edge("update_CRM", "check_for_remaining_leads")
-        return graph.compile()
-
-
@@ -1,9 +1,9 @@
 import os
 from dotenv import load_dotenv
-from src.graph import OutReachAutomation
-from src.state import *
-from tools.leads_loader.airtable import AirtableLeadLoader
-from tools.leads_loader.google_sheets import GoogleSheetLeadLoader
+from sample_agent.graph import OutReachAutomation
+from sample_agent.state import *
+from sample_agent.tools.leads_loader.airtable import AirtableLeadLoader
+from sample_agent.tools.leads_loader.google_sheets import GoogleSheetLeadLoader
 
 # Load environment variables from a .env file
 load_dotenv()
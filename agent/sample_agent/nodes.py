@@ -1,17 +1,30 @@
+import os
+import time
+import asyncio
+import threading
 from colorama import Fore, Style
-from sample_agent.tools.base.markdown_scraper_tool import scrape_website_to_markdown
-from sample_agent.tools.base.search_tools import get_recent_news
+from sample_agent.tools.base.markdown_scraper_tool import scrape_website, ascrape_website
+from sample_agent.tools.base.blog_crawler import crawl_blog, acrawl_blog
+from sample_agent.tools.base.content_extractor import extract_main_content, get_content_extraction_stats
+from sample_agent.tools.base.search_tools import google_search, agoogle_search, get_recent_news, aget_recent_news, search_cache
 from sample_agent.tools.base.gmail_tools import GmailTools
+from sample_agent.tools.base.linkedin_tools import get_linkedin_match_stats
+from sample_agent.tools.base.rate_limiter import get_rate_limit_metrics
 from sample_agent.tools.google_docs_tools import GoogleDocsManager
-from sample_agent.tools.company_research import research_lead_on_linkedin
-from sample_agent.tools.company_research import research_lead_company, generate_company_profile
-from sample_agent.tools.youtube_tools import get_youtube_stats
+from sample_agent.tools.company_research import research_lead_on_linkedin, aresearch_lead_on_linkedin
+from sample_agent.tools.company_research import research_lead_company, generate_company_profile, agenerate_company_profile
+from sample_agent.tools.youtube_tools import get_youtube_stats, get_youtube_quota_usage
+from sample_agent.tools.company_store import get_company_key, get_or_research, aget_or_research, get_company_store_stats
 from sample_agent.tools.rag_tool import fetch_similar_case_study
+from sample_agent.tools.embeddings import get_embedding_stats
 from sample_agent.prompts import *
-from sample_agent.state import LeadData, CompanyData, Report, GraphInputState, GraphState
+from sample_agent.state import LeadData, CompanyData, Report, GraphInputState, GraphState, LeadState
 from sample_agent.structured_outputs import WebsiteData, EmailResponse
-from sample_agent.utils import invoke_llm, get_report, get_current_date, save_reports_locally
+from sample_agent.utils import invoke_llm, ainvoke_llm, get_report, get_current_date, save_reports_locally
+from sample_agent.utils import get_llm_cache_stats, get_llm_registry_stats
 from loguru import logger
+from langgraph.types import Send
+from langchain_core.runnables import RunnableConfig
 
 # Enable or disable sending emails directly using GMAIL
 # Should be confident about the quality of the email
@@ -19,17 +32,104 @@ SEND_EMAIL_DIRECTLY = False
 # Enable or disable saving emails to Google Docs
 # By defauly all reports are save locally in `reports` folder
 SAVE_TO_GOOGLE_DOCS = False
+# Number of leads processed concurrently, leads run one after another when set to 1
+LEADS_CONCURRENCY = int(os.getenv("LEADS_CONCURRENCY", "1"))
+
+def find_company_website(search_results):
+    """
+    Returns the first search result link that looks like a company website.
+    """
+    for result in search_results or []:
+        link = result.get('link', '')
+        if any(domain in link.lower() for domain in ['.com', '.org', '.net', '.io']) and not any(exclude in link.lower() for exclude in ['linkedin.com', 'facebook.com', 'twitter.com']):
+            return link
+    return ""
+
+def build_lead_search_inputs(lead_data, company_data):
+    return f"""
+        # **Lead Profile:**
+
+        {lead_data.profile}
+
+        # **Company Information:**
+
+        {company_data.profile}
+        """
+
+def build_digital_presence_inputs(reports):
+    blog_analysis_report = get_report(reports, "Blog Analysis Report")
+    facebook_analysis_report = get_report(reports, "Facebook Analysis Report")
+    twitter_analysis_report = get_report(reports, "Twitter Analysis Report")
+    youtube_analysis_report = get_report(reports, "Youtube Analysis Report")
+    news_analysis_report = get_report(reports, "News Analysis Report")
+    
+    return f"""
+        # **Digital Presence Data:**
+        ## **Blog Information:**
+
+        {blog_analysis_report}
+        
+        ## **Facebook Information:**
+
+        {facebook_analysis_report}
+        
+        ## **Twitter Information:**
+
+        {twitter_analysis_report}
+
+        ## **Youtube Information:**
+
+        {youtube_analysis_report}
+
+        # **Recent News:**
+
+        {news_analysis_report}
+        """
+
+def build_full_lead_research_inputs(reports):
+    general_lead_search_report = get_report(reports, "General Lead Research Report")
+    digital_presence_report = get_report(reports, "Digital Presence Report")
+    
+    return f"""
+        # **Lead & company Information:**
+
+        {general_lead_search_report}
+        
+        ---
+
+        # **Digital Presence Information:**
+
+        {digital_presence_report}
+        """
+
+def get_news_company_name(state):
+    # Use company name for news search, fallback to lead's company if company_data.name is empty
+    company_data = state["company_data"]
+    current_lead = state.get("current_lead")
+    return company_data.name if company_data.name else getattr(current_lead, "company", "")
+
+def build_news_insight(company_name, recent_news):
+    """
+    Returns the fallback news insight when there is nothing for the LLM to analyze, else None.
+    """
+    if not recent_news or recent_news.strip() == "" or recent_news.startswith("Error fetching news"):
+        if company_name:
+            return f"No recent news found for {company_name} in the last 6 months."
+        return "No company name available for news search."
+    return None
 
 class OutReachAutomationNodes:
     def __init__(self, loader):
         self.lead_loader = loader
         self.docs_manager = GoogleDocsManager()
-        self.drive_folder_name = ""
 
     def get_new_leads(self, state: GraphInputState):
         logger.info("Entering get_new_leads with state: {}", state)
         print(Fore.YELLOW + "----- Fetching new leads -----\n" + Style.RESET_ALL)
         
+        # Drive folders are resolved again on each run, they may have been moved or deleted since
+        self.docs_manager.clear_folder_cache()
+
         # Fetch new leads using the provided loader
         raw_leads = self.lead_loader.fetch_records()
         
@@ -49,7 +149,48 @@ class OutReachAutomationNodes:
         
         print(Fore.YELLOW + f"----- Fetched {len(leads)} leads -----\n" + Style.RESET_ALL)
         logger.info("Fetched leads: {}", leads)
-        return {"leads_data": leads, "number_leads": len(leads)}
+        return {"leads_data": leads, "number_leads": len(leads), "run_started_at": time.time()}
+
+    @staticmethod
+    def fan_out_leads(state: GraphState):
+        """
+        Sends every fetched lead to its own lead subgraph run, in parallel execution mode.
+        """
+        leads = state["leads_data"]
+        if not leads:
+            print(Fore.GREEN + "----- Finished, No leads to process -----\n" + Style.RESET_ALL)
+            return "summarize_run"
+        print(Fore.YELLOW + f"----- Dispatching {len(leads)} leads in parallel -----\n" + Style.RESET_ALL)
+        logger.info("Dispatching {} leads in parallel", len(leads))
+        return [Send("process_lead", {"current_lead": lead, "reports": []}) for lead in leads]
+
+    @staticmethod
+    def summarize_run(state: GraphState):
+        """
+        Reports the number of processed leads and the throughput of the run.
+        """
+        processed_leads = state.get("processed_leads", [])
+        elapsed_minutes = max(time.time() - state.get("run_started_at", time.time()), 1e-6) / 60
+        leads_per_minute = len(processed_leads) / elapsed_minutes
+        print(Fore.GREEN + f"----- Processed {len(processed_leads)} leads in {elapsed_minutes:.1f} min ({leads_per_minute:.2f} leads/min) -----\n" + Style.RESET_ALL)
+        logger.info("Processed {} leads in {:.1f} min ({:.2f} leads/min)", len(processed_leads), elapsed_minutes, leads_per_minute)
+        failed_leads = state.get("failed_leads", [])
+        if failed_leads:
+            print(Fore.RED + f"----- {len(failed_leads)} leads failed: {', '.join(failed_leads)} -----\n" + Style.RESET_ALL)
+            logger.warning("{} leads failed: {}", len(failed_leads), failed_leads)
+        google_docs_timings = state.get("google_docs_timings", [])
+        if google_docs_timings:
+            logger.info("Google Docs upload timings: {}", google_docs_timings)
+        logger.info("Rate limiter metrics: {}", get_rate_limit_metrics())
+        logger.info("Search cache stats: {}", search_cache.get_stats())
+        logger.info("LLM response cache stats: {}", get_llm_cache_stats())
+        logger.info("LLM client registry stats: {}", get_llm_registry_stats())
+        logger.info("LinkedIn URL match stats: {}", get_linkedin_match_stats())
+        logger.info("Company research store stats: {}", get_company_store_stats())
+        logger.info("Content extraction token stats: {}", get_content_extraction_stats())
+        logger.info("YouTube API quota usage: {}", get_youtube_quota_usage())
+        logger.info("Embedding latency stats: {}", get_embedding_stats())
+        return {}
     
     @staticmethod
     def check_for_remaining_leads(state: GraphState):
@@ -95,38 +236,72 @@ class OutReachAutomationNodes:
 
         # If LinkedIn failed to get company info, try to search for company information
         if not company_name and lead_data.company:
-            print(Fore.YELLOW + "----- LinkedIn failed, searching for company information -----\n" + Style.RESET_ALL)
-            # Use the company name from the lead data as fallback
-            company_name = lead_data.company.strip()
+            company_name = self._fallback_company_name(lead_data)
             
             # Search for company website
             try:
-                from sample_agent.tools.company_research import google_search
-                search_results = google_search(f"{company_name} official website")
-                if search_results:
-                    # Extract the first result that looks like a company website
-                    for result in search_results:
-                        link = result.get('link', '')
-                        if any(domain in link.lower() for domain in ['.com', '.org', '.net', '.io']) and not any(exclude in link.lower() for exclude in ['linkedin.com', 'facebook.com', 'twitter.com']):
-                            company_website = link
-                            break
+                search_results = google_search(self._company_website_query(company_name))
+                company_website = find_company_website(search_results) or company_website
             except Exception as e:
                 print(f"Error searching for company website: {e}")
                 company_website = ""
 
+        return self._update_lead_and_company(lead_data, company_data, company_name, company_website, company_linkedin_url)
+
+    async def afetch_linkedin_profile_data(self, state: GraphState):
+        """
+        Async version of `fetch_linkedin_profile_data`.
+        """
+        logger.info("Fetching LinkedIn profile data for state: {}", state)
+        print(Fore.YELLOW + "----- Searching Lead data on LinkedIn -----\n" + Style.RESET_ALL)
+        lead_data = state["current_lead"]
+        company_data = state.get("company_data", CompanyData())
+        
+        (
+            lead_profile, 
+            company_name, 
+            company_website,
+            company_linkedin_url
+        ) = await aresearch_lead_on_linkedin(lead_data.name, lead_data.company)
+        lead_data.profile = lead_profile
+
+        if not company_name and lead_data.company:
+            company_name = self._fallback_company_name(lead_data)
+            try:
+                search_results = await agoogle_search(self._company_website_query(company_name))
+                company_website = find_company_website(search_results) or company_website
+            except Exception as e:
+                print(f"Error searching for company website: {e}")
+                company_website = ""
+
+        return self._update_lead_and_company(lead_data, company_data, company_name, company_website, company_linkedin_url)
+
+    @staticmethod
+    def _fallback_company_name(lead_data):
+        print(Fore.YELLOW + "----- LinkedIn failed, searching for company information -----\n" + Style.RESET_ALL)
+        # Use the company name from the lead data as fallback
+        return lead_data.company.strip()
+
+    @staticmethod
+    def _company_website_query(company_name):
+        return f"{company_name} official website"
+
+    @staticmethod
+    def _update_lead_and_company(lead_data, company_data, company_name, company_website, company_linkedin_url):
         # Use company info from research_lead_on_linkedin directly
         company_data.name = company_name
         company_data.website = company_website
         company_data.profile = f"LinkedIn URL: {company_linkedin_url}" if company_linkedin_url else ""
             
-        # Update folder name for saving reports in Drive
-        self.drive_folder_name = f"{lead_data.name}_{company_data.name}"
+        # Update folder name for saving reports in Drive, kept in the state so parallel leads don't share it
+        drive_folder_name = f"{lead_data.name}_{company_data.name}"
         
         print(Fore.YELLOW + f"----- Updated lead_data: {lead_data} and company_data: {company_data} -----\n" + Style.RESET_ALL)
         logger.info("Updated lead_data: {} and company_data: {}", lead_data, company_data)
         return {
             "current_lead": lead_data,
             "company_data": company_data,
+            "drive_folder_name": drive_folder_name,
             "reports": []
         }
     
@@ -136,61 +311,138 @@ class OutReachAutomationNodes:
         lead_data = state.get("current_lead")
         company_data = state.get("company_data")
         
+        # Website research is shared by all the leads of the company, the company key
+        # is computed once here and used by the other company research nodes
+        company_key = get_company_key(company_data, lead_data.company)
+        researched_company = get_or_research(
+            company_key, "website", lambda: self._research_company_website(company_data.model_copy(deep=True)),
+            cache_if=self._is_website_analyzed(company_data)
+        )
+        company_data = self._merge_company_research(company_data, researched_company)
+                 
+        # Generate general lead search report
+        general_lead_search_report = invoke_llm(**self._lead_search_request(lead_data, company_data))
+        return self._website_review_result(company_data, company_key, general_lead_search_report)
+
+    def _research_company_website(self, company_data):
+        """
+        Finds, scrapes and analyzes the company website, returns the updated company data.
+        """
         company_website = company_data.website
         
         # If no website but we have company name, try to find it
         if not company_website and company_data.name:
             print(Fore.YELLOW + "----- No website found, searching for company website -----\n" + Style.RESET_ALL)
             try:
-                from sample_agent.tools.company_research import google_search
-                search_results = google_search(f"{company_data.name} official website")
-                if search_results:
-                    # Extract the first result that looks like a company website
-                    for result in search_results:
-                        link = result.get('link', '')
-                        if any(domain in link.lower() for domain in ['.com', '.org', '.net', '.io']) and not any(exclude in link.lower() for exclude in ['linkedin.com', 'facebook.com', 'twitter.com']):
-                            company_website = link
-                            company_data.website = link
-                            break
+                search_results = google_search(self._company_website_query(company_data.name))
+                # Extract the first result that looks like a company website
+                company_website = find_company_website(search_results)
+                if company_website:
+                    company_data.website = company_website
             except Exception as e:
                 print(f"Error searching for company website: {e}")
         
-        if company_website:
-            # Scrape company website
-            content = scrape_website_to_markdown(company_website)
-            website_info = invoke_llm(
-                system_prompt=WEBSITE_ANALYSIS_PROMPT.format(main_url=company_website), 
-                user_message=content,
-                model="gemini-2.5-flash",
-                response_format=WebsiteData
-            )
+        # Scrape company website, there is nothing to analyze when it could not be fetched
+        if not company_website:
+            return company_data
+        page = scrape_website(company_website)
+
+        # Blog and social media links come straight from the page links
+        self._update_social_media_links(company_data, page.social_media_links)
+
+        content = extract_main_content(page.markdown, label="website")
+        if content:
+            website_info = invoke_llm(**self._website_analysis_request(company_website, content))
 
-            # Extract all relevant links
-            company_data.social_media_links.blog = website_info.blog_url
-            company_data.social_media_links.facebook = website_info.facebook
-            company_data.social_media_links.twitter = website_info.twitter
-            company_data.social_media_links.youtube = website_info.youtube
-            
             # Update company profile with website summary
             company_data.profile = generate_company_profile(company_data.profile, website_info.summary)
-                 
-        inputs = f"""
-        # **Lead Profile:**
-
-        {lead_data.profile}
+        return company_data
 
-        # **Company Information:**
+    async def areview_company_website(self, state: GraphState):
+        """
+        Async version of `review_company_website`.
+        """
+        logger.info("Reviewing company website for state: {}", state)
+        print(Fore.YELLOW + "----- Scraping company website -----\n" + Style.RESET_ALL)
+        lead_data = state.get("current_lead")
+        company_data = state.get("company_data")
+        
+        company_key = get_company_key(company_data, lead_data.company)
+        researched_company = await aget_or_research(
+            company_key, "website", lambda: self._aresearch_company_website(company_data.model_copy(deep=True)),
+            cache_if=self._is_website_analyzed(company_data)
+        )
+        company_data = self._merge_company_research(company_data, researched_company)
+                 
+        general_lead_search_report = await ainvoke_llm(**self._lead_search_request(lead_data, company_data))
+        return self._website_review_result(company_data, company_key, general_lead_search_report)
 
-        {company_data.profile}
+    async def _aresearch_company_website(self, company_data):
+        """
+        Async version of `_research_company_website`.
         """
+        company_website = company_data.website
         
-        # Generate general lead search report
-        general_lead_search_report = invoke_llm(
-            system_prompt=LEAD_SEARCH_REPORT_PROMPT, 
-            user_message=inputs,
+        if not company_website and company_data.name:
+            print(Fore.YELLOW + "----- No website found, searching for company website -----\n" + Style.RESET_ALL)
+            try:
+                search_results = await agoogle_search(self._company_website_query(company_data.name))
+                company_website = find_company_website(search_results)
+                if company_website:
+                    company_data.website = company_website
+            except Exception as e:
+                print(f"Error searching for company website: {e}")
+        
+        if not company_website:
+            return company_data
+        page = await ascrape_website(company_website)
+        self._update_social_media_links(company_data, page.social_media_links)
+
+        content = extract_main_content(page.markdown, label="website")
+        if content:
+            website_info = await ainvoke_llm(**self._website_analysis_request(company_website, content))
+            company_data.profile = await agenerate_company_profile(company_data.profile, website_info.summary)
+        return company_data
+
+    @staticmethod
+    def _lead_search_request(lead_data, company_data):
+        return dict(
+            system_prompt=LEAD_SEARCH_REPORT_PROMPT,
+            user_message=build_lead_search_inputs(lead_data, company_data),
             model="gemini-2.5-flash"
         )
-        
+
+    @staticmethod
+    def _website_analysis_request(company_website, content):
+        return dict(
+            system_prompt=WEBSITE_ANALYSIS_PROMPT.format(main_url=company_website),
+            user_message=content,
+            model="gemini-2.5-flash",
+            response_format=WebsiteData
+        )
+
+    @staticmethod
+    def _merge_company_research(company_data, researched_company):
+        # Work on a copy, the researched company data is shared with the other leads of the company
+        return researched_company.model_copy(
+            deep=True, update={"name": company_data.name or researched_company.name}
+        )
+
+    @staticmethod
+    def _update_social_media_links(company_data, social_media_links):
+        company_data.social_media_links.blog = social_media_links.blog
+        company_data.social_media_links.facebook = social_media_links.facebook
+        company_data.social_media_links.twitter = social_media_links.twitter
+        company_data.social_media_links.youtube = social_media_links.youtube
+
+    @staticmethod
+    def _is_website_analyzed(company_data):
+        # The website analysis rewrites the company profile, when the website could not be
+        # found or fetched the profile is unchanged and the research is not shared
+        return lambda researched: bool(researched.website) and researched.profile != company_data.profile
+
+    @staticmethod
+    def _website_review_result(company_data, company_key, general_lead_search_report):
         lead_search_report = Report(
             title="General Lead Research Report",
             content=general_lead_search_report,
@@ -201,6 +453,7 @@ class OutReachAutomationNodes:
         logger.info("Website review complete. Updated company_data: {}", company_data)
         return {
             "company_data": company_data,
+            "company_key": company_key,
             "reports": [lead_search_report]
         }
     
@@ -211,27 +464,59 @@ class OutReachAutomationNodes:
     def analyze_blog_content(self, state: GraphState):
         logger.info("Analyzing blog content for state: {}", state)
         print(Fore.YELLOW + "----- Analyzing company main blog -----\n" + Style.RESET_ALL)  
-        blog_analysis_report = ""
-        
-        # Check if company has a blog
         company_data = state["company_data"]
-        blog_url = company_data.social_media_links.blog
-        if blog_url:
-            blog_content = scrape_website_to_markdown(blog_url)
-            prompt = BLOG_ANALYSIS_PROMPT.format(company_name=company_data.name)
-            blog_analysis_report = invoke_llm(
-                system_prompt=prompt, 
-                user_message=blog_content,
-                model="gemini-2.5-flash"
-            )
-            blog_analysis_report = Report(
-                title="Blog Analysis Report",
-                content=blog_analysis_report,
-                is_markdown=True
-            )
+        blog_analysis_report = get_or_research(
+            state.get("company_key", ""), "blog", lambda: self._research_blog(company_data)
+        ) or ""
+        print(Fore.YELLOW + f"----- Blog analysis report: {blog_analysis_report} -----\n" + Style.RESET_ALL)
+        logger.info("Blog analysis report: {}", blog_analysis_report)
+        return {"reports": [blog_analysis_report]}
+
+    async def aanalyze_blog_content(self, state: GraphState):
+        """
+        Async version of `analyze_blog_content`.
+        """
+        logger.info("Analyzing blog content for state: {}", state)
+        print(Fore.YELLOW + "----- Analyzing company main blog -----\n" + Style.RESET_ALL)  
+        company_data = state["company_data"]
+        blog_analysis_report = await aget_or_research(
+            state.get("company_key", ""), "blog", lambda: self._aresearch_blog(company_data)
+        ) or ""
         print(Fore.YELLOW + f"----- Blog analysis report: {blog_analysis_report} -----\n" + Style.RESET_ALL)
         logger.info("Blog analysis report: {}", blog_analysis_report)
         return {"reports": [blog_analysis_report]}
+
+    @staticmethod
+    def _research_blog(company_data):
+        # Check if company has a blog
+        blog_url = company_data.social_media_links.blog
+        if not blog_url:
+            return ""
+        # Digest of the most recent posts, or the blog index page when no post could be found
+        blog_content = crawl_blog(blog_url)
+        if not blog_content:
+            return ""
+        blog_analysis = invoke_llm(**OutReachAutomationNodes._blog_analysis_request(company_data, blog_content))
+        return Report(title="Blog Analysis Report", content=blog_analysis, is_markdown=True)
+
+    @staticmethod
+    async def _aresearch_blog(company_data):
+        blog_url = company_data.social_media_links.blog
+        if not blog_url:
+            return ""
+        blog_content = await acrawl_blog(blog_url)
+        if not blog_content:
+            return ""
+        blog_analysis = await ainvoke_llm(**OutReachAutomationNodes._blog_analysis_request(company_data, blog_content))
+        return Report(title="Blog Analysis Report", content=blog_analysis, is_markdown=True)
+
+    @staticmethod
+    def _blog_analysis_request(company_data, blog_content):
+        return dict(
+            system_prompt=BLOG_ANALYSIS_PROMPT.format(company_name=company_data.name),
+            user_message=blog_content,
+            model="gemini-2.5-flash"
+        )
     
     def analyze_social_media_content(self, state: GraphState):
         logger.info("Analyzing social media content for state: {}", state)
@@ -249,18 +534,9 @@ class OutReachAutomationNodes:
         
         # Check If company has Youtube channel
         if youtube_url:
-            youtube_data = get_youtube_stats(youtube_url)
-            prompt = YOUTUBE_ANALYSIS_PROMPT.format(company_name=company_data.name)
-            youtube_insight = invoke_llm(
-                system_prompt=prompt, 
-                user_message=youtube_data,
-                model="gemini-2.5-flash"
-            )
-            youtube_analysis_report = Report(
-                title="Youtube Analysis Report",
-                content=youtube_insight,
-                is_markdown=True
-            )
+            youtube_analysis_report = get_or_research(
+                state.get("company_key", ""), "youtube", lambda: self._research_youtube(company_data)
+            ) or self._no_youtube_data_report(company_data)
             
         # Check If company has Facebook account
         if facebook_url:
@@ -278,40 +554,118 @@ class OutReachAutomationNodes:
             "company_data": company_data,
             "reports": [youtube_analysis_report] if youtube_analysis_report else []
         }
+
+    async def aanalyze_social_media_content(self, state: GraphState):
+        """
+        Async version of `analyze_social_media_content`, the YouTube API client runs in a worker thread.
+        """
+        logger.info("Analyzing social media content for state: {}", state)
+        print(Fore.YELLOW + "----- Analyzing company social media accounts -----\n" + Style.RESET_ALL)
+        
+        company_data = state["company_data"]
+        youtube_url = company_data.social_media_links.youtube
+        youtube_analysis_report = None
+        
+        if youtube_url:
+            youtube_analysis_report = await aget_or_research(
+                state.get("company_key", ""), "youtube", lambda: self._aresearch_youtube(company_data)
+            ) or self._no_youtube_data_report(company_data)
+        
+        print(Fore.YELLOW + f"----- YouTube analysis report: {youtube_analysis_report} -----\n" + Style.RESET_ALL)
+        logger.info("YouTube analysis report: {}", youtube_analysis_report)
+        return {
+            "company_data": company_data,
+            "reports": [youtube_analysis_report] if youtube_analysis_report else []
+        }
+
+    @staticmethod
+    def _no_youtube_data_report(company_data):
+        # Not shared with the other leads, the channel may be reachable on the next lookup
+        return Report(
+            title="Youtube Analysis Report",
+            content=f"No YouTube data could be retrieved for {company_data.name} ({company_data.social_media_links.youtube})."
+        )
+
+    @staticmethod
+    def _research_youtube(company_data):
+        youtube_data = get_youtube_stats(company_data.social_media_links.youtube)
+        if not youtube_data:
+            return None
+        youtube_insight = invoke_llm(**OutReachAutomationNodes._youtube_analysis_request(company_data, youtube_data))
+        return Report(title="Youtube Analysis Report", content=youtube_insight, is_markdown=True)
+
+    @staticmethod
+    async def _aresearch_youtube(company_data):
+        youtube_data = await asyncio.to_thread(get_youtube_stats, company_data.social_media_links.youtube)
+        if not youtube_data:
+            return None
+        youtube_insight = await ainvoke_llm(**OutReachAutomationNodes._youtube_analysis_request(company_data, youtube_data))
+        return Report(title="Youtube Analysis Report", content=youtube_insight, is_markdown=True)
+
+    @staticmethod
+    def _youtube_analysis_request(company_data, youtube_data):
+        return dict(
+            system_prompt=YOUTUBE_ANALYSIS_PROMPT.format(company_name=company_data.name),
+            user_message=youtube_data,
+            model="gemini-2.5-flash"
+        )
     
     def analyze_recent_news(self, state: GraphState):
         logger.info("Analyzing recent news for state: {}", state)
         print(Fore.YELLOW + "----- Analyzing recent news about company -----\n" + Style.RESET_ALL)
         
-        # Load states
-        company_data = state["company_data"]
-        
         # Use company name for news search, fallback to lead's company if company_data.name is empty
-        company_name = company_data.name if company_data.name else state.get("current_lead", {}).get("company", "")
+        company_name = get_news_company_name(state)
+        news_insight = get_or_research(
+            state.get("company_key", ""), "news", lambda: self._research_news(company_name)
+        ) or build_news_insight(company_name, "")
+        return self._news_analysis_result(news_insight)
+
+    async def aanalyze_recent_news(self, state: GraphState):
+        """
+        Async version of `analyze_recent_news`.
+        """
+        logger.info("Analyzing recent news for state: {}", state)
+        print(Fore.YELLOW + "----- Analyzing recent news about company -----\n" + Style.RESET_ALL)
         
+        company_name = get_news_company_name(state)
+        news_insight = await aget_or_research(
+            state.get("company_key", ""), "news", lambda: self._aresearch_news(company_name)
+        ) or build_news_insight(company_name, "")
+        return self._news_analysis_result(news_insight)
+
+    def _research_news(self, company_name):
         # Fetch recent news using serper API
         recent_news = get_recent_news(company=company_name) if company_name else ""
+        
+        # Only call LLM if recent_news is not empty and not an error, None lets the caller
+        # use the fallback insight without sharing it with the other leads of the company
+        if build_news_insight(company_name, recent_news) is not None:
+            return None
+        return invoke_llm(**self._news_analysis_request(company_name, recent_news))
+
+    async def _aresearch_news(self, company_name):
+        recent_news = await aget_recent_news(company=company_name) if company_name else ""
+        if build_news_insight(company_name, recent_news) is not None:
+            return None
+        return await ainvoke_llm(**self._news_analysis_request(company_name, recent_news))
+
+    @staticmethod
+    def _news_analysis_request(company_name, recent_news):
         number_months = 6
         current_date = get_current_date()
-        news_analysis_prompt = NEWS_ANALYSIS_PROMPT.format(
-            company_name=company_name, 
-            number_months=number_months, 
-            date=current_date
+        return dict(
+            system_prompt=NEWS_ANALYSIS_PROMPT.format(
+                company_name=company_name, 
+                number_months=number_months, 
+                date=current_date
+            ),
+            user_message=recent_news,
+            model="gemini-2.5-flash"
         )
-        
-        # Only call LLM if recent_news is not empty and not an error
-        if not recent_news or recent_news.strip() == "" or recent_news.startswith("Error fetching news"):
-            if company_name:
-                news_insight = f"No recent news found for {company_name} in the last 6 months."
-            else:
-                news_insight = "No company name available for news search."
-        else:
-            news_insight = invoke_llm(
-                system_prompt=news_analysis_prompt, 
-                user_message=recent_news,
-                model="gemini-2.5-flash"
-            )
 
+    @staticmethod
+    def _news_analysis_result(news_insight):
         news_analysis_report = Report(
             title="News Analysis Report",
             content=news_insight,
@@ -325,46 +679,38 @@ class OutReachAutomationNodes:
         logger.info("Generating digital presence report for state: {}", state)
         print(Fore.YELLOW + "----- Generate Digital presence analysis report -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        blog_analysis_report = get_report(reports, "Blog Analysis Report")
-        facebook_analysis_report = get_report(reports, "Facebook Analysis Report")
-        twitter_analysis_report = get_report(reports, "Twitter Analysis Report")
-        youtube_analysis_report = get_report(reports, "Youtube Analysis Report")
-        news_analysis_report = get_report(reports, "News Analysis Report")
-        
-        inputs = f"""
-        # **Digital Presence Data:**
-        ## **Blog Information:**
-
-        {blog_analysis_report}
-        
-        ## **Facebook Information:**
-
-        {facebook_analysis_report}
-        
-        ## **Twitter Information:**
-
-        {twitter_analysis_report}
-
-        ## **Youtube Information:**
-
-        {youtube_analysis_report}
-
-        # **Recent News:**
+        # Built from the blog, YouTube and news reports, shared by all the leads of the company
+        digital_presence_report = get_or_research(
+            state.get("company_key", ""), "digital_presence",
+            lambda: invoke_llm(**self._digital_presence_request(state))
+        )
+        return self._digital_presence_result(digital_presence_report)
 
-        {news_analysis_report}
+    async def agenerate_digital_presence_report(self, state: GraphState):
+        """
+        Async version of `generate_digital_presence_report`.
         """
+        logger.info("Generating digital presence report for state: {}", state)
+        print(Fore.YELLOW + "----- Generate Digital presence analysis report -----\n" + Style.RESET_ALL)
         
-        prompt = DIGITAL_PRESENCE_REPORT_PROMPT.format(
-            company_name=state["company_data"].name, date=get_current_date()
+        digital_presence_report = await aget_or_research(
+            state.get("company_key", ""), "digital_presence",
+            lambda: ainvoke_llm(**self._digital_presence_request(state))
         )
-        digital_presence_report = invoke_llm(
-            system_prompt=prompt, 
-            user_message=inputs,
+        return self._digital_presence_result(digital_presence_report)
+
+    @staticmethod
+    def _digital_presence_request(state):
+        return dict(
+            system_prompt=DIGITAL_PRESENCE_REPORT_PROMPT.format(
+                company_name=state["company_data"].name, date=get_current_date()
+            ),
+            user_message=build_digital_presence_inputs(state["reports"]),
             model="gemini-2.5-flash"
-        ) 
-        
+        )
+
+    @staticmethod
+    def _digital_presence_result(digital_presence_report):
         digital_presence_report = Report(
             title="Digital Presence Report",
             content=digital_presence_report,
@@ -378,32 +724,31 @@ class OutReachAutomationNodes:
         logger.info("Generating full lead research report for state: {}", state)
         print(Fore.YELLOW + "----- Generate global lead analysis report -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        general_lead_search_report = get_report(reports, "General Lead Research Report")
-        digital_presence_report = get_report(reports, "Digital Presence Report")
-        
-        inputs = f"""
-        # **Lead & company Information:**
-
-        {general_lead_search_report}
-        
-        ---
+        full_report = invoke_llm(**self._full_lead_research_request(state))
+        return self._full_lead_research_result(full_report)
 
-        # **Digital Presence Information:**
-
-        {digital_presence_report}
+    async def agenerate_full_lead_research_report(self, state: GraphState):
         """
+        Async version of `generate_full_lead_research_report`.
+        """
+        logger.info("Generating full lead research report for state: {}", state)
+        print(Fore.YELLOW + "----- Generate global lead analysis report -----\n" + Style.RESET_ALL)
         
-        prompt = GLOBAL_LEAD_RESEARCH_REPORT_PROMPT.format(
-            company_name=state["company_data"].name, date=get_current_date()
-        )
-        full_report = invoke_llm(
-            system_prompt=prompt, 
-            user_message=inputs,
+        full_report = await ainvoke_llm(**self._full_lead_research_request(state))
+        return self._full_lead_research_result(full_report)
+
+    @staticmethod
+    def _full_lead_research_request(state):
+        return dict(
+            system_prompt=GLOBAL_LEAD_RESEARCH_REPORT_PROMPT.format(
+                company_name=state["company_data"].name, date=get_current_date()
+            ),
+            user_message=build_full_lead_research_inputs(state["reports"]),
             model="gemini-2.0-flash"
         )
-        
+
+    @staticmethod
+    def _full_lead_research_result(full_report):
         global_research_report = Report(
             title="Global Lead Analysis Report",
             content=full_report,
@@ -424,16 +769,31 @@ class OutReachAutomationNodes:
         """
         print(Fore.YELLOW + "----- Scoring lead -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        global_research_report = get_report(reports, "Global Lead Analysis Report")
-        
         # Scoring lead
-        lead_score = invoke_llm(
+        lead_score = invoke_llm(**OutReachAutomationNodes._score_lead_request(state))
+        return OutReachAutomationNodes._score_lead_result(lead_score)
+
+    @staticmethod
+    async def ascore_lead(state: GraphState):
+        """
+        Async version of `score_lead`.
+        """
+        logger.info("Scoring lead. State: {}", state)
+        print(Fore.YELLOW + "----- Scoring lead -----\n" + Style.RESET_ALL)
+        
+        lead_score = await ainvoke_llm(**OutReachAutomationNodes._score_lead_request(state))
+        return OutReachAutomationNodes._score_lead_result(lead_score)
+
+    @staticmethod
+    def _score_lead_request(state):
+        return dict(
             system_prompt=SCORE_LEAD_PROMPT,
-            user_message=global_research_report,
+            user_message=get_report(state["reports"], "Global Lead Analysis Report"),
             model="gemini-2.0-flash"
         )
+
+    @staticmethod
+    def _score_lead_result(lead_score):
         print(Fore.YELLOW + f"----- Lead score: {lead_score} -----\n" + Style.RESET_ALL)
         logger.info("Lead score: {}", lead_score)
         return {"lead_score": lead_score.strip()}
@@ -475,16 +835,46 @@ class OutReachAutomationNodes:
         logger.info("Generating custom outreach report for state: {}", state)
         print(Fore.YELLOW + "----- Crafting Custom outreach report based on gathered information -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        general_lead_search_report = get_report(reports, "General Lead Research Report")
-        global_research_report = get_report(reports, "Global Lead Analysis Report")
-        
         # TODO Create better description to fetch accurate similar case study using RAG
         # get relevant case study
-        case_study_report = fetch_similar_case_study(general_lead_search_report)
+        case_study_report = fetch_similar_case_study(get_report(state["reports"], "General Lead Research Report"))
         
-        inputs = f"""
+        # Generate report
+        custom_outreach_report = invoke_llm(**self._outreach_report_request(state, case_study_report))
+        
+        # TODO Find better way to include correct links into the final report
+        # Call our editor/proof-reader agent
+        revised_outreach_report = invoke_llm(**self._proof_reading_request(custom_outreach_report))
+        
+        # Store report into google docs and get shareable link
+        new_doc = self._save_outreach_report(revised_outreach_report, state.get("drive_folder_name", ""))
+        return self._outreach_report_result(new_doc)
+
+    async def agenerate_custom_outreach_report(self, state: GraphState):
+        """
+        Async version of `generate_custom_outreach_report`, the case study retrieval
+        and Google Docs upload run in worker threads.
+        """
+        logger.info("Generating custom outreach report for state: {}", state)
+        print(Fore.YELLOW + "----- Crafting Custom outreach report based on gathered information -----\n" + Style.RESET_ALL)
+        
+        case_study_report = await asyncio.to_thread(
+            fetch_similar_case_study, get_report(state["reports"], "General Lead Research Report")
+        )
+        custom_outreach_report = await ainvoke_llm(**self._outreach_report_request(state, case_study_report))
+        revised_outreach_report = await ainvoke_llm(**self._proof_reading_request(custom_outreach_report))
+        
+        new_doc = await asyncio.to_thread(
+            self._save_outreach_report, revised_outreach_report, state.get("drive_folder_name", "")
+        )
+        return self._outreach_report_result(new_doc)
+
+    @staticmethod
+    def _outreach_report_request(state, case_study_report):
+        global_research_report = get_report(state["reports"], "Global Lead Analysis Report")
+        return dict(
+            system_prompt=GENERATE_OUTREACH_REPORT_PROMPT,
+            user_message=f"""
         **Research Report:**
 
         {global_research_report}
@@ -494,18 +884,15 @@ class OutReachAutomationNodes:
         **Case Study:**
 
         {case_study_report}
-        """
-        
-        # Generate report
-        custom_outreach_report = invoke_llm(
-            system_prompt=GENERATE_OUTREACH_REPORT_PROMPT,
-            user_message=inputs,
+        """,
             model="gemini-2.0-flash"
         )
-        
-        # TODO Find better way to include correct links into the final report
-        # Proof read generated report
-        inputs = f"""
+
+    @staticmethod
+    def _proof_reading_request(custom_outreach_report):
+        return dict(
+            system_prompt=PROOF_READER_PROMPT,
+            user_message=f"""
         {custom_outreach_report}
 
         ---
@@ -514,25 +901,22 @@ class OutReachAutomationNodes:
 
         ** Our website link**: https://elevateAI.com
         ** Case study link**: https://elevateAI.com/case-studies/A
-        """
-        
-        # Call our editor/proof-reader agent
-        revised_outreach_report = invoke_llm(
-            system_prompt=PROOF_READER_PROMPT,
-            user_message=inputs,
+        """,
             model="gemini-2.5-flash"
         )
-        
-        # Store report into google docs and get shareable link
-        new_doc = self.docs_manager.add_document(
+
+    def _save_outreach_report(self, revised_outreach_report, drive_folder_name):
+        return self.docs_manager.add_document(
             content=revised_outreach_report,
             doc_title="Outreach Report",
-            folder_name=self.drive_folder_name,
+            folder_name=drive_folder_name,
             make_shareable=True,
             folder_shareable=True, # Set to false if only personal or true if with a team
             markdown=True
         )  
-        
+
+    @staticmethod
+    def _outreach_report_result(new_doc):
         print(Fore.YELLOW + f"----- Custom outreach report link: {new_doc['shareable_url']}, Reports folder link: {new_doc['folder_url']} -----\n" + Style.RESET_ALL)
         logger.info("Custom outreach report link: {}, Reports folder link: {}", new_doc["shareable_url"], new_doc["folder_url"])
         return {
@@ -550,11 +934,33 @@ class OutReachAutomationNodes:
         """
         print(Fore.YELLOW + "----- Generating personalized email -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        general_lead_search_report = get_report(reports, "General Lead Research Report")
+        output = invoke_llm(**self._personalized_email_request(state))
+        
+        # Get lead email
+        email = state["current_lead"].email
         
-        lead_data = f"""
+        # Create draft email
+        self._deliver_email(email, output.subject, output.email)
+        return self._personalized_email_result(email, output.email)
+
+    async def agenerate_personalized_email(self, state: GraphState):
+        """
+        Async version of `generate_personalized_email`, the Gmail API calls run in a worker thread.
+        """
+        logger.info("Generating personalized email for state: {}", state)
+        print(Fore.YELLOW + "----- Generating personalized email -----\n" + Style.RESET_ALL)
+        
+        output = await ainvoke_llm(**self._personalized_email_request(state))
+        email = state["current_lead"].email
+        await asyncio.to_thread(self._deliver_email, email, output.subject, output.email)
+        return self._personalized_email_result(email, output.email)
+
+    @staticmethod
+    def _personalized_email_request(state):
+        general_lead_search_report = get_report(state["reports"], "General Lead Research Report")
+        return dict(
+            system_prompt=PERSONALIZE_EMAIL_PROMPT,
+            user_message=f"""
         # **Lead & company Information:**
 
         {general_lead_search_report}
@@ -562,21 +968,13 @@ class OutReachAutomationNodes:
         # Outreach report Link:
 
         {state["custom_outreach_report_link"]}
-        """
-        output = invoke_llm(
-            system_prompt=PERSONALIZE_EMAIL_PROMPT,
-            user_message=lead_data,
+        """,
             model="gemini-2.5-flash",
             response_format=EmailResponse
         )
-        
-        # Get relevant fields
-        subject = output.subject
-        personalized_email = output.email
-        
-        # Get lead email
-        email = state["current_lead"].email
-        
+
+    @staticmethod
+    def _deliver_email(email, subject, personalized_email):
         # Create draft email
         gmail = GmailTools()
         gmail.create_draft_email(
@@ -592,7 +990,9 @@ class OutReachAutomationNodes:
                 subject=subject,
                 email_content=personalized_email
             )
-        
+
+    @staticmethod
+    def _personalized_email_result(email, personalized_email):
         # Save email with reports for reference
         personalized_email_doc = Report(
             title="Personalized Email",
@@ -607,18 +1007,38 @@ class OutReachAutomationNodes:
         logger.info("Generating interview script for state: {}", state)
         print(Fore.YELLOW + "----- Generating interview script -----\n" + Style.RESET_ALL)
         
-        # Load reports
-        reports = state["reports"]
-        global_research_report = get_report(reports, "Global Lead Analysis Report")
-        
         # Generating SPIN questions
-        spin_questions = invoke_llm(
+        spin_questions = invoke_llm(**self._spin_questions_request(state))
+        
+        # Generating interview script
+        interview_script = invoke_llm(**self._interview_script_request(state, spin_questions))
+        return self._interview_script_result(interview_script)
+
+    async def agenerate_interview_script(self, state: GraphState):
+        """
+        Async version of `generate_interview_script`.
+        """
+        logger.info("Generating interview script for state: {}", state)
+        print(Fore.YELLOW + "----- Generating interview script -----\n" + Style.RESET_ALL)
+        
+        spin_questions = await ainvoke_llm(**self._spin_questions_request(state))
+        interview_script = await ainvoke_llm(**self._interview_script_request(state, spin_questions))
+        return self._interview_script_result(interview_script)
+
+    @staticmethod
+    def _spin_questions_request(state):
+        return dict(
             system_prompt=GENERATE_SPIN_QUESTIONS_PROMPT,
-            user_message=global_research_report,
+            user_message=get_report(state["reports"], "Global Lead Analysis Report"),
             model="gemini-2.5-flash"
         )
-        
-        inputs = f"""
+
+    @staticmethod
+    def _interview_script_request(state, spin_questions):
+        global_research_report = get_report(state["reports"], "Global Lead Analysis Report")
+        return dict(
+            system_prompt=WRITE_INTERVIEW_SCRIPT_PROMPT,
+            user_message=f"""
         # **Lead & company Information:**
 
         {global_research_report}
@@ -626,15 +1046,12 @@ class OutReachAutomationNodes:
         # **SPIN questions:**
 
         {spin_questions}
-        """
-        
-        # Generating interview script
-        interview_script = invoke_llm(
-            system_prompt=WRITE_INTERVIEW_SCRIPT_PROMPT,
-            user_message=inputs,
+        """,
             model="gemini-2.5-flash"
         )
-        
+
+    @staticmethod
+    def _interview_script_result(interview_script):
         interview_script_doc = Report(
             title="Interview Script",
             content=interview_script,
@@ -654,22 +1071,27 @@ class OutReachAutomationNodes:
         
         # Load all reports
         reports = state["reports"]
+        drive_folder_name = state.get("drive_folder_name", "")
         
-        # Ensure reports are saved locally
-        save_reports_locally(reports)
+        # Ensure reports are saved locally, in a folder per lead
+        save_reports_locally(reports, drive_folder_name)
         
-        # Save all reports to Google docs
+        # Save all reports to Google docs, uploaded in parallel
+        timings = []
         if SAVE_TO_GOOGLE_DOCS:
-            for report in reports:
-                self.docs_manager.add_document(
-                    content=report.content,
-                    doc_title=report.title,
-                    folder_name=self.drive_folder_name,
-                    markdown=report.is_markdown
-                )
+            started_at = time.perf_counter()
+            documents = self.docs_manager.add_documents(
+                [{"content": report.content, "title": report.title, "markdown": report.is_markdown} for report in reports],
+                folder_name=drive_folder_name
+            )
+            timings = [
+                {"lead": state["current_lead"].id, "title": report.title, "seconds": round(document["elapsed"], 3) if document else None, "uploaded": document is not None}
+                for report, document in zip(reports, documents)
+            ]
+            logger.info("Uploaded {} reports to Google Docs in {:.2f}s: {}", len(reports), time.perf_counter() - started_at, timings)
         print(Fore.YELLOW + "----- Reports saved locally and/or to Google Docs. -----\n" + Style.RESET_ALL)
         logger.info("Reports saved locally and/or to Google Docs.")
-        return state
+        return {"google_docs_timings": timings}
 
     def update_CRM(self, state: GraphState):
         logger.info("Updating CRM for lead: {} with state: {}", state["current_lead"].id, state)
@@ -688,4 +1110,56 @@ class OutReachAutomationNodes:
         state["reports"] = []
         print(Fore.YELLOW + f"----- CRM updated for lead: {state['current_lead'].id} -----\n" + Style.RESET_ALL)
         logger.info("CRM updated for lead: {}", state["current_lead"].id)
-        return {}
+        return {"processed_leads": [state["current_lead"].id]}
+
+    @staticmethod
+    def make_lead_processor(lead_graph, max_concurrency=LEADS_CONCURRENCY):
+        """
+        Returns the `process_lead` node of the parallel execution mode. It runs the
+        compiled per-lead subgraph with its own isolated state, with at most
+        `max_concurrency` leads in flight at the same time. A failing lead is logged
+        and recorded in `failed_leads` without stopping the other leads.
+        """
+        semaphore = threading.BoundedSemaphore(max_concurrency)
+
+        def process_lead(state: LeadState, config: RunnableConfig):
+            lead = state["current_lead"]
+            with semaphore:
+                logger.info("Processing lead: {}", lead.id)
+                try:
+                    result = lead_graph.invoke({"current_lead": lead, "reports": []}, config)
+                except Exception as e:
+                    return OutReachAutomationNodes._failed_lead_result(lead, e)
+            return OutReachAutomationNodes._processed_lead_result(lead, result)
+
+        return process_lead
+
+    @staticmethod
+    def make_async_lead_processor(lead_graph, max_concurrency=LEADS_CONCURRENCY):
+        """
+        Async version of `make_lead_processor`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_lead(state: LeadState, config: RunnableConfig):
+            lead = state["current_lead"]
+            async with semaphore:
+                logger.info("Processing lead: {}", lead.id)
+                try:
+                    result = await lead_graph.ainvoke({"current_lead": lead, "reports": []}, config)
+                except Exception as e:
+                    return OutReachAutomationNodes._failed_lead_result(lead, e)
+            return OutReachAutomationNodes._processed_lead_result(lead, result)
+
+        return process_lead
+
+    @staticmethod
+    def _processed_lead_result(lead, result):
+        # The lead subgraph state is discarded, only what the run summary needs is carried up
+        return {"processed_leads": [lead.id], "google_docs_timings": result.get("google_docs_timings", [])}
+
+    @staticmethod
+    def _failed_lead_result(lead, error):
+        print(Fore.RED + f"----- Failed to process lead {lead.id}: {error} -----\n" + Style.RESET_ALL)
+        logger.exception("Failed to process lead {}: {}", lead.id, error)
+        return {"failed_leads": [lead.id]}
@@ -1,18 +1,11 @@
 WEBSITE_ANALYSIS_PROMPT = """
 The provided webpage content is scraped from: {main_url}.
 
-# Tasks
+# Task
 
-## 1- Summarize webpage content:
+## Summarize webpage content:
 Write a 500 words comprehensive summary in markdow format about the content of the webpage, focus on relevant information related to company mission, products and services.
 
-## 2- Extract and categorize the following links:
-1. Blog URL: Extract the main blog URL of the company. 
-2. Social Media Links: Extract links to the company's YouTube, Twitter, and Facebook profiles.
-Ensure that only the specified categories of links are included. 
-If a link is not found, its value is an empty string.
-If the link is relative (e.g., "/blog"), prepend it with {main_url} to form an absolute URL.
-
 # IMPORTANT:
 * Ensure the summary is organized in markdown format.
 """
@@ -43,9 +43,31 @@ class GraphState(TypedDict):
     current_lead: LeadData
     lead_score: str = ""
     company_data: CompanyData
+    company_key: str
     reports: Annotated[list[Report], add]
     reports_folder_link: str
     custom_outreach_report_link: str
     personalized_email: str
     interview_script: str
-    number_leads: int
\ No newline at end of file
+    number_leads: int
+    drive_folder_name: str
+    google_docs_timings: Annotated[list[dict], add]
+    processed_leads: Annotated[list[str], add]
+    failed_leads: Annotated[list[str], add]
+    run_started_at: float
+
+# State of a single lead subgraph run in parallel execution mode,
+# every lead gets its own reports and company data
+class LeadState(TypedDict):
+    current_lead: LeadData
+    lead_score: str
+    company_data: CompanyData
+    company_key: str
+    reports: Annotated[list[Report], add]
+    reports_folder_link: str
+    custom_outreach_report_link: str
+    personalized_email: str
+    interview_script: str
+    drive_folder_name: str
+    google_docs_timings: Annotated[list[dict], add]
+    processed_leads: Annotated[list[str], add]
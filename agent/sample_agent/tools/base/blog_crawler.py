@@ -0,0 +1,416 @@
+import os
+import re
+import time
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from xml.etree import ElementTree
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+from loguru import logger
+from sample_agent.tools.base.web_fetcher import fetch_url, afetch_url
+from sample_agent.tools.base.markdown_scraper_tool import html_to_markdown, html_to_markdown_bs4, parse_html, document_to_markdown
+from sample_agent.tools.base.content_extractor import extract_main_content, estimate_tokens
+from sample_agent.tools.base.link_classifier import extract_page_links
+
+# Number of recent posts read for the blog analysis
+BLOG_MAX_POSTS = int(os.getenv("BLOG_MAX_POSTS", "5"))
+# Posts fetched at the same time, they usually all live on the same host
+BLOG_CRAWL_CONCURRENCY = int(os.getenv("BLOG_CRAWL_CONCURRENCY", "4"))
+# Wall time budget of the whole crawl, posts not fetched in time are left out
+BLOG_CRAWL_TIMEOUT = float(os.getenv("BLOG_CRAWL_TIMEOUT", "30"))
+# Token budget of the digest sent to the LLM, shared between the posts
+BLOG_DIGEST_MAX_TOKENS = int(os.getenv("BLOG_DIGEST_MAX_TOKENS", "6000"))
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+FEED_PATHS = ("feed", "rss.xml", "atom.xml")
+# Child sitemaps worth opening in a sitemap index
+BLOG_SITEMAP_PATTERN = re.compile(r"(post|blog|article|news)", re.IGNORECASE)
+DATE_META_NAMES = (
+    "article:published_time", "og:published_time", "datepublished", "date",
+    "publish-date", "pubdate", "dc.date", "dc.date.issued", "sailthru.date",
+)
+
+
+class BlogPost(BaseModel):
+    url: str
+    title: str = ""
+    published_at: datetime | None = None
+    content: str = ""
+
+
+def canonical_url(url):
+    """
+    Normalizes a URL so the same post reached through different links is read once.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/") or "/", "", ""))
+
+
+def parse_date(value):
+    """
+    Parses RSS (RFC 822) and ISO 8601 dates, returns an aware datetime or None.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            match = re.match(r"\d{4}-\d{2}-\d{2}", value)
+            if not match:
+                return None
+            date = datetime.fromisoformat(match.group(0))
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+
+
+def _parse_xml(xml_text):
+    # The text is already decoded, an encoding declaration would be rejected or misread
+    try:
+        return ElementTree.fromstring(re.sub(r"^\s*<\?xml[^>]*\?>", "", xml_text))
+    except ElementTree.ParseError:
+        return None
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element, *names):
+    for child in element:
+        if _local_name(child.tag) in names and child.text:
+            return child.text.strip()
+    return ""
+
+
+def parse_feed(xml_text, base_url):
+    """
+    Returns the posts listed in an RSS or Atom feed.
+    """
+    root = _parse_xml(xml_text)
+    if root is None:
+        return []
+
+    posts = []
+    for element in root.iter():
+        name = _local_name(element.tag)
+        if name == "item":
+            link = _child_text(element, "link")
+            date = _child_text(element, "pubdate", "date", "published")
+        elif name == "entry":
+            link = ""
+            for child in element:
+                if _local_name(child.tag) == "link" and child.get("rel", "alternate") == "alternate":
+                    link = child.get("href", "")
+                    break
+            date = _child_text(element, "published", "updated")
+        else:
+            continue
+        if link:
+            posts.append(BlogPost(
+                url=urljoin(base_url, link),
+                title=_child_text(element, "title"),
+                published_at=parse_date(date),
+            ))
+    return posts
+
+
+def parse_sitemap(xml_text):
+    """
+    Returns the (url, lastmod) entries and the child sitemaps of a sitemap.
+    """
+    root = _parse_xml(xml_text)
+    if root is None:
+        return [], []
+
+    entries, child_sitemaps = [], []
+    for element in root:
+        name = _local_name(element.tag)
+        location = _child_text(element, "loc")
+        if not location:
+            continue
+        if name == "sitemap":
+            child_sitemaps.append(location)
+        elif name == "url":
+            entries.append((location, parse_date(_child_text(element, "lastmod"))))
+    return entries, child_sitemaps
+
+
+def _feed_urls(index_html, blog_url):
+    soup = BeautifulSoup(index_html, "html.parser")
+    feed_urls = [
+        urljoin(blog_url, link["href"])
+        for link in soup.find_all("link", href=True)
+        if link.get("type", "").lower() in FEED_TYPES
+    ]
+    base = blog_url.rstrip("/") + "/"
+    return feed_urls + [urljoin(base, path) for path in FEED_PATHS if urljoin(base, path) not in feed_urls]
+
+
+def _is_blog_post(url, blog_url):
+    # Posts live on the blog host, under the blog path and deeper than the index
+    post, blog = urlsplit(canonical_url(url)), urlsplit(canonical_url(blog_url))
+    blog_path = blog.path.rstrip("/")
+    return post.netloc == blog.netloc and post.path.startswith(blog_path + "/") and post.path.rstrip("/") != blog_path
+
+
+def _sitemap_posts(entries, blog_url):
+    return [BlogPost(url=url, published_at=date) for url, date in entries if _is_blog_post(url, blog_url)]
+
+
+def _index_posts(index_html, blog_url):
+    posts = []
+    for url, text in extract_page_links(index_html, blog_url):
+        if _is_blog_post(url, blog_url) and len(text.split()) >= 3:
+            posts.append(BlogPost(url=url, title=text))
+    return posts
+
+
+def select_recent_posts(posts, max_posts=BLOG_MAX_POSTS):
+    """
+    Dedupes the posts by canonical URL and returns the most recent ones.
+    Posts without a date keep their discovery order after the dated ones.
+    """
+    unique_posts = {}
+    for post in posts:
+        unique_posts.setdefault(canonical_url(post.url), post)
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    ranked = sorted(unique_posts.values(), key=lambda post: post.published_at or oldest, reverse=True)
+    return ranked[:max_posts]
+
+
+def _page_metadata(html, document):
+    """
+    Returns the canonical URL, og:title, <title>, (meta name, content) pairs and
+    <time datetime> of a page, read from its lxml tree or with BeautifulSoup when
+    lxml could not parse it.
+    """
+    if document is not None:
+        canonical = next((link.get("href") for link in document.iter("link") if "canonical" in (link.get("rel") or "").lower().split() and link.get("href")), "")
+        og_title = next((meta.get("content") for meta in document.iter("meta") if meta.get("property") == "og:title" and meta.get("content") is not None), None)
+        title = document.find(".//title")
+        metas = [
+            ((meta.get("property") or meta.get("name") or meta.get("itemprop") or "").lower(), meta.get("content"))
+            for meta in document.iter("meta") if meta.get("content") is not None
+        ]
+        time_tag = next((tag.get("datetime") for tag in document.iter("time") if tag.get("datetime")), "")
+        return canonical, og_title, title.text_content().strip() if title is not None else "", metas, time_tag
+
+    soup = BeautifulSoup(html, "html.parser")
+    canonical = soup.find("link", rel="canonical", href=True)
+    og_title = soup.find("meta", property="og:title", content=True)
+    time_tag = soup.find("time", datetime=True)
+    metas = [
+        ((meta.get("property") or meta.get("name") or meta.get("itemprop") or "").lower(), meta["content"])
+        for meta in soup.find_all("meta", content=True)
+    ]
+    return (
+        canonical["href"] if canonical else "",
+        og_title["content"] if og_title else None,
+        soup.title.get_text(strip=True) if soup.title else "",
+        metas,
+        time_tag["datetime"] if time_tag else "",
+    )
+
+
+def _truncate(content, max_tokens):
+    max_chars = max_tokens * 4
+    return content if len(content) <= max_chars else content[:max_chars].rsplit(" ", 1)[0] + " [...]"
+
+
+def _read_post(post, html, max_tokens):
+    """
+    Fills the post title, date and content from its page. The page is parsed once,
+    the metadata is read from the tree before it is converted to markdown.
+    """
+    document = parse_html(html)
+    canonical, og_title, title, metas, time_tag = _page_metadata(html, document)
+    if canonical:
+        post.url = urljoin(post.url, canonical)
+
+    if not post.title:
+        post.title = og_title.strip() if og_title is not None else title
+
+    if post.published_at is None:
+        for key, content in metas:
+            if key in DATE_META_NAMES and parse_date(content):
+                post.published_at = parse_date(content)
+                break
+    if post.published_at is None:
+        match = re.search(r'"datePublished"\s*:\s*"([^"]+)"', html)
+        post.published_at = parse_date(time_tag or (match.group(1) if match else ""))
+
+    markdown = document_to_markdown(document) if document is not None else html_to_markdown_bs4(html)
+    post.content = _truncate(extract_main_content(markdown), max_tokens)
+    return post
+
+
+def build_blog_digest(blog_url, posts):
+    """
+    Returns the compact markdown digest of the posts sent to the blog analysis.
+    """
+    sections = [f"# Blog: {blog_url}", f"{len(posts)} most recent posts, newest first."]
+    for post in sorted(posts, key=lambda post: post.published_at or datetime.min.replace(tzinfo=timezone.utc), reverse=True):
+        published = post.published_at.date().isoformat() if post.published_at else "unknown"
+        sections.append(f"## {post.title or post.url}\n\nURL: {post.url}\nPublished: {published}\n\n{post.content}")
+    return "\n\n".join(sections)
+
+
+def _discover_from_index(index_result, blog_url):
+    # Blog index links are the last resort, they rarely carry dates
+    return _index_posts(index_result.text, index_result.final_url or blog_url) if index_result.text else []
+
+
+def _deduplicate_read_posts(posts):
+    # Canonical links can reveal duplicates only after the pages are read
+    unique_posts = {}
+    for post in posts:
+        unique_posts.setdefault(canonical_url(post.url), post)
+    return list(unique_posts.values())
+
+
+def _digest_or_index(blog_url, index_result, posts, started_at):
+    posts = _deduplicate_read_posts([post for post in posts if post.content])
+    if not posts:
+        # Nothing could be crawled, analyze the index page as before
+        logger.info("No blog posts crawled for {}, using the index page", blog_url)
+        if not index_result.text:
+            return ""
+        return _truncate(extract_main_content(html_to_markdown(index_result.text), label="blog"), BLOG_DIGEST_MAX_TOKENS)
+    digest = build_blog_digest(blog_url, posts)
+    logger.info(
+        "Crawled {} posts of {} in {:.1f}s, digest of ~{} tokens",
+        len(posts), blog_url, time.monotonic() - started_at, estimate_tokens(digest)
+    )
+    return digest
+
+
+def crawl_blog(blog_url, max_posts=BLOG_MAX_POSTS):
+    """
+    Discovers the most recent posts of a blog through its RSS/Atom feed, its
+    sitemap or the index page links, reads them concurrently and returns a digest
+    within the BLOG_CRAWL_TIMEOUT and BLOG_DIGEST_MAX_TOKENS budgets.
+    """
+    started_at = time.monotonic()
+    deadline = started_at + BLOG_CRAWL_TIMEOUT
+    index_result = fetch_url(blog_url)
+
+    posts = []
+    if index_result.text:
+        for feed_url in _feed_urls(index_result.text, index_result.final_url or blog_url):
+            if time.monotonic() > deadline:
+                break
+            feed_result = fetch_url(feed_url)
+            posts = parse_feed(feed_result.text, feed_url) if feed_result.text else []
+            if posts:
+                break
+    if not posts and time.monotonic() < deadline:
+        posts = _crawl_sitemap(blog_url)
+    if not posts:
+        posts = _discover_from_index(index_result, blog_url)
+
+    posts = select_recent_posts(posts, max_posts)
+    max_tokens = BLOG_DIGEST_MAX_TOKENS // max(len(posts), 1)
+
+    def read(post):
+        result = fetch_url(post.url)
+        return _read_post(post, result.text, max_tokens) if result.text else post
+
+    read_posts = []
+    if posts:
+        executor = ThreadPoolExecutor(max_workers=BLOG_CRAWL_CONCURRENCY)
+        futures = [executor.submit(read, post) for post in posts]
+        done, not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        # Don't wait for slow posts, they are left out of the digest
+        executor.shutdown(wait=False, cancel_futures=True)
+        read_posts = [future.result() for future in futures if future in done and not future.exception()]
+        if not_done:
+            logger.warning("Blog crawl of {} ran out of time, {} posts skipped", blog_url, len(not_done))
+    return _digest_or_index(blog_url, index_result, read_posts, started_at)
+
+
+async def acrawl_blog(blog_url, max_posts=BLOG_MAX_POSTS):
+    """
+    Async version of `crawl_blog`.
+    """
+    started_at = time.monotonic()
+    deadline = started_at + BLOG_CRAWL_TIMEOUT
+    index_result = await afetch_url(blog_url)
+
+    posts = []
+    if index_result.text:
+        for feed_url in _feed_urls(index_result.text, index_result.final_url or blog_url):
+            if time.monotonic() > deadline:
+                break
+            feed_result = await afetch_url(feed_url)
+            posts = parse_feed(feed_result.text, feed_url) if feed_result.text else []
+            if posts:
+                break
+    if not posts and time.monotonic() < deadline:
+        posts = await _acrawl_sitemap(blog_url)
+    if not posts:
+        posts = _discover_from_index(index_result, blog_url)
+
+    posts = select_recent_posts(posts, max_posts)
+    max_tokens = BLOG_DIGEST_MAX_TOKENS // max(len(posts), 1)
+    semaphore = asyncio.Semaphore(BLOG_CRAWL_CONCURRENCY)
+
+    async def read(post):
+        async with semaphore:
+            result = await afetch_url(post.url)
+        if not result.text:
+            return post
+        return await asyncio.to_thread(_read_post, post, result.text, max_tokens)
+
+    read_posts = []
+    if posts:
+        tasks = [asyncio.create_task(read(post)) for post in posts]
+        done, not_done = await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), 0))
+        for task in not_done:
+            task.cancel()
+        read_posts = [task.result() for task in tasks if task in done and not task.exception()]
+        if not_done:
+            logger.warning("Blog crawl of {} ran out of time, {} posts skipped", blog_url, len(not_done))
+    return _digest_or_index(blog_url, index_result, read_posts, started_at)
+
+
+def _sitemap_url(blog_url):
+    parts = urlsplit(blog_url)
+    return f"{parts.scheme or 'https'}://{parts.netloc}/sitemap.xml"
+
+
+def _crawl_sitemap(blog_url):
+    result = fetch_url(_sitemap_url(blog_url))
+    if not result.text:
+        return []
+    entries, child_sitemaps = parse_sitemap(result.text)
+    posts = _sitemap_posts(entries, blog_url)
+    # Sitemap indexes point to one sitemap per content type, only open the blog ones
+    for child_sitemap in [url for url in child_sitemaps if BLOG_SITEMAP_PATTERN.search(url)][:2]:
+        if posts:
+            break
+        child_result = fetch_url(child_sitemap)
+        if child_result.text:
+            posts = _sitemap_posts(parse_sitemap(child_result.text)[0], blog_url)
+    return posts
+
+
+async def _acrawl_sitemap(blog_url):
+    result = await afetch_url(_sitemap_url(blog_url))
+    if not result.text:
+        return []
+    entries, child_sitemaps = parse_sitemap(result.text)
+    posts = _sitemap_posts(entries, blog_url)
+    for child_sitemap in [url for url in child_sitemaps if BLOG_SITEMAP_PATTERN.search(url)][:2]:
+        if posts:
+            break
+        child_result = await afetch_url(child_sitemap)
+        if child_result.text:
+            posts = _sitemap_posts(parse_sitemap(child_result.text)[0], blog_url)
+    return posts
@@ -0,0 +1,138 @@
+import os
+import re
+import threading
+from loguru import logger
+
+# Strip menus, cookie banners, footers and repeated blocks from scraped pages before
+# they are sent to the LLM. Set CONTENT_EXTRACTION_ENABLED=false to send whole pages.
+CONTENT_EXTRACTION_ENABLED = os.getenv("CONTENT_EXTRACTION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Blocks mostly made of links with fewer words than this outside the links are navigation
+MAX_LINK_DENSITY = 0.5
+MIN_WORDS_OUTSIDE_LINKS = 15
+# Short blocks matching these words are cookie banners, newsletter forms or legal notices
+BOILERPLATE_PATTERN = re.compile(
+    r"\b(cookies?|consent|gdpr|privacy (policy|settings|preferences)|terms (of (use|service)|and conditions)|"
+    r"all rights reserved|subscribe to (our|the) newsletter|sign up for (our|the) newsletter|skip to (main )?content)\b",
+    re.IGNORECASE
+)
+MAX_BOILERPLATE_WORDS = 80
+# ...but only along with banner signals, a product paragraph about cookie consent or
+# GDPR compliance mentions the same words: buttons and form labels, mostly links, or
+# a block of a few words on its own
+BANNER_ACTION_PATTERN = re.compile(
+    r"\b(accept( all| cookies)?|reject all|decline|allow (all|cookies)|got it|i agree|"
+    r"manage (cookie )?(preferences|settings)|cookie (settings|preferences)|subscribe|sign up|enter your email|email address)\b",
+    re.IGNORECASE
+)
+MAX_STANDALONE_BANNER_WORDS = 8
+# Below this share of the original words the extraction is considered broken
+MIN_KEPT_RATIO = 0.05
+
+LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\(([^)\s]+)[^)]*\)")
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """
+    Rough LLM token count (about 4 characters per token for English text).
+    """
+    return (len(text) + 3) // 4
+
+
+def _split_blocks(markdown):
+    return [block.strip() for block in re.split(r"\n\s*\n", markdown) if block.strip()]
+
+
+def _block_text(block):
+    # Visible text, links replaced by their label
+    return LINK_PATTERN.sub(lambda match: match.group(1), block)
+
+
+def _normalize(block):
+    return " ".join(re.findall(r"\w+", _block_text(block).lower()))
+
+
+def _is_boilerplate(block):
+    if block.startswith("#"):
+        return False
+    text = _block_text(block)
+    words = len(text.split())
+    links = LINK_PATTERN.findall(block)
+    link_chars = sum(len(label) for label, _ in links)
+    link_density = link_chars / max(len(text.strip()), 1)
+
+    if words < MAX_BOILERPLATE_WORDS and BOILERPLATE_PATTERN.search(text):
+        has_banner_signal = (
+            BANNER_ACTION_PATTERN.search(text)
+            or link_density > MAX_LINK_DENSITY
+            or words <= MAX_STANDALONE_BANNER_WORDS
+        )
+        if has_banner_signal:
+            return True
+
+    if not links:
+        return False
+    words_outside_links = len(LINK_PATTERN.sub(" ", block).split())
+    # Menus are lists of short labels, a lone long label is an article title worth keeping
+    label_words = sum(len(label.split()) for label, _ in links) / len(links)
+    is_menu = len(links) >= 3 or label_words <= 3
+    return link_density > MAX_LINK_DENSITY and words_outside_links < MIN_WORDS_OUTSIDE_LINKS and is_menu
+
+
+def extract_main_content(markdown, label=""):
+    """
+    Returns the main content of a page converted to markdown: navigation blocks,
+    cookie banners, legal notices and repeated blocks are removed. Social media and
+    blog links are classified from the page HTML beforehand, they are not repeated here.
+    When `label` is given, the token counts before and after are recorded under it.
+    """
+    if not CONTENT_EXTRACTION_ENABLED or not markdown:
+        return markdown
+
+    kept_blocks = []
+    seen_blocks = set()
+    for block in _split_blocks(markdown):
+        normalized = _normalize(block)
+        if not normalized or normalized in seen_blocks:
+            continue
+        seen_blocks.add(normalized)
+
+        if not _is_boilerplate(block):
+            kept_blocks.append(block)
+
+    content = "\n\n".join(kept_blocks)
+    if len(content.split()) < MIN_KEPT_RATIO * len(markdown.split()):
+        # Pages made only of links (e.g. a blog index) would be emptied
+        content = markdown
+
+    if label:
+        _record_extraction(label, markdown, content)
+    return content
+
+
+def _record_extraction(label, original, extracted):
+    tokens_before = estimate_tokens(original)
+    tokens_after = estimate_tokens(extracted)
+    with _stats_lock:
+        stats = _stats.setdefault(label, {"pages": 0, "tokens_before": 0, "tokens_after": 0})
+        stats["pages"] += 1
+        stats["tokens_before"] += tokens_before
+        stats["tokens_after"] += tokens_after
+    logger.info(
+        "{} content: ~{} tokens before extraction, ~{} after ({:.0%} removed)",
+        label, tokens_before, tokens_after, 1 - tokens_after / max(tokens_before, 1)
+    )
+
+
+def get_content_extraction_stats():
+    """
+    Returns the pages processed and estimated tokens before and after extraction for each label.
+    """
+    with _stats_lock:
+        return {
+            label: {**stats, "reduction": 1 - stats["tokens_after"] / max(stats["tokens_before"], 1)}
+            for label, stats in _stats.items()
+        }
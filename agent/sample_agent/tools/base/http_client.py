@@ -0,0 +1,194 @@
+import os
+import time
+import random
+import asyncio
+import threading
+import weakref
+from urllib.parse import urlsplit
+import httpx
+from loguru import logger
+from sample_agent.tools.base.rate_limiter import rate_limited, arate_limited
+
+# Shared HTTP client settings, all of them can be overridden with env vars
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Transient failures worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+}
+
+
+def _http2_available():
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+        return False
+
+
+def _client_options():
+    return {
+        "timeout": httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        ),
+        "http2": _http2_available(),
+        "follow_redirects": True,
+        "headers": DEFAULT_HEADERS,
+    }
+
+
+_client = None
+_client_lock = threading.Lock()
+_host_semaphores = {}
+
+# Async clients and semaphores are bound to the event loop that created them
+_async_clients = weakref.WeakKeyDictionary()
+_async_host_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_http_client():
+    """
+    Returns the process-wide HTTP client with keep-alive connection pooling.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_http_client():
+    """
+    Returns the async HTTP client of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(**_client_options())
+        _async_clients[loop] = client
+    return client
+
+
+def _host_semaphore(url):
+    host = urlsplit(str(url)).netloc
+    with _client_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def _async_host_semaphore(url):
+    host = urlsplit(str(url)).netloc
+    semaphores = _async_host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+        semaphores[host] = semaphore
+    return semaphore
+
+
+def _backoff_delay(attempt, response=None):
+    """
+    Exponential backoff with full jitter, honoring the server Retry-After header.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+def _should_retry(attempt, response=None, error=None):
+    if attempt >= HTTP_MAX_RETRIES:
+        return False
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return response.status_code in RETRY_STATUS_CODES
+
+
+def _send(method, url, service, **kwargs):
+    client = get_http_client()
+    with _host_semaphore(url):
+        if not service:
+            return client.request(method, url, **kwargs)
+        with rate_limited(service) as slot:
+            response = client.request(method, url, **kwargs)
+            slot.record(response.status_code)
+        return response
+
+
+async def _asend(method, url, service, **kwargs):
+    client = get_async_http_client()
+    async with _async_host_semaphore(url):
+        if not service:
+            return await client.request(method, url, **kwargs)
+        async with arate_limited(service) as slot:
+            response = await client.request(method, url, **kwargs)
+            slot.record(response.status_code)
+        return response
+
+
+def http_request(method, url, service=None, **kwargs):
+    """
+    Sends an HTTP request through the shared client.
+
+    Each attempt waits for a slot of the `service` rate limiter (if given) and for a
+    free connection to the host. Connection errors, timeouts and 429/5xx responses
+    are retried with jittered exponential backoff. Accepts the `httpx` request
+    arguments (`headers`, `params`, `json`, `content`, `timeout`...).
+    """
+    attempt = 0
+    while True:
+        try:
+            response = _send(method, url, service, **kwargs)
+        except httpx.HTTPError as e:
+            if not _should_retry(attempt, error=e):
+                raise
+            delay = _backoff_delay(attempt)
+            logger.warning("{} {} failed ({}), retrying in {:.1f}s", method, url, e, delay)
+        else:
+            if not _should_retry(attempt, response=response):
+                return response
+            delay = _backoff_delay(attempt, response)
+            logger.warning("{} {} returned {}, retrying in {:.1f}s", method, url, response.status_code, delay)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def ahttp_request(method, url, service=None, **kwargs):
+    """
+    Async version of `http_request`.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = await _asend(method, url, service, **kwargs)
+        except httpx.HTTPError as e:
+            if not _should_retry(attempt, error=e):
+                raise
+            delay = _backoff_delay(attempt)
+            logger.warning("{} {} failed ({}), retrying in {:.1f}s", method, url, e, delay)
+        else:
+            if not _should_retry(attempt, response=response):
+                return response
+            delay = _backoff_delay(attempt, response)
+            logger.warning("{} {} returned {}, retrying in {:.1f}s", method, url, response.status_code, delay)
+        await asyncio.sleep(delay)
+        attempt += 1
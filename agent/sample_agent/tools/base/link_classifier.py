@@ -0,0 +1,135 @@
+import re
+from urllib.parse import urljoin, urlsplit
+from bs4 import BeautifulSoup
+from sample_agent.state import SocialMediaLinks
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    import tldextract
+    # Bundled public suffix list snapshot, no download at runtime
+    _extract_domain = tldextract.TLDExtract(suffix_list_urls=())
+except ImportError:
+    _extract_domain = None
+
+SOCIAL_HOSTS = {
+    "youtube": ("youtube.com", "youtu.be"),
+    "twitter": ("twitter.com", "x.com"),
+    "facebook": ("facebook.com", "fb.com", "fb.me"),
+}
+
+# Share buttons, embeds and other links that are not the company profile
+IGNORED_PATHS = {
+    "youtube": re.compile(r"^/(watch|embed|shorts|playlist|results|feed|redirect|t/|about|howyoutubeworks)", re.IGNORECASE),
+    "twitter": re.compile(r"^/(intent|share|home|search|hashtag|i/|login|signup|tos|privacy)", re.IGNORECASE),
+    "facebook": re.compile(r"^/(sharer|share|dialog|plugins|tr|login|policies|privacy|help|watch)", re.IGNORECASE),
+}
+
+BLOG_PATH_PATTERN = re.compile(r"^/(?:[a-z]{2}(?:-[a-z]{2})?/)?(blog|blogs|news|insights|articles|stories|journal|resources/blog)(/|$)", re.IGNORECASE)
+
+
+def _iter_anchors(html):
+    if lxml_html is not None:
+        try:
+            document = lxml_html.document_fromstring(html.encode("utf-8", errors="replace"))
+            return [(anchor.get("href"), anchor.text_content()) for anchor in document.iter("a")]
+        except Exception:
+            pass
+    soup = BeautifulSoup(html, "html.parser")
+    return [(anchor.get("href"), anchor.get_text()) for anchor in soup.find_all("a")]
+
+
+def extract_page_links(html, base_url):
+    """
+    Returns the absolute (url, text) pairs of the page `<a href>` links, in page order.
+    """
+    if not html or not html.strip():
+        return []
+    links = []
+    for href, text in _iter_anchors(html):
+        href = (href or "").strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+            continue
+        links.append((urljoin(base_url, href), " ".join(text.split())))
+    return links
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower().split(":")[0].removeprefix("www.").removeprefix("m.")
+
+
+def _site_domain(url):
+    """
+    Returns the registered domain of the URL (acme.co.uk for blog.acme.co.uk) when
+    tldextract is installed, else its full host.
+    """
+    host = _host(url)
+    if _extract_domain is not None:
+        parts = _extract_domain(host)
+        if parts.domain and parts.suffix:
+            return f"{parts.domain}.{parts.suffix}"
+    return host
+
+
+def _is_same_site(url, site_domain):
+    host = _host(url)
+    return host == site_domain or host.endswith("." + site_domain)
+
+
+def _social_platform(url):
+    host = _host(url)
+    for platform, hosts in SOCIAL_HOSTS.items():
+        if any(host == social_host or host.endswith("." + social_host) for social_host in hosts):
+            return platform
+    return None
+
+
+def _is_profile_link(platform, url):
+    path = urlsplit(url).path or "/"
+    return path != "/" and not IGNORED_PATHS[platform].match(path)
+
+
+def _blog_score(url, text, site_domain):
+    """
+    Returns how likely a link is the company main blog (lower is better), or None.
+    """
+    parts = urlsplit(url)
+    if not _is_same_site(url, site_domain):
+        return None
+    host = _host(url)
+    path = parts.path.rstrip("/")
+    depth = len([segment for segment in path.split("/") if segment])
+    if host.startswith(("blog.", "news.")):
+        return depth
+    if BLOG_PATH_PATTERN.match(parts.path):
+        return depth
+    if text.strip().lower() == "blog":
+        return depth + 1
+    return None
+
+
+def classify_social_links(links, base_url):
+    """
+    Picks the company blog, YouTube, Twitter and Facebook links from the page links.
+    The first profile link of each platform is kept, the blog index (shallowest path) is preferred over posts.
+    """
+    social_media_links = SocialMediaLinks()
+    site_domain = _site_domain(base_url)
+    best_blog_score = None
+
+    for url, text in links:
+        platform = _social_platform(url)
+        if platform:
+            if not getattr(social_media_links, platform) and _is_profile_link(platform, url):
+                setattr(social_media_links, platform, url.split("?")[0])
+            continue
+
+        score = _blog_score(url, text, site_domain)
+        if score is not None and (best_blog_score is None or score < best_blog_score):
+            social_media_links.blog = url.split("#")[0]
+            best_blog_score = score
+
+    return social_media_links
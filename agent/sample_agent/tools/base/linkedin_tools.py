@@ -1,22 +1,128 @@
 import os
+import re
+import threading
+import unicodedata
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
-import requests
-from sample_agent.utils import invoke_llm
+from loguru import logger
+from sample_agent.cache import CompressedSQLiteCache, CACHE_DIR
+from sample_agent.utils import invoke_llm, ainvoke_llm
+from sample_agent.tools.base.http_client import http_request, ahttp_request
 
 load_dotenv()
 
-def extract_linkedin_url_base(search_results):
+# Minimum match score for the deterministic LinkedIn URL matcher to skip the LLM,
+# and the minimum lead over the runner-up profile
+LINKEDIN_MATCH_THRESHOLD = float(os.getenv("LINKEDIN_MATCH_THRESHOLD", "0.6"))
+LINKEDIN_MATCH_MARGIN = float(os.getenv("LINKEDIN_MATCH_MARGIN", "0.15"))
+
+# Words ignored when matching company names
+COMPANY_STOP_WORDS = {
+    "inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh",
+    "sa", "sas", "ag", "plc", "group", "the", "and", "of", "com", "io", "ai"
+}
+
+# Local store of scraped LinkedIn profiles and companies, keyed by URL.
+# Profiles rarely change week to week, so reruns and retries skip RapidAPI entirely.
+LINKEDIN_CACHE_ENABLED = os.getenv("LINKEDIN_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LINKEDIN_CACHE_PATH = os.getenv("LINKEDIN_CACHE_PATH", os.path.join(CACHE_DIR, "linkedin_cache.sqlite"))
+LINKEDIN_CACHE_TTL_DAYS = float(os.getenv("LINKEDIN_CACHE_TTL_DAYS", "7"))
+LINKEDIN_CACHE_MAX_MB = float(os.getenv("LINKEDIN_CACHE_MAX_MB", "128"))
+
+_linkedin_cache = None
+_linkedin_cache_lock = threading.Lock()
+
+_linkedin_match_stats = {"deterministic": 0, "llm_fallback": 0}
+_linkedin_match_stats_lock = threading.Lock()
+
+def _tokenize(text):
+    # Lowercase ASCII tokens, accents removed so "José" matches the "jose" slug
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+def _profile_slug(link):
+    """
+    Returns the profile slug of a personal LinkedIn URL, or None for other URLs.
+    """
+    parts = urlsplit(link)
+    if not parts.netloc.endswith("linkedin.com"):
+        return None
+    match = re.match(r"^/in/([^/?#]+)/?$", parts.path)
+    return match.group(1) if match else None
+
+def score_linkedin_result(result, lead_name, company):
+    """
+    Scores how likely a search result is the LinkedIn profile of the lead, from 0 to 1.
+    The lead name is matched against the URL slug and the result title, the
+    company against the title and snippet. Results without any company evidence
+    score 0, the name alone can't tell namesakes apart.
+    """
+    slug = _profile_slug(result.get("link", ""))
+    if slug is None:
+        return 0.0
+
+    name_tokens = set(_tokenize(lead_name))
+    slug_tokens = set(_tokenize(slug.replace("-", " ")))
+    title_tokens = set(_tokenize(result.get("title", "")))
+    if not name_tokens:
+        return 0.0
+    name_score = max(
+        len(name_tokens & slug_tokens) / len(name_tokens),
+        len(name_tokens & title_tokens) / len(name_tokens)
+    )
+
+    company_tokens = set(_tokenize(company)) - COMPANY_STOP_WORDS
+    context_tokens = title_tokens | set(_tokenize(result.get("snippet", "")))
+    company_score = len(company_tokens & context_tokens) / len(company_tokens) if company_tokens else 0.0
+    if company_score == 0.0:
+        return 0.0
+
+    return 0.7 * name_score + 0.3 * company_score
+
+def rank_linkedin_urls(search_results, lead_name, company):
+    """
+    Returns the personal LinkedIn URLs found in the search results with their
+    match scores, best match first.
+    """
+    scores = {}
+    for result in search_results or []:
+        slug = _profile_slug(result.get("link", ""))
+        if slug is None:
+            continue
+        url = f"https://www.linkedin.com/in/{slug}"
+        scores[url] = max(scores.get(url, 0.0), score_linkedin_result(result, lead_name, company))
+    return sorted(((score, url) for url, score in scores.items()), reverse=True)
+
+def match_linkedin_url(search_results, lead_name, company):
+    """
+    Returns the LinkedIn URL of the lead when the deterministic matcher is
+    confident about it, else None.
+    """
+    ranked = rank_linkedin_urls(search_results, lead_name, company)
+    if not ranked:
+        return None
+    best_score, best_url = ranked[0]
+    runner_up_score = ranked[1][0] if len(ranked) > 1 else 0.0
+    if best_score >= LINKEDIN_MATCH_THRESHOLD and best_score - runner_up_score >= LINKEDIN_MATCH_MARGIN:
+        return best_url
+    return None
+
+def _record_linkedin_match(deterministic):
+    with _linkedin_match_stats_lock:
+        _linkedin_match_stats["deterministic" if deterministic else "llm_fallback"] += 1
+        stats = dict(_linkedin_match_stats)
+    logger.info("LinkedIn URL matched {} (stats: {})", "deterministically" if deterministic else "by the LLM", stats)
+
+def get_linkedin_match_stats():
     """
-    Extracts the LinkedIn URL from the search results.
+    Returns how many LinkedIn URLs were matched deterministically versus by the LLM.
     """
-    for result in search_results:
-        if 'linkedin.com/in' in result['link']:
-            return result['link']
-    return ""
+    with _linkedin_match_stats_lock:
+        total = sum(_linkedin_match_stats.values())
+        return {**_linkedin_match_stats, "hit_ratio": _linkedin_match_stats["deterministic"] / max(total, 1)}
 
 
-def extract_linkedin_url(search_results):
-    EXTRACT_LINKEDIN_URL_PROMPT = """
+EXTRACT_LINKEDIN_URL_PROMPT = """
     **Role:**  
     You are an expert in extracting LinkedIn URLs from Google search results, specializing in finding the correct personal LinkedIn URL.
 
@@ -28,23 +134,90 @@ def extract_linkedin_url(search_results):
     2. If no valid URL exists, output **only** an empty string.  
     3. Only consider URLs with `"/in"`. Ignore those with `"/posts"` or `"/company"`.  
     """
-    
+
+
+def extract_linkedin_url(search_results, lead_name="", company=""):
+    """
+    Finds the lead LinkedIn URL in the search results. The deterministic matcher is
+    tried first when the lead name is known, the LLM is only called when it is not confident.
+    """
+    if lead_name:
+        url = match_linkedin_url(search_results, lead_name, company)
+        _record_linkedin_match(deterministic=url is not None)
+        if url:
+            return url
+
     result = invoke_llm(
         system_prompt=EXTRACT_LINKEDIN_URL_PROMPT, 
         user_message=str(search_results),
         model="gemini-2.0-flash"
     )
     return result
-    
-    
-def scrape_linkedin(linkedin_url, is_company=False):
+
+
+async def aextract_linkedin_url(search_results, lead_name="", company=""):
     """
-    Scrapes LinkedIn profile data based on the provided LinkedIn URL.
-    
-    @param linkedin_url: The LinkedIn URL to scrape.
-    @param is_company: Boolean indicating whether to scrape a company profile or a person profile.
-    @return: The scraped LinkedIn profile data.
+    Async version of `extract_linkedin_url`.
+    """
+    if lead_name:
+        url = match_linkedin_url(search_results, lead_name, company)
+        _record_linkedin_match(deterministic=url is not None)
+        if url:
+            return url
+
+    result = await ainvoke_llm(
+        system_prompt=EXTRACT_LINKEDIN_URL_PROMPT, 
+        user_message=str(search_results),
+        model="gemini-2.0-flash"
+    )
+    return result
+
+
+def get_linkedin_cache():
+    """
+    Returns the process-wide LinkedIn profile cache, opening the SQLite store on first use.
     """
+    global _linkedin_cache
+    if _linkedin_cache is None:
+        with _linkedin_cache_lock:
+            if _linkedin_cache is None:
+                _linkedin_cache = CompressedSQLiteCache(
+                    LINKEDIN_CACHE_PATH,
+                    ttl=LINKEDIN_CACHE_TTL_DAYS * 86400,
+                    max_bytes=int(LINKEDIN_CACHE_MAX_MB * 1024 * 1024)
+                )
+    return _linkedin_cache
+
+def _linkedin_cache_key(linkedin_url, is_company):
+    # Same profile whatever the scheme, "www." prefix, query string or trailing slash
+    parts = urlsplit(linkedin_url.strip() if "://" in linkedin_url else f"https://{linkedin_url.strip()}")
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/").lower()
+    return f"{'company' if is_company else 'person'}:{host}{path}"
+
+def _get_cached_linkedin(linkedin_url, is_company, force_refresh):
+    if not LINKEDIN_CACHE_ENABLED or force_refresh or not linkedin_url:
+        return None
+    try:
+        data = get_linkedin_cache().get(_linkedin_cache_key(linkedin_url, is_company))
+    except Exception as e:
+        logger.warning("Failed to read LinkedIn cache for {}: {}", linkedin_url, e)
+        return None
+    if data is not None:
+        logger.info("LinkedIn cache hit for {}", linkedin_url)
+    return data
+
+def _set_cached_linkedin(linkedin_url, is_company, data):
+    # Only successful responses are stored so failures are retried on the next run
+    if not LINKEDIN_CACHE_ENABLED or not linkedin_url or not data:
+        return
+    try:
+        get_linkedin_cache().set(_linkedin_cache_key(linkedin_url, is_company), data)
+    except Exception as e:
+        logger.warning("Failed to write LinkedIn cache for {}: {}", linkedin_url, e)
+
+
+def _linkedin_request(linkedin_url, is_company):
     if is_company:
         url = "https://fresh-linkedin-profile-data.p.rapidapi.com/get-company-by-linkedinurl"
     else:     
@@ -55,12 +228,49 @@ def scrape_linkedin(linkedin_url, is_company=False):
       "x-rapidapi-key": os.getenv("RAPIDAPI_KEY"),
       "x-rapidapi-host": "fresh-linkedin-profile-data.p.rapidapi.com"
     }
+    return url, headers, querystring
+
 
-    response = requests.get(url, headers=headers, params=querystring)
+def _parse_linkedin_response(response, linkedin_url, querystring):
     if response.status_code == 200:
         data = response.json()
         return data
     else:
         print(f"Request failed with status code: {response.status_code}")
         print("LinkedIn URL:", linkedin_url)
-        print("Querystring:", querystring)
\ No newline at end of file
+        print("Querystring:", querystring)
+
+
+def scrape_linkedin(linkedin_url, is_company=False, force_refresh=False):
+    """
+    Scrapes LinkedIn profile data based on the provided LinkedIn URL.
+    
+    @param linkedin_url: The LinkedIn URL to scrape.
+    @param is_company: Boolean indicating whether to scrape a company profile or a person profile.
+    @param force_refresh: Boolean indicating whether to bypass the local cache and fetch fresh data.
+    @return: The scraped LinkedIn profile data.
+    """
+    data = _get_cached_linkedin(linkedin_url, is_company, force_refresh)
+    if data is not None:
+        return data
+
+    url, headers, querystring = _linkedin_request(linkedin_url, is_company)
+    response = http_request("GET", url, service="rapidapi", headers=headers, params=querystring)
+    data = _parse_linkedin_response(response, linkedin_url, querystring)
+    _set_cached_linkedin(linkedin_url, is_company, data)
+    return data
+
+
+async def ascrape_linkedin(linkedin_url, is_company=False, force_refresh=False):
+    """
+    Async version of `scrape_linkedin`.
+    """
+    data = _get_cached_linkedin(linkedin_url, is_company, force_refresh)
+    if data is not None:
+        return data
+
+    url, headers, querystring = _linkedin_request(linkedin_url, is_company)
+    response = await ahttp_request("GET", url, service="rapidapi", headers=headers, params=querystring)
+    data = _parse_linkedin_response(response, linkedin_url, querystring)
+    _set_cached_linkedin(linkedin_url, is_company, data)
+    return data
\ No newline at end of file
@@ -1,33 +1,165 @@
 import re
+import asyncio
 import html2text
-import requests
 from bs4 import BeautifulSoup
+from pydantic import BaseModel
+from loguru import logger
+from sample_agent.state import SocialMediaLinks
+from sample_agent.tools.base.web_fetcher import fetch_url, afetch_url
+from sample_agent.tools.base.link_classifier import extract_page_links, classify_social_links
 
-def scrape_website_to_markdown(url: str) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate"
-    }
-
-    # Make the HTTP request
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Failed to fetch the URL. Status code: {response.status_code}")
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
 
-    # Parse the HTML
-    soup = BeautifulSoup(response.text, "html.parser")
-    html_content = soup.prettify() 
+# Elements with no readable content, dropped before the markdown conversion
+STRIPPED_TAGS = ("head", "script", "style", "noscript", "template", "svg", "canvas", "iframe")
+# Navigation elements, only their links are kept (blog and social media links often live in the footer)
+NAVIGATION_TAGS = ("nav", "footer")
 
-    # Convert HTML to markdown
+def _markdown_converter():
     h = html2text.HTML2Text()
     h.ignore_links = False
     h.ignore_images = True
     h.ignore_tables = True
-    markdown_content = h.handle(html_content)
+    return h
 
+def _clean_markdown(markdown_content):
     # Clean up excess newlines
     markdown_content = re.sub(r"\n{3,}", "\n\n", markdown_content)
-    markdown_content = markdown_content.strip()
+    return markdown_content.strip()
+
+def html_to_markdown_bs4(html: str) -> str:
+    """
+    Original conversion, parses the page with BeautifulSoup and re-serializes it
+    with `prettify` before handing it to html2text. Used when lxml is not installed.
+    """
+    # Parse the HTML
+    soup = BeautifulSoup(html, "html.parser")
+    html_content = soup.prettify()
+
+    # Convert HTML to markdown
+    markdown_content = _markdown_converter().handle(html_content)
+    return _clean_markdown(markdown_content)
+
+def _compact_navigation(document):
+    """
+    Replaces navigation menus and footers with a single paragraph of their links.
+    """
+    for element in list(document.iter(*NAVIGATION_TAGS)):
+        # Skip menus nested in an already replaced footer
+        if element.getroottree().getroot() is not document:
+            continue
+        paragraph = lxml_html.Element("p")
+        for link in element.iter("a"):
+            href = link.get("href")
+            if not href or href.startswith(("#", "javascript:")):
+                continue
+            anchor = lxml_html.Element("a", href=href)
+            anchor.text = " ".join(link.text_content().split()) or href
+            anchor.tail = " "
+            paragraph.append(anchor)
+        paragraph.tail = element.tail
+        element.getparent().replace(element, paragraph)
+
+def parse_html(html: str):
+    """
+    Parses a page with lxml, returns None when lxml is not installed or the page
+    can't be parsed so callers can fall back to BeautifulSoup.
+    """
+    if etree is None or not html or not html.strip():
+        return None
+
+    # Parse bytes so pages starting with an XML encoding declaration are accepted
+    parser = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8", errors="replace"), parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+def document_to_markdown(document) -> str:
+    """
+    Converts a page parsed by `parse_html` to markdown. The non-content elements
+    are dropped in place, the document can't be read again afterwards.
+    """
+    etree.strip_elements(document, *STRIPPED_TAGS, with_tail=False)
+    _compact_navigation(document)
+
+    markdown_content = _markdown_converter().handle(lxml_html.tostring(document, encoding="unicode"))
+    return _clean_markdown(markdown_content)
+
+def html_to_markdown(html: str) -> str:
+    """
+    Converts a page to markdown. The page is parsed once with lxml (C parser), the
+    non-content elements are dropped in place and the compact HTML goes to html2text.
+    """
+    if not html or not html.strip():
+        return ""
+    document = parse_html(html)
+    if document is None:
+        return html_to_markdown_bs4(html)
+    return document_to_markdown(document)
+
+def _log_fetch(result):
+    logger.info(
+        "Fetched {} ({}, status {}, {} chars, {:.2f}s{})",
+        result.url, result.reason, result.status_code, len(result.text), result.elapsed,
+        ", from cache" if result.from_cache else ""
+    )
+
+def scrape_website_to_markdown(url: str) -> str:
+    """
+    Returns the page content as markdown. Returns an empty string when the page
+    could not be fetched, and the content read so far when it was cut short.
+    """
+    result = fetch_url(url)
+    _log_fetch(result)
+    if not result.text:
+        return ""
+
+    return html_to_markdown(result.text)
+
+class ScrapedPage(BaseModel):
+    url: str
+    markdown: str = ""
+    social_media_links: SocialMediaLinks = SocialMediaLinks()
+
+def _build_scraped_page(result):
+    if not result.text:
+        return ScrapedPage(url=result.url)
+    base_url = result.final_url or result.url
+    return ScrapedPage(
+        url=base_url,
+        markdown=html_to_markdown(result.text),
+        social_media_links=classify_social_links(extract_page_links(result.text, base_url), base_url)
+    )
+
+def scrape_website(url: str) -> ScrapedPage:
+    """
+    Returns the page content as markdown along with the blog and social media links
+    found in its `<a href>` attributes. The page is empty when it could not be fetched.
+    """
+    result = fetch_url(url)
+    _log_fetch(result)
+    return _build_scraped_page(result)
+
+async def ascrape_website(url: str) -> ScrapedPage:
+    """
+    Async version of `scrape_website`, the HTML processing runs in a worker thread.
+    """
+    result = await afetch_url(url)
+    _log_fetch(result)
+    return await asyncio.to_thread(_build_scraped_page, result)
+
+async def ascrape_website_to_markdown(url: str) -> str:
+    """
+    Async version of `scrape_website_to_markdown`, the HTML conversion runs in a worker thread.
+    """
+    result = await afetch_url(url)
+    _log_fetch(result)
+    if not result.text:
+        return ""
 
-    return markdown_content
\ No newline at end of file
+    return await asyncio.to_thread(html_to_markdown, result.text)
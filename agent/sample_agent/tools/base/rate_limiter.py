@@ -0,0 +1,193 @@
+import os
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from loguru import logger
+
+# Default request rates (requests per second) and burst sizes of each external service,
+# override them with RATE_LIMIT_<SERVICE>_RPS and RATE_LIMIT_<SERVICE>_BURST env vars
+DEFAULT_RATE_LIMITS = {
+    "gemini": (2.0, 5),
+    "serper": (5.0, 10),
+    "rapidapi": (1.0, 2),
+    "youtube": (5.0, 10),
+    "google_drive": (3.0, 6),
+}
+
+# Status codes telling us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter with AIMD (additive increase, multiplicative decrease)
+    rate adaptation. The rate is halved on each throttling response and recovers by
+    `increase_step` requests per second on each successful one, up to `max_rate`.
+    Safe to use from threads and from asyncio tasks.
+    """
+
+    def __init__(self, name, max_rate, burst, min_rate=None, increase_step=None, decrease_factor=0.5):
+        self.name = name
+        self.max_rate = max_rate
+        self.min_rate = min_rate or max_rate / 20
+        self.increase_step = increase_step or max_rate / 20
+        self.decrease_factor = decrease_factor
+        self.rate = max_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.request_time = 0.0
+
+    def _reserve(self):
+        """
+        Takes one token and returns how long the caller has to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+        self._record_wait(delay)
+
+    async def aacquire(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        self._record_wait(delay)
+
+    def _record_wait(self, delay):
+        with self._lock:
+            self.wait_time += delay
+
+    def record_response(self, status_code, elapsed):
+        """
+        Records a request duration and adapts the rate to the response status code.
+        """
+        with self._lock:
+            self.requests += 1
+            self.request_time += elapsed
+            if status_code in THROTTLE_STATUS_CODES:
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                # Drop the accumulated burst so the slowdown is immediate
+                self.tokens = min(self.tokens, 0)
+                logger.warning("{} throttled ({}), lowering rate to {:.2f} req/s", self.name, status_code, self.rate)
+            elif status_code is not None and status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def get_metrics(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "wait_time": self.wait_time,
+                "request_time": self.request_time,
+            }
+
+
+class RequestSlot:
+    """
+    Handle returned by `rate_limited` to report the outcome of the request.
+    """
+
+    def __init__(self):
+        self.status_code = None
+
+    def record(self, status_code):
+        self.status_code = status_code
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(service):
+    """
+    Returns the shared token bucket of the given service, configured from env vars.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(service)
+        if limiter is None:
+            default_rate, default_burst = DEFAULT_RATE_LIMITS.get(service, (5.0, 10))
+            prefix = f"RATE_LIMIT_{service.upper()}"
+            limiter = TokenBucket(
+                service,
+                max_rate=float(os.getenv(f"{prefix}_RPS", default_rate)),
+                burst=int(os.getenv(f"{prefix}_BURST", default_burst)),
+            )
+            _limiters[service] = limiter
+        return limiter
+
+
+def get_rate_limit_metrics():
+    """
+    Returns the current rate, request counts, waiting time and request time of every service.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_metrics() for limiter in limiters}
+
+
+def _status_from_exception(error):
+    # HTTP client errors carry a response, Google API errors a status code
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None) or getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status_code, int):
+        return status_code
+    if "429" in str(error) or "RESOURCE_EXHAUSTED" in str(error):
+        return 429
+    return None
+
+
+@contextmanager
+def rate_limited(service):
+    """
+    Waits for a request slot of `service` and measures the request made inside the block.
+    Report the response status with `slot.record(status_code)`, exceptions carrying a
+    429/503 status are recorded automatically.
+    """
+    limiter = get_rate_limiter(service)
+    limiter.acquire()
+    slot = RequestSlot()
+    started_at = time.monotonic()
+    try:
+        yield slot
+    except Exception as e:
+        slot.record(_status_from_exception(e))
+        raise
+    finally:
+        limiter.record_response(slot.status_code, time.monotonic() - started_at)
+
+
+@asynccontextmanager
+async def arate_limited(service):
+    """
+    Async version of `rate_limited`.
+    """
+    limiter = get_rate_limiter(service)
+    await limiter.aacquire()
+    slot = RequestSlot()
+    started_at = time.monotonic()
+    try:
+        yield slot
+    except Exception as e:
+        slot.record(_status_from_exception(e))
+        raise
+    finally:
+        limiter.record_response(slot.status_code, time.monotonic() - started_at)
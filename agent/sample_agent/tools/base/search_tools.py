@@ -1,26 +1,75 @@
 import os
 from dotenv import load_dotenv
 import json
-import requests
+from sample_agent.cache import TTLCache
+from sample_agent.tools.base.http_client import http_request, ahttp_request
+from loguru import logger
 
 
 load_dotenv()
 
-def google_search(query):
+# Serper results are cached for SEARCH_CACHE_TTL_MINUTES and identical in-flight
+# queries from concurrent leads share a single HTTP call
+SEARCH_CACHE_TTL_MINUTES = float(os.getenv("SEARCH_CACHE_TTL_MINUTES", "60"))
+search_cache = TTLCache(ttl=SEARCH_CACHE_TTL_MINUTES * 60, max_entries=2048)
+
+def normalize_query(query):
     """
-    Performs a Google search using the provided query.
+    Normalizes a search query so case and whitespace variations share a cache entry.
     """
+    return " ".join(str(query).lower().split())
+
+def _is_successful(result):
+    status_code, _ = result
+    return status_code == 200
+
+def _search_request(query):
     url = "https://google.serper.dev/search"
     payload = json.dumps({"q": query})
     headers = {
         'X-API-KEY': os.getenv("SERPER_API_KEY"),
         'content-type': 'application/json'
     }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    results = response.json().get('organic', [])
+    return url, headers, payload
+
+def google_search(query):
+    """
+    Performs a Google search using the provided query.
+    """
+    logger.info("Performing Google search for query: {}", query)
+
+    def search():
+        url, headers, payload = _search_request(query)
+        response = http_request("POST", url, service="serper", headers=headers, content=payload)
+        return response.status_code, response.json().get('organic', [])
+
+    _, results = search_cache.get_or_compute(
+        ("search", normalize_query(query)), search, cache_if=_is_successful
+    )
+    logger.info("Google search for query {} returned {} results", query, len(results))
+    logger.debug("Google search results for query {}: {}", query, results)
     return results
 
-def get_recent_news(company: str) -> str:
+async def agoogle_search(query):
+    """
+    Async version of `google_search`.
+    """
+    logger.info("Performing Google search for query: {}", query)
+
+    async def search():
+        url, headers, payload = _search_request(query)
+        response = await ahttp_request("POST", url, service="serper", headers=headers, content=payload)
+        return response.status_code, response.json().get('organic', [])
+
+    _, results = await search_cache.aget_or_compute(
+        ("search", normalize_query(query)), search, cache_if=_is_successful
+    )
+    logger.info("Google search for query {} returned {} results", query, len(results))
+    logger.debug("Google search results for query {}: {}", query, results)
+    return results
+
+def _news_request(company: str):
+    logger.info("Fetching recent news for company: {}", company)
     url = "https://google.serper.dev/news"
     
     # Define the payload for the request
@@ -35,19 +84,20 @@ def get_recent_news(company: str) -> str:
         'X-API-KEY': os.getenv("SERPER_API_KEY"),
         'Content-Type': 'application/json'
     }
-    
-    # Make the POST request to the API
-    response = requests.post(url, headers=headers, data=payload)
-    
+    return url, headers, payload
+
+def _news_cache_key(company):
+    return ("news", normalize_query(company), 20, "qdr:y")
+
+def _format_news(status_code, news):
     # Check if the response is successful
-    if response.status_code == 200:
-        news = response.json().get("news", [])
-        
+    if status_code == 200:
+        logger.info("Fetched {} news items", len(news))
+        logger.debug("Fetched news items: {}", news)
         # Prepare the string to return
         news_string = ""
-        news.reverse()  # Reverse the list to get the most recent news first
-        
-        for item in news:
+        # Most recent news first, the response list is left untouched
+        for item in reversed(news):
             title = item.get('title')
             snippet = item.get('snippet')
             date = item.get('date')
@@ -57,4 +107,34 @@ def get_recent_news(company: str) -> str:
         
         return news_string
     else:
-        return f"Error fetching news: {response.status_code}"
\ No newline at end of file
+        logger.error("Error fetching news: {}", status_code)
+        return f"Error fetching news: {status_code}"
+
+def get_recent_news(company: str) -> str:
+    def fetch_news():
+        url, headers, payload = _news_request(company)
+        
+        # Make the POST request to the API
+        response = http_request("POST", url, service="serper", headers=headers, content=payload)
+        news = response.json().get("news", []) if response.status_code == 200 else []
+        return response.status_code, _format_news(response.status_code, news)
+
+    _, news_string = search_cache.get_or_compute(
+        _news_cache_key(company), fetch_news, cache_if=_is_successful
+    )
+    return news_string
+
+async def aget_recent_news(company: str) -> str:
+    """
+    Async version of `get_recent_news`.
+    """
+    async def fetch_news():
+        url, headers, payload = _news_request(company)
+        response = await ahttp_request("POST", url, service="serper", headers=headers, content=payload)
+        news = response.json().get("news", []) if response.status_code == 200 else []
+        return response.status_code, _format_news(response.status_code, news)
+
+    _, news_string = await search_cache.aget_or_compute(
+        _news_cache_key(company), fetch_news, cache_if=_is_successful
+    )
+    return news_string
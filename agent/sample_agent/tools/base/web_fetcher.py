@@ -0,0 +1,238 @@
+import os
+import time
+import threading
+import httpx
+from pydantic import BaseModel
+from loguru import logger
+from sample_agent.cache import CompressedSQLiteCache, CACHE_DIR
+from sample_agent.tools.base.http_client import (
+    get_http_client, get_async_http_client, _host_semaphore, _async_host_semaphore
+)
+
+# Limits of a single page download, a slow or huge website is cut off instead of
+# holding the lead for minutes. The page read so far is still returned.
+WEB_FETCH_MAX_BYTES = int(os.getenv("WEB_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+WEB_FETCH_CONNECT_TIMEOUT = float(os.getenv("WEB_FETCH_CONNECT_TIMEOUT", "5"))
+WEB_FETCH_READ_TIMEOUT = float(os.getenv("WEB_FETCH_READ_TIMEOUT", "10"))
+WEB_FETCH_TOTAL_TIMEOUT = float(os.getenv("WEB_FETCH_TOTAL_TIMEOUT", "20"))
+
+# Pages with an ETag or Last-Modified header are kept locally and revalidated with a conditional GET
+WEB_CACHE_ENABLED = os.getenv("WEB_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+WEB_CACHE_PATH = os.getenv("WEB_CACHE_PATH", os.path.join(CACHE_DIR, "web_cache.sqlite"))
+WEB_CACHE_TTL_DAYS = float(os.getenv("WEB_CACHE_TTL_DAYS", "30"))
+WEB_CACHE_MAX_MB = float(os.getenv("WEB_CACHE_MAX_MB", "256"))
+
+
+def _accept_encoding():
+    # httpx decodes brotli only when one of the brotli packages is installed
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+FETCH_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": _accept_encoding(),
+}
+
+# Reason codes of a fetch result
+FETCH_OK = "ok"
+FETCH_NOT_MODIFIED = "not_modified"
+FETCH_TRUNCATED = "truncated"
+FETCH_TIMEOUT = "timeout"
+FETCH_HTTP_ERROR = "http_error"
+FETCH_NETWORK_ERROR = "network_error"
+FETCH_INVALID_URL = "invalid_url"
+
+
+class FetchResult(BaseModel):
+    url: str
+    final_url: str = ""
+    status_code: int = 0
+    text: str = ""
+    reason: str = FETCH_OK
+    truncated: bool = False
+    from_cache: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return bool(self.text)
+
+
+_web_cache = None
+_web_cache_lock = threading.Lock()
+
+
+def get_web_cache():
+    """
+    Returns the local HTTP cache used for conditional requests, opening the SQLite store on first use.
+    """
+    global _web_cache
+    if _web_cache is None:
+        with _web_cache_lock:
+            if _web_cache is None:
+                _web_cache = CompressedSQLiteCache(
+                    WEB_CACHE_PATH,
+                    ttl=WEB_CACHE_TTL_DAYS * 86400,
+                    max_bytes=int(WEB_CACHE_MAX_MB * 1024 * 1024)
+                )
+    return _web_cache
+
+
+def _cached_page(url):
+    if not WEB_CACHE_ENABLED:
+        return None
+    try:
+        return get_web_cache().get(url)
+    except Exception as e:
+        logger.warning("Failed to read web cache for {}: {}", url, e)
+        return None
+
+
+def _request_headers(cached_page):
+    headers = dict(FETCH_HEADERS)
+    if cached_page:
+        if cached_page.get("etag"):
+            headers["If-None-Match"] = cached_page["etag"]
+        if cached_page.get("last_modified"):
+            headers["If-Modified-Since"] = cached_page["last_modified"]
+    return headers
+
+
+def _timeout():
+    return httpx.Timeout(WEB_FETCH_READ_TIMEOUT, connect=WEB_FETCH_CONNECT_TIMEOUT)
+
+
+class _BodyReader:
+    """
+    Accumulates the decoded body chunks until the size or time budget runs out.
+    """
+
+    def __init__(self, started_at):
+        self.deadline = started_at + WEB_FETCH_TOTAL_TIMEOUT
+        self.chunks = []
+        self.size = 0
+        self.reason = FETCH_OK
+
+    def add(self, chunk):
+        """
+        Adds a chunk and returns False once the download has to stop.
+        """
+        remaining = WEB_FETCH_MAX_BYTES - self.size
+        self.chunks.append(chunk[:remaining])
+        self.size += min(len(chunk), remaining)
+        if len(chunk) > remaining:
+            self.reason = FETCH_TRUNCATED
+            return False
+        if time.monotonic() > self.deadline:
+            self.reason = FETCH_TIMEOUT
+            return False
+        return True
+
+    def text(self, encoding):
+        return b"".join(self.chunks).decode(encoding or "utf-8", errors="replace")
+
+
+def _build_result(url, response, reader, cached_page, started_at):
+    elapsed = time.monotonic() - started_at
+    final_url = str(response.url)
+
+    if response.status_code == 304 and cached_page:
+        return FetchResult(
+            url=url, final_url=cached_page.get("final_url", final_url), status_code=304,
+            text=cached_page["text"], reason=FETCH_NOT_MODIFIED, from_cache=True, elapsed=elapsed
+        )
+    if response.status_code != 200:
+        logger.warning("Fetching {} returned status code {}", url, response.status_code)
+        return FetchResult(
+            url=url, final_url=final_url, status_code=response.status_code,
+            reason=FETCH_HTTP_ERROR, elapsed=elapsed
+        )
+
+    text = reader.text(response.encoding)
+    truncated = reader.reason != FETCH_OK
+    if truncated:
+        logger.warning("Fetching {} stopped early ({}) after {} bytes", url, reader.reason, reader.size)
+    elif WEB_CACHE_ENABLED and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        # Only complete pages are worth revalidating later
+        try:
+            get_web_cache().set(url, {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "final_url": final_url,
+                "text": text,
+            })
+        except Exception as e:
+            logger.warning("Failed to write web cache for {}: {}", url, e)
+
+    return FetchResult(
+        url=url, final_url=final_url, status_code=200, text=text,
+        reason=reader.reason, truncated=truncated, elapsed=elapsed
+    )
+
+
+def _error_result(url, error, started_at):
+    if isinstance(error, httpx.TimeoutException):
+        reason = FETCH_TIMEOUT
+    elif isinstance(error, (httpx.InvalidURL, httpx.UnsupportedProtocol)):
+        reason = FETCH_INVALID_URL
+    else:
+        reason = FETCH_NETWORK_ERROR
+    logger.warning("Fetching {} failed ({}): {}", url, reason, error)
+    return FetchResult(url=url, reason=reason, elapsed=time.monotonic() - started_at)
+
+
+def fetch_url(url):
+    """
+    Downloads a web page with connect/read timeouts, a total time budget and a
+    maximum size. Never raises: failures return an empty result with a reason code,
+    and a page cut short by the limits is returned as is with `truncated` set.
+    """
+    started_at = time.monotonic()
+    cached_page = _cached_page(url)
+    try:
+        with _host_semaphore(url):
+            with get_http_client().stream("GET", url, headers=_request_headers(cached_page), timeout=_timeout()) as response:
+                reader = _BodyReader(started_at)
+                if response.status_code == 200:
+                    try:
+                        for chunk in response.iter_bytes():
+                            if not reader.add(chunk):
+                                break
+                    except httpx.TimeoutException:
+                        # Keep what was read before the server stalled
+                        reader.reason = FETCH_TIMEOUT
+                return _build_result(url, response, reader, cached_page, started_at)
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        return _error_result(url, e, started_at)
+
+
+async def afetch_url(url):
+    """
+    Async version of `fetch_url`.
+    """
+    started_at = time.monotonic()
+    cached_page = _cached_page(url)
+    try:
+        async with _async_host_semaphore(url):
+            async with get_async_http_client().stream("GET", url, headers=_request_headers(cached_page), timeout=_timeout()) as response:
+                reader = _BodyReader(started_at)
+                if response.status_code == 200:
+                    try:
+                        async for chunk in response.aiter_bytes():
+                            if not reader.add(chunk):
+                                break
+                    except httpx.TimeoutException:
+                        reader.reason = FETCH_TIMEOUT
+                return _build_result(url, response, reader, cached_page, started_at)
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        return _error_result(url, e, started_at)
@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import time
+import hashlib
+from loguru import logger
+from langchain_core.documents import Document
+from langchain_community.document_loaders import UnstructuredFileLoader
+from sample_agent.tools.base.content_extractor import estimate_tokens
+
+# Documents embedded per call when (re)indexing case studies
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+
+# Case studies are indexed by sections of up to CASE_STUDY_CHUNK_CHARS characters, and
+# summarized at indexing time into a digest of about CASE_STUDY_DIGEST_MAX_TOKENS tokens
+CASE_STUDY_CHUNK_CHARS = int(os.getenv("CASE_STUDY_CHUNK_CHARS", "1200"))
+CASE_STUDY_DIGEST_MAX_TOKENS = int(os.getenv("CASE_STUDY_DIGEST_MAX_TOKENS", "400"))
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+
+# Results worth quoting in the outreach report: percentages, amounts, multipliers
+METRIC_PATTERN = re.compile(r"\d+(\.\d+)?\s?(%|x\b|percent)|[$€£]\s?\d|\b\d+(\.\d+)?\s?(k|m|million|billion|hours?|days?|weeks?)\b", re.IGNORECASE)
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def list_documents(docs_dir):
+    """
+    Returns the case study files as {relative path: absolute path}, hidden files excluded.
+    """
+    documents = {}
+    for root, dirs, files in os.walk(docs_dir):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+        for name in files:
+            if not name.startswith("."):
+                path = os.path.join(root, name)
+                documents[os.path.relpath(path, docs_dir).replace(os.sep, "/")] = path
+    return documents
+
+
+def load_manifest(index_path):
+    """
+    Returns the indexed files as {relative path: {"hash", "digest", "chunks"}}, or None
+    when there is no manifest (or one of an older format).
+    """
+    try:
+        with open(os.path.join(index_path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest["files"]
+
+
+def save_manifest(index_path, files):
+    # Write then rename so an interrupted refresh never leaves a truncated manifest
+    os.makedirs(index_path, exist_ok=True)
+    path = os.path.join(index_path, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _is_heading(paragraph):
+    # Unstructured renders headings as short standalone lines without final punctuation
+    return "\n" not in paragraph and len(paragraph) <= 80 and not paragraph.endswith((".", ":", ";", ","))
+
+
+def split_sections(text):
+    """
+    Splits a case study into [(heading, text)] sections on heading-like paragraphs.
+    """
+    sections = []
+    heading, paragraphs = "", []
+    for paragraph in (p.strip() for p in re.split(r"\n\s*\n", text)):
+        if not paragraph:
+            continue
+        if _is_heading(paragraph):
+            if paragraphs:
+                sections.append((heading, paragraphs))
+            heading, paragraphs = paragraph.lstrip("#").strip(), []
+        else:
+            paragraphs.append(paragraph)
+    if paragraphs:
+        sections.append((heading, paragraphs))
+    return sections
+
+
+def chunk_sections(sections):
+    """
+    Packs the paragraphs of each section into chunks of up to CASE_STUDY_CHUNK_CHARS
+    characters, every chunk starts with its section heading.
+    """
+    chunks = []
+    for heading, paragraphs in sections:
+        current = []
+        for paragraph in paragraphs:
+            if current and sum(len(p) for p in current) + len(paragraph) > CASE_STUDY_CHUNK_CHARS:
+                chunks.append((heading, "\n\n".join(current)))
+                current = []
+            current.append(paragraph)
+        if current:
+            chunks.append((heading, "\n\n".join(current)))
+    return [(heading, f"{heading}\n\n{text}" if heading else text) for heading, text in chunks]
+
+
+def build_digest(title, sections):
+    """
+    Compact version of a case study for the outreach prompt: the title, the opening
+    sentence of each section and the sentences quoting results (percentages, amounts),
+    within CASE_STUDY_DIGEST_MAX_TOKENS.
+    """
+    lines = [f"# {title}"]
+    for heading, paragraphs in sections:
+        sentences = [s for p in paragraphs for s in SENTENCE_END_PATTERN.split(p.replace("\n", " ")) if s]
+        if not sentences:
+            continue
+        kept = [sentences[0]] + [s for s in sentences[1:] if METRIC_PATTERN.search(s)]
+        lines.append((f"**{heading}:** " if heading else "") + " ".join(kept))
+
+    digest = ""
+    for line in lines:
+        if estimate_tokens(digest + line) > CASE_STUDY_DIGEST_MAX_TOKENS:
+            break
+        digest += line + "\n\n"
+    return digest.strip() or lines[0]
+
+
+def load_chunks(relative_path, path, content_hash):
+    """
+    Loads a case study, splits it into section chunks with stable ids derived from the
+    path and content hash, and builds its digest.
+    Returns the chunk documents, their ids and the digest.
+    """
+    text = "\n\n".join(doc.page_content for doc in UnstructuredFileLoader(path).load())
+    sections = split_sections(text)
+    # The document heading is the title, or the file name when it doesn't start with one
+    title = text.strip().split("\n", 1)[0].strip().lstrip("#").strip()
+    if not (title and _is_heading(title)):
+        title = os.path.splitext(os.path.basename(relative_path))[0].replace("_", " ").replace("-", " ").title()
+
+    docs, ids = [], []
+    for i, (heading, chunk) in enumerate(chunk_sections(sections)):
+        chunk_id = f"{relative_path}#{i}@{content_hash[:16]}"
+        docs.append(Document(
+            page_content=chunk,
+            metadata={"source": relative_path, "section": heading, "chunk_id": chunk_id, "content_hash": content_hash}
+        ))
+        ids.append(chunk_id)
+    return docs, ids, build_digest(title, sections)
+
+
+def _delete_chunks(vector_store, ids):
+    if ids:
+        vector_store.delete(ids=ids)
+
+
+def _add_in_batches(vector_store, docs, ids):
+    for i in range(0, len(docs), EMBEDDING_BATCH_SIZE):
+        vector_store.add_documents(docs[i:i + EMBEDDING_BATCH_SIZE], ids=ids[i:i + EMBEDDING_BATCH_SIZE])
+
+
+def sync_index(vector_store, docs_dir, index_path):
+    """
+    Brings the vector store in line with the case studies folder: only added or
+    changed files are embedded, chunks of changed and deleted files are removed.
+    An index without manifest, or with a manifest of an older format, is rebuilt once.
+    Returns the number of added, updated, deleted and unchanged files.
+    """
+    started_at = time.monotonic()
+    manifest = load_manifest(index_path)
+    if manifest is None:
+        logger.info("No case studies index manifest in {}, rebuilding the index", index_path)
+        vector_store.reset_collection()
+        manifest = {}
+
+    documents = list_documents(docs_dir)
+    stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    # Remove the chunks of deleted files
+    for relative_path in [path for path in manifest if path not in documents]:
+        _delete_chunks(vector_store, [chunk["id"] for chunk in manifest.pop(relative_path)["chunks"]])
+        stats["deleted"] += 1
+
+    # Embed new and changed files, batching the chunks of several files together
+    pending_docs, pending_ids = [], []
+    for relative_path, path in sorted(documents.items()):
+        content_hash = hash_file(path)
+        entry = manifest.get(relative_path)
+        if entry and entry["hash"] == content_hash:
+            stats["unchanged"] += 1
+            continue
+        if entry:
+            _delete_chunks(vector_store, [chunk["id"] for chunk in entry["chunks"]])
+            stats["updated"] += 1
+        else:
+            stats["added"] += 1
+
+        docs, ids, digest = load_chunks(relative_path, path, content_hash)
+        pending_docs += docs
+        pending_ids += ids
+        # Chunk texts are kept for the lexical (BM25) side of the case study search
+        manifest[relative_path] = {
+            "hash": content_hash,
+            "digest": digest,
+            "chunks": [{"id": chunk_id, "text": doc.page_content} for chunk_id, doc in zip(ids, docs)],
+        }
+        if len(pending_docs) >= EMBEDDING_BATCH_SIZE:
+            _add_in_batches(vector_store, pending_docs, pending_ids)
+            pending_docs, pending_ids = [], []
+    _add_in_batches(vector_store, pending_docs, pending_ids)
+
+    save_manifest(index_path, manifest)
+    logger.info("Case studies index refreshed in {:.1f}s: {}", time.monotonic() - started_at, stats)
+    return stats
@@ -0,0 +1,128 @@
+import os
+import re
+import math
+from collections import Counter
+from loguru import logger
+
+# Number of chunks taken from each of the lexical and vector rankings before fusing them
+CASE_STUDY_CANDIDATES = int(os.getenv("CASE_STUDY_CANDIDATES", "20"))
+# Reciprocal rank fusion constant, higher values flatten the gap between top ranks
+RRF_K = 60
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it", "its",
+    "of", "on", "or", "our", "that", "the", "their", "they", "this", "to", "was", "we", "were", "with", "you", "your",
+}
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the case study chunks, small enough to be rebuilt from the manifest
+    whenever the index changes.
+    """
+
+    def __init__(self, chunks):
+        self.ids = [chunk_id for chunk_id, _ in chunks]
+        self.term_frequencies = [Counter(tokenize(text)) for _, text in chunks]
+        self.lengths = [sum(frequencies.values()) for frequencies in self.term_frequencies]
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0
+        document_frequencies = Counter(term for frequencies in self.term_frequencies for term in frequencies)
+        total = len(chunks)
+        self.idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequencies.items()
+        }
+
+    def search(self, query, k):
+        """Returns the ids of the `k` best matching chunks, best first."""
+        # Long queries (whole research reports) count each term once
+        terms = [term for term in set(tokenize(query)) if term in self.idf]
+        scores = []
+        for chunk_id, frequencies, length in zip(self.ids, self.term_frequencies, self.lengths):
+            score = 0.0
+            for term in terms:
+                frequency = frequencies.get(term)
+                if frequency:
+                    normalization = BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length)
+                    score += self.idf[term] * frequency * (BM25_K1 + 1) / (frequency + normalization)
+            if score > 0:
+                scores.append((score, chunk_id))
+        scores.sort(reverse=True)
+        return [chunk_id for _, chunk_id in scores[:k]]
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Fuses rankings (lists of ids, best first) into {id: score}, the score of an id is
+    the sum of 1 / (k + rank) over the rankings it appears in.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class CaseStudySearch:
+    """
+    Hybrid search over the case study chunks: BM25 and vector rankings are fused with
+    reciprocal rank fusion, and each case study scores as its best chunk.
+    Results are the digests precomputed at indexing time.
+    """
+
+    def __init__(self, vector_store, manifest):
+        self.vector_store = vector_store
+        self.digests = {source: entry["digest"] for source, entry in manifest.items()}
+        self.chunk_sources = {
+            chunk["id"]: source for source, entry in manifest.items() for chunk in entry["chunks"]
+        }
+        self.bm25 = BM25Index([
+            (chunk["id"], chunk["text"]) for entry in manifest.values() for chunk in entry["chunks"]
+        ])
+
+    def _rank(self, query, vector_docs, k):
+        lexical = self.bm25.search(query, CASE_STUDY_CANDIDATES)
+        vector = [doc.metadata.get("chunk_id") for doc in vector_docs]
+        fused = reciprocal_rank_fusion([lexical, [chunk_id for chunk_id in vector if chunk_id]])
+
+        best = {}
+        for chunk_id, score in fused.items():
+            source = self.chunk_sources.get(chunk_id)
+            if source is not None and score > best.get(source, 0.0):
+                best[source] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:k]
+        logger.debug("Case study search: {} lexical and {} vector candidates, best {}", len(lexical), len(vector), ranked)
+        return [(source, self.digests[source], score) for source, score in ranked]
+
+    def search(self, query, k=1):
+        """Returns the `k` best matching case studies as [(source, digest, score)]."""
+        return self._rank(query, self.vector_store.similarity_search(query, k=CASE_STUDY_CANDIDATES), k)
+
+    def search_batch(self, queries, k=1):
+        """
+        Batch version of `search`: the queries are embedded in batched calls and, with the
+        NumPy backend, scored against all the chunks with a single matrix product.
+        """
+        embeddings = self.vector_store.embeddings
+        if hasattr(embeddings, "embed_queries"):
+            query_vectors = embeddings.embed_queries(queries)
+        else:
+            query_vectors = [embeddings.embed_query(query) for query in queries]
+
+        if hasattr(self.vector_store, "similarity_search_by_vectors_with_score"):
+            matches = self.vector_store.similarity_search_by_vectors_with_score(query_vectors, k=CASE_STUDY_CANDIDATES)
+            vector_docs = [[doc for doc, _ in query_matches] for query_matches in matches]
+        else:
+            vector_docs = [
+                self.vector_store.similarity_search_by_vector(vector, k=CASE_STUDY_CANDIDATES)
+                for vector in query_vectors
+            ]
+        return [self._rank(query, docs, k) for query, docs in zip(queries, vector_docs)]
@@ -1,9 +1,7 @@
-import os
 from dotenv import load_dotenv
-from sample_agent.utils import invoke_llm
-import json
-import requests
-from sample_agent.tools.base.linkedin_tools import scrape_linkedin
+from sample_agent.utils import invoke_llm, ainvoke_llm
+from sample_agent.tools.base.linkedin_tools import scrape_linkedin, ascrape_linkedin, extract_linkedin_url, aextract_linkedin_url
+from sample_agent.tools.base.search_tools import google_search, agoogle_search
 from loguru import logger
 
 load_dotenv()
@@ -59,17 +57,28 @@ def research_lead_company(linkedin_url):
 def generate_company_profile(company_linkedin_info, scraped_website):
     logger.info("Generating company profile for LinkedIn info and website: {}", {"linkedin_info": company_linkedin_info, "website": scraped_website})
     # Get company profile summary
+    profile_summary = invoke_llm(**_company_profile_request(company_linkedin_info, scraped_website))
+    logger.info("Generated company profile summary.")
+    return profile_summary
+
+async def agenerate_company_profile(company_linkedin_info, scraped_website):
+    """
+    Async version of `generate_company_profile`.
+    """
+    profile_summary = await ainvoke_llm(**_company_profile_request(company_linkedin_info, scraped_website))
+    logger.info("Generated company profile summary.")
+    return profile_summary
+
+def _company_profile_request(company_linkedin_info, scraped_website):
     inputs = (
         f"# Scraped Website:\n {scraped_website}\n\n"
         f"# Company LinkedIn Information:\n{company_linkedin_info}"
     )
-    profile_summary = invoke_llm(
+    return dict(
         system_prompt=CREATE_COMPANY_PROFILE, 
         user_message=inputs,
         model="gemini-2.5-flash"
     )
-    logger.info("Generated company profile summary.")
-    return profile_summary
 
 
 SUMMARIZE_LINKEDIN_PROFILE = """
@@ -89,109 +98,9 @@ The lead profile you are generating help sales teams understand inbound leads fo
 - Keep the profile neutral and factual; avoid words like "impressive" or "seasoned."  
 - Limit the profile to 300 words.   
 """
-def google_search(query):
-    """
-    Performs a Google search using the provided query.
-    """
-    logger.info("Performing Google search for query: {}", query)
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': os.getenv('SERPER_API_KEY'),
-        'content-type': 'application/json'
-    }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    results = response.json().get('organic', [])
-    logger.info("Google search results for query {}: {}", query, results)
-    return results
 
-def get_recent_news(company: str) -> str:
-    logger.info("Fetching recent news for company: {}", company)
-    url = "https://google.serper.dev/news"
-    
-    # Define the payload for the request
-    payload = json.dumps({
-        "q": company,
-        "num": 20,
-        "tbs": "qdr:y"
-    })
-    
-    # Set the headers
-    headers = {
-        'X-API-KEY': os.getenv("SERPER_API_KEY"),
-        'Content-Type': 'application/json'
-    }
-    
-    # Make the POST request to the API
-    response = requests.post(url, headers=headers, data=payload)
-    
-    # Check if the response is successful
-    if response.status_code == 200:
-        news = response.json().get("news", [])
-        logger.info("Fetched news items: {}", news)
-        
-        # Prepare the string to return
-        news_string = ""
-        news.reverse()  # Reverse the list to get the most recent news first
-        
-        for item in news:
-            title = item.get('title')
-            snippet = item.get('snippet')
-            date = item.get('date')
-            link = item.get('link')
-            
-            news_string += f"Title: {title}\nSnippet: {snippet}\nDate: {date}\nURL: {link}\n\n"
-        
-        return news_string
-    else:
-        logger.error("Error fetching news: {}", response.status_code)
-        return f"Error fetching news: {response.status_code}"
-
-def extract_linkedin_url(search_results):
-    EXTRACT_LINKEDIN_URL_PROMPT = """
-    **Role:**  
-    You are an expert in extracting LinkedIn URLs from Google search results, specializing in finding the correct personal LinkedIn URL.
-
-    **Objective:**  
-    From the provided search results, find the LinkedIn URL of a specific person working at a specific company.
-
-    **Instructions:**  
-    1. Output **only** the correct LinkedIn URL if found, nothing else.  
-    2. If no valid URL exists, output **only** an empty string.  
-    3. Only consider URLs with `"/in"`. Ignore those with `"/posts"` or `"/company"`.  
-    """
-    
-    result = invoke_llm(
-        system_prompt=EXTRACT_LINKEDIN_URL_PROMPT, 
-        user_message=str(search_results),
-        model="gemini-2.0-flash"
-    )
-    return result
-def research_lead_on_linkedin(lead_name, lead_company):
-    """
-    Searches for the lead's LinkedIn profile based on the lead name and company name.
-    
-    @param lead_name: The name of the lead to search for.
-    @return: A dictionary containing the lead profile data or an error message if not found.
-    """
-    # Remove company_name extraction
-    # company_name = extract_company_name(lead_email)
-    # Only use the lead's name in the search query
-    query = f"LinkedIn {lead_name} {lead_company}"
-    search_results = google_search(query)
-    print(search_results)
-    lead_linkedin_url = extract_linkedin_url(search_results)
-    if not lead_linkedin_url:
-        return "Lead LinkedIn URL not found.", "", "", ""
-
-    # Scrape lead LinkedIn profile
-    linkedin_data = scrape_linkedin(lead_linkedin_url)
-    if "data" not in linkedin_data:
-        return "LinkedIn profile not found", "", "", ""
-    
-    # Summarize collected information about lead
-    profile_data = linkedin_data["data"]
-    lead_profile_content = {
+def _build_lead_profile_content(profile_data):
+    return {
         "about": profile_data.get('about', ''),
         "full_name": profile_data.get('full_name', ''),
         "location": profile_data.get('location', ''),
@@ -254,26 +163,68 @@ def research_lead_on_linkedin(lead_name, lead_company):
             } for award in profile_data.get('honors_and_awards', [])
         ]
     }
+
+def research_lead_on_linkedin(lead_name, lead_company):
+    """
+    Searches for the lead's LinkedIn profile based on the lead name and company name.
     
-    # Extract the exact company name and LinkedIn & website url for later research
-    company_name = profile_data.get('company', '')
-    company_website = profile_data.get('company_website', '')
-    company_linkedin_url = profile_data.get('company_linkedin_url', '')
+    @param lead_name: The name of the lead to search for.
+    @return: A dictionary containing the lead profile data or an error message if not found.
+    """
+    # Remove company_name extraction
+    # company_name = extract_company_name(lead_email)
+    # Only use the lead's name in the search query
+    query = f"LinkedIn {lead_name} {lead_company}"
+    search_results = google_search(query)
+    print(search_results)
+    lead_linkedin_url = extract_linkedin_url(search_results, lead_name, lead_company)
+    if not lead_linkedin_url:
+        return "Lead LinkedIn URL not found.", "", "", ""
+
+    # Scrape lead LinkedIn profile
+    linkedin_data = scrape_linkedin(lead_linkedin_url)
+    if not linkedin_data or "data" not in linkedin_data:
+        return "LinkedIn profile not found", "", "", ""
     
     # Get Lead Linkedin profile summary
+    profile_data = linkedin_data["data"]
+    profile_summary = invoke_llm(**_lead_profile_request(lead_name, profile_data))
+    return (profile_summary, *_lead_company_info(profile_data))
+
+async def aresearch_lead_on_linkedin(lead_name, lead_company):
+    """
+    Async version of `research_lead_on_linkedin`.
+    """
+    query = f"LinkedIn {lead_name} {lead_company}"
+    search_results = await agoogle_search(query)
+    lead_linkedin_url = await aextract_linkedin_url(search_results, lead_name, lead_company)
+    if not lead_linkedin_url:
+        return "Lead LinkedIn URL not found.", "", "", ""
+
+    linkedin_data = await ascrape_linkedin(lead_linkedin_url)
+    if not linkedin_data or "data" not in linkedin_data:
+        return "LinkedIn profile not found", "", "", ""
+    
+    profile_data = linkedin_data["data"]
+    profile_summary = await ainvoke_llm(**_lead_profile_request(lead_name, profile_data))
+    return (profile_summary, *_lead_company_info(profile_data))
+
+def _lead_profile_request(lead_name, profile_data):
+    # Summarize collected information about lead
     inputs = (
         f"# Lead Name: {lead_name}\n\n"
-        f"# LinkedIn Scraped Information:\n{lead_profile_content}"
+        f"# LinkedIn Scraped Information:\n{_build_lead_profile_content(profile_data)}"
     )
-    profile_summary = invoke_llm(
+    return dict(
         system_prompt=SUMMARIZE_LINKEDIN_PROFILE, 
         user_message=inputs,
         model="gemini-2.0-flash"
     )
-    
+
+def _lead_company_info(profile_data):
+    # Extract the exact company name and LinkedIn & website url for later research
     return (
-        profile_summary, 
-        company_name, 
-        company_website,
-        company_linkedin_url
-    )
\ No newline at end of file
+        profile_data.get('company', ''),
+        profile_data.get('company_website', ''),
+        profile_data.get('company_linkedin_url', '')
+    )
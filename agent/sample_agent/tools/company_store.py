@@ -0,0 +1,68 @@
+import os
+import re
+from urllib.parse import urlsplit
+from sample_agent.cache import TTLCache
+
+# Company level research (website review, blog, YouTube, news and digital presence reports)
+# is shared by all the leads of the same company during COMPANY_CACHE_TTL_MINUTES.
+# Concurrent leads of the same company wait for a single research instead of repeating it.
+COMPANY_CACHE_TTL_MINUTES = float(os.getenv("COMPANY_CACHE_TTL_MINUTES", "360"))
+company_research_cache = TTLCache(ttl=COMPANY_CACHE_TTL_MINUTES * 60, max_entries=1024)
+
+# Legal suffixes ignored when the company is identified by its name
+COMPANY_NAME_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "sa", "sas", "ag", "plc"}
+
+def normalize_company_domain(website):
+    """
+    Returns the lowercase domain of a company website without the "www." prefix.
+    """
+    website = (website or "").strip()
+    if not website:
+        return ""
+    if "://" not in website:
+        website = f"https://{website}"
+    return urlsplit(website).netloc.lower().split(":")[0].removeprefix("www.")
+
+def normalize_company_name(name):
+    """
+    Returns the company name lowercased, without punctuation and legal suffixes.
+    """
+    tokens = re.findall(r"[a-z0-9]+", (name or "").lower())
+    return " ".join(token for token in tokens if token not in COMPANY_NAME_SUFFIXES)
+
+def get_company_key(company_data, fallback_name=""):
+    """
+    Identifies a company by its website domain, or by its normalized name when the website is unknown.
+    """
+    domain = normalize_company_domain(company_data.website)
+    if domain:
+        return f"domain:{domain}"
+    name = normalize_company_name(company_data.name or fallback_name)
+    return f"name:{name}" if name else ""
+
+def is_successful_research(value):
+    """
+    Failed or empty research (None, "", no report) is never shared with the other leads.
+    """
+    return bool(value)
+
+def get_or_research(company_key, part, research, cache_if=is_successful_research):
+    """
+    Returns the cached `part` of the company research, running `research()` once
+    for all the leads of the company. Only results accepted by `cache_if` are kept.
+    Nothing is shared when the company is unknown.
+    """
+    if not company_key:
+        return research()
+    return company_research_cache.get_or_compute((company_key, part), research, cache_if=cache_if)
+
+async def aget_or_research(company_key, part, research, cache_if=is_successful_research):
+    """
+    Async version of `get_or_research`, `research` is a coroutine function.
+    """
+    if not company_key:
+        return await research()
+    return await company_research_cache.aget_or_compute((company_key, part), research, cache_if=cache_if)
+
+def get_company_store_stats():
+    return company_research_cache.get_stats()
@@ -0,0 +1,177 @@
+import os
+import re
+import time
+import hashlib
+import threading
+from loguru import logger
+from langchain_core.embeddings import Embeddings
+from sample_agent.cache import TTLCache
+
+# "google" (Gemini API), "fastembed" (local ONNX model), "sentence-transformers" (local
+# PyTorch model) or "hashing" (no model, works offline without extra dependencies)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "google").lower()
+DEFAULT_EMBEDDING_MODELS = {
+    "google": "models/gemini-embedding-001",
+    "fastembed": "BAAI/bge-small-en-v1.5",
+    "sentence-transformers": "sentence-transformers/all-MiniLM-L6-v2",
+    "hashing": "hashing-1024",
+}
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODELS.get(EMBEDDING_PROVIDER, ""))
+# Embeddings of recent queries are reused during QUERY_EMBEDDING_CACHE_TTL_MINUTES
+QUERY_EMBEDDING_CACHE_TTL_MINUTES = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_MINUTES", "60"))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+
+HASHING_DIMENSIONS = 1024
+HASHING_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_stats = {}
+_query_cache_stats = {}
+_stats_lock = threading.Lock()
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Feature hashing of words and word pairs into a fixed size vector. No model to
+    download, so it runs anywhere (CI, offline), at the cost of purely lexical matching.
+    """
+
+    def __init__(self, dimensions=HASHING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _embed(self, text):
+        vector = [0.0] * self.dimensions
+        tokens = HASHING_TOKEN_PATTERN.findall(text.lower())
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = sum(value * value for value in vector) ** 0.5
+        return [value / norm for value in vector] if norm else vector
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def _record_latency(provider, kind, count, elapsed):
+    with _stats_lock:
+        stats = _stats.setdefault(provider, {}).setdefault(kind, {"calls": 0, "texts": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["texts"] += count
+        stats["total_ms"] += elapsed * 1000
+        stats["max_ms"] = max(stats["max_ms"], elapsed * 1000)
+
+
+def get_embedding_stats():
+    """
+    Returns the number of embedding calls and their latency per provider, for document
+    (indexing) and query embeddings, along with the query cache hits.
+    """
+    with _stats_lock:
+        report = {
+            provider: {
+                kind: {**stats, "avg_ms": round(stats["total_ms"] / stats["calls"], 1)}
+                for kind, stats in kinds.items()
+            }
+            for provider, kinds in _stats.items()
+        }
+        for provider, cache_stats in _query_cache_stats.items():
+            report.setdefault(provider, {})["query_cache"] = dict(cache_stats)
+    return report
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model to time every call and reuse the embeddings of recent queries.
+    """
+
+    def __init__(self, embeddings, provider):
+        self.embeddings = embeddings
+        self.provider = provider
+        self.query_cache = TTLCache(ttl=QUERY_EMBEDDING_CACHE_TTL_MINUTES * 60, max_entries=QUERY_EMBEDDING_CACHE_SIZE)
+
+    def embed_documents(self, texts):
+        started_at = time.perf_counter()
+        vectors = self.embeddings.embed_documents(texts)
+        _record_latency(self.provider, "documents", len(texts), time.perf_counter() - started_at)
+        return vectors
+
+    def _embed_query(self, text):
+        started_at = time.perf_counter()
+        vector = self.embeddings.embed_query(text)
+        _record_latency(self.provider, "query", 1, time.perf_counter() - started_at)
+        return vector
+
+    def _record_cache_stats(self):
+        with _stats_lock:
+            _query_cache_stats[self.provider] = {
+                "hits": self.query_cache.hits + self.query_cache.coalesced,
+                "misses": self.query_cache.misses,
+            }
+
+    def embed_query(self, text):
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        vector = self.query_cache.get_or_compute(key, lambda: self._embed_query(text))
+        self._record_cache_stats()
+        return vector
+
+    def _embed_query_batch(self, texts):
+        if self.provider == "google":
+            # Gemini embeds queries and documents differently, one call for the whole batch
+            return self.embeddings.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+        if self.provider == "fastembed":
+            # Queries get their own prefix, computed locally so no round trip is saved by batching
+            return [self.embeddings.embed_query(text) for text in texts]
+        return self.embeddings.embed_documents(texts)
+
+    def embed_queries(self, texts, batch_size=32):
+        """
+        Embeds many queries at once: cached ones are reused and the others are embedded
+        `batch_size` per call instead of one call per query.
+        """
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors = [self.query_cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            started_at = time.perf_counter()
+            embedded = self._embed_query_batch([texts[i] for i in batch])
+            _record_latency(self.provider, "query_batch", len(batch), time.perf_counter() - started_at)
+            for i, vector in zip(batch, embedded):
+                vectors[i] = vector
+                self.query_cache.set(keys[i], vector)
+        self._record_cache_stats()
+        return vectors
+
+
+def _create_embeddings(provider, model):
+    if provider == "google":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        return GoogleGenerativeAIEmbeddings(model=model)
+    if provider == "fastembed":
+        from langchain_community.embeddings import FastEmbedEmbeddings
+        return FastEmbedEmbeddings(model_name=model)
+    if provider == "sentence-transformers":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=model, encode_kwargs={"normalize_embeddings": True})
+    if provider == "hashing":
+        return HashingEmbeddings()
+    raise ValueError(f"Unsupported embedding provider: {provider}")
+
+
+def get_embeddings(provider=EMBEDDING_PROVIDER, model=EMBEDDING_MODEL):
+    """
+    Builds the embedding model of the given provider. Local models are downloaded on
+    first use and then run on CPU without network access.
+    """
+    logger.info("Using {} embeddings ({})", provider, model)
+    return CachedEmbeddings(_create_embeddings(provider, model), provider)
+
+
+def get_embeddings_id(provider=EMBEDDING_PROVIDER, model=EMBEDDING_MODEL):
+    """
+    Folder-safe name of the provider and model, vectors of different models can't be mixed.
+    """
+    return re.sub(r"[^a-zA-Z0-9._-]+", "_", f"{provider}-{model.split('/')[-1]}")
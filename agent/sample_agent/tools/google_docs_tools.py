@@ -1,53 +1,108 @@
-import os, re
-import tempfile
+import io, os, re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
+from sample_agent.cache import TTLCache
 from sample_agent.utils import get_google_credentials
+from sample_agent.tools.base.rate_limiter import rate_limited
+
+# Number of documents uploaded at the same time, for all leads together
+GOOGLE_DOCS_UPLOAD_CONCURRENCY = int(os.getenv("GOOGLE_DOCS_UPLOAD_CONCURRENCY", "6"))
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+DOCUMENT_MIME_TYPE = "application/vnd.google-apps.document"
+ANYONE_READER_PERMISSION = {"type": "anyone", "role": "reader"}
 
 class GoogleDocsManager:
     def __init__(self):
-        self.docs_service = build('docs', 'v1', credentials=get_google_credentials())
-        self.drive_service = build('drive', 'v3', credentials=get_google_credentials())
+        self.credentials = get_google_credentials()
+        # The API clients (httplib2) are not thread safe, each thread gets its own
+        self._thread_local = threading.local()
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=GOOGLE_DOCS_UPLOAD_CONCURRENCY, thread_name_prefix="google-docs"
+        )
+        # Folders looked up or created during the current run: name -> {"id", "link", "shared"}.
+        # Leads saving to the same folder wait for a single lookup, other folders are resolved concurrently
+        self._folders = TTLCache(ttl=float("inf"), max_entries=4096)
+
+    def clear_folder_cache(self):
+        """
+        Forgets the folders resolved so far, called at the start of each run so folders
+        deleted or moved in Drive in the meantime are looked up again.
+        """
+        self._folders.clear()
+
+    @property
+    def docs_service(self):
+        service = getattr(self._thread_local, "docs_service", None)
+        if service is None:
+            service = build('docs', 'v1', credentials=self.credentials)
+            self._thread_local.docs_service = service
+        return service
+
+    @property
+    def drive_service(self):
+        service = getattr(self._thread_local, "drive_service", None)
+        if service is None:
+            service = build('drive', 'v3', credentials=self.credentials)
+            self._thread_local.drive_service = service
+        return service
 
     def add_document(self, content, doc_title, folder_name, make_shareable=False, folder_shareable=False, markdown=False):
         """
         Create a Google Document and save it in the specified folder.
         """
+        documents = self.add_documents(
+            [{"content": content, "title": doc_title, "markdown": markdown}],
+            folder_name,
+            make_shareable=make_shareable,
+            folder_shareable=folder_shareable
+        )
+        return documents[0] if documents else None
+
+    def add_documents(self, documents, folder_name, make_shareable=False, folder_shareable=False):
+        """
+        Create several Google Documents (dicts with "content", "title" and "markdown") in the
+        specified folder. Documents are uploaded in parallel directly into the folder and
+        all the sharing permissions are set in a single batch request.
+        Returns a {"shareable_url", "folder_url", "elapsed"} dict per document, None for failures.
+        """
         try:
             # Ensure the folder exists
             folder_id, folder_url = self._get_or_create_folder(folder_name, make_shareable=folder_shareable)
             if not folder_id:
                 raise ValueError("Failed to get or create the folder.")
-
-            if markdown:
-                # Convert Markdown to Google Doc
-                doc_id = self._convert_markdown_to_google_doc(content, doc_title)
-            else:
-                # Create a new Google Document and add content
-                doc = self.docs_service.documents().create(body={"title": doc_title}).execute()
-                doc_id = doc.get('documentId')
-
-                # Add content to the document
-                requests = [{"insertText": {"location": {"index": 1}, "text": content}}]
-                self.docs_service.documents().batchUpdate(documentId=doc_id, body={"requests": requests}).execute()
-
-            # Move the document to the folder
-            self.drive_service.files().update(
-                fileId=doc_id,
-                addParents=folder_id,
-                removeParents="root",
-                fields="id, parents"
-            ).execute()
-
-            shareable_url = None
-            if make_shareable:
-                shareable_url = self._make_document_shareable(doc_id)
-
-            document_url = f"https://docs.google.com/document/d/{doc_id}"
-            return {"shareable_url": shareable_url or document_url, "folder_url": folder_url}
         except Exception as e:
-            print(f"Failed to add document: {e}")
-            return None
+            print(f"Failed to add documents: {e}")
+            return [None] * len(documents)
+
+        def upload(document):
+            started_at = time.perf_counter()
+            mimetype = "text/markdown" if document.get("markdown") else "text/plain"
+            file = self._upload_document(document["content"], document["title"], folder_id, mimetype)
+            return file, time.perf_counter() - started_at
+
+        # Upload the documents concurrently, a single one is uploaded from the calling thread
+        if len(documents) > 1:
+            uploads = list(self._upload_executor.map(upload, documents))
+        else:
+            uploads = [upload(document) for document in documents]
+        created = [file for file, _ in uploads]
+
+        if make_shareable:
+            self._share_files([file["id"] for file in created if file])
+
+        results = []
+        for file, elapsed in uploads:
+            if not file:
+                results.append(None)
+                continue
+            document_url = f"https://docs.google.com/document/d/{file['id']}"
+            shareable_url = file.get("webViewLink") if make_shareable else None
+            results.append({"shareable_url": shareable_url or document_url, "folder_url": folder_url, "elapsed": elapsed})
+        return results
 
     def get_document(self, doc_url):
         """
@@ -76,87 +131,83 @@ class GoogleDocsManager:
     def _get_or_create_folder(self, folder_name, make_shareable=False):
         """
         Get the ID and link of an existing folder with the specified name, or create one if it doesn't exist.
+        Folders are looked up once per run, and shared at most once.
         """
         try:
-            # Search for the folder
-            query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
-            results = self.drive_service.files().list(q=query, spaces='drive', fields="files(id, name, webViewLink)").execute()
-            files = results.get('files', [])
-            
-            if files:
-                # Folder exists
-                folder = files[0]
-                folder_id = folder['id']
-                folder_link = folder.get('webViewLink')
-            else:
-                # Folder doesn't exist, create it
-                file_metadata = {
-                    'name': folder_name,
-                    'mimeType': 'application/vnd.google-apps.folder'
-                }
-                folder = self.drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute()
-                folder_id = folder['id']
-                folder_link = folder.get('webViewLink')
+            folder = self._folders.get_or_compute(("folder", folder_name), lambda: self._find_or_create_folder(folder_name))
 
             # Make the folder shareable if required
-            if make_shareable:
-                self.drive_service.permissions().create(
-                    fileId=folder_id,
-                    body={"type": "anyone", "role": "reader"},
-                    fields="id"
-                ).execute()
-
-            return folder_id, folder_link
+            if make_shareable and not folder["shared"]:
+                self._folders.get_or_compute(("shared", folder["id"]), lambda: self._share_folder(folder["id"]))
+
+            return folder["id"], folder["link"]
         except Exception as e:
             print(f"An error occurred while retrieving or creating the folder: {e}")
             return None, None
 
-    def _make_document_shareable(self, doc_id):
-        """Make a document shareable with anyone who has the link."""
+    def _share_folder(self, folder_id):
+        self.drive_service.permissions().create(
+            fileId=folder_id,
+            body=ANYONE_READER_PERMISSION,
+            fields="id"
+        ).execute()
+        return True
+
+    def _find_or_create_folder(self, folder_name):
+        # Search for the folder, along with whether anyone with the link can already read it
+        escaped_name = folder_name.replace("\\", "\\\\").replace("'", "\\'")
+        query = f"mimeType='{FOLDER_MIME_TYPE}' and name='{escaped_name}' and trashed=false"
+        results = self.drive_service.files().list(
+            q=query, spaces='drive', fields="files(id, name, webViewLink, permissions(type, role))"
+        ).execute()
+        files = results.get('files', [])
+
+        if files:
+            # Folder exists
+            folder = files[0]
+            shared = any(
+                permission.get("type") == "anyone" and permission.get("role") in ("reader", "writer")
+                for permission in folder.get("permissions", [])
+            )
+            return {"id": folder['id'], "link": folder.get('webViewLink'), "shared": shared}
+
+        # Folder doesn't exist, create it
+        file_metadata = {'name': folder_name, 'mimeType': FOLDER_MIME_TYPE}
+        folder = self.drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute()
+        return {"id": folder['id'], "link": folder.get('webViewLink'), "shared": False}
+
+    def _share_files(self, file_ids):
+        """Make files readable by anyone with the link, with a single batch request."""
+        if not file_ids:
+            return
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                print(f"Failed to make document {request_id} shareable: {exception}")
+
+        batch = self.drive_service.new_batch_http_request(callback=on_response)
+        for file_id in file_ids:
+            batch.add(
+                self.drive_service.permissions().create(fileId=file_id, body=ANYONE_READER_PERMISSION, fields="id"),
+                request_id=file_id
+            )
         try:
-            self.drive_service.permissions().create(
-                fileId=doc_id,
-                body={"type": "anyone", "role": "reader"},
-                fields="id"
-            ).execute()
-            file_info = self.drive_service.files().get(fileId=doc_id, fields="webViewLink").execute()
-            return file_info.get("webViewLink")
+            batch.execute()
         except Exception as e:
-            print(f"Failed to make document shareable: {e}")
-            return None
+            print(f"Failed to make documents shareable: {e}")
 
-    def _convert_markdown_to_google_doc(self, markdown_content, title):
-        """Convert Markdown content to a Google Document."""
-        import time
+    def _upload_document(self, content, title, folder_id, mimetype):
+        """
+        Upload text or Markdown content from memory as a Google Document created directly in the folder.
+        Returns the file {"id", "webViewLink"}, or None on failure.
+        """
         try:
-            # Create a unique temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".md", mode="w", encoding="utf-8") as tmp:
-                tmp.write(markdown_content)
-                temp_file_path = tmp.name
-
-            # Upload the Markdown file to Google Drive
-            file_metadata = {"name": title, "mimeType": "application/vnd.google-apps.document"}
-            media = MediaFileUpload(temp_file_path, mimetype="text/markdown")
-            file = self.drive_service.files().create(body=file_metadata, media_body=media, fields="id").execute()
-
-            # Ensure the file is closed before deletion
-            if hasattr(media, 'stream') and callable(getattr(media, 'stream', None)):
-                try:
-                    media.stream().close()
-                except Exception:
-                    pass
-
-            # Retry deletion if file is still in use (Windows fix)
-            for _ in range(5):
-                try:
-                    os.remove(temp_file_path)
-                    break
-                except PermissionError:
-                    time.sleep(0.2)
-            else:
-                print(f"Warning: Could not delete temp file {temp_file_path}")
-
-            return file.get("id")
+            file_metadata = {"name": title, "mimeType": DOCUMENT_MIME_TYPE, "parents": [folder_id]}
+            media = MediaIoBaseUpload(io.BytesIO(content.encode("utf-8")), mimetype=mimetype)
+            with rate_limited("google_drive") as slot:
+                file = self.drive_service.files().create(body=file_metadata, media_body=media, fields="id, webViewLink").execute()
+                slot.record(200)
+            return file
         except Exception as e:
-            print(f"Failed to convert Markdown to Google Doc: {e}")
+            print(f"Failed to upload document {title}: {e}")
             return None
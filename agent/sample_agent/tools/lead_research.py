@@ -51,7 +51,7 @@ def research_lead_on_linkedin(lead_name, lead_company):
     # Find lead LinkedIn URL by searching on Google 'LinkedIn {{lead name}} {{company name}}'
     query = f"LinkedIn {lead_name} {company_name}"
     search_results = google_search(query)
-    lead_linkedin_url = extract_linkedin_url(search_results)
+    lead_linkedin_url = extract_linkedin_url(search_results, lead_name, company_name)
     if not lead_linkedin_url:
         logger.warning("Lead LinkedIn URL not found for query: {}", query)
         return "Lead LinkedIn URL not found."
@@ -59,7 +59,7 @@ def research_lead_on_linkedin(lead_name, lead_company):
 
     # Scrape lead LinkedIn profile
     linkedin_data = scrape_linkedin(lead_linkedin_url)
-    if "data" not in linkedin_data:
+    if not linkedin_data or "data" not in linkedin_data:
         logger.error("LinkedIn profile not found for URL: {}", lead_linkedin_url)
         return "LinkedIn profile not found"
     logger.info("Scraped LinkedIn profile for URL: {}", lead_linkedin_url)
@@ -1,33 +1,147 @@
 import os
-from langchain_community.document_loaders import DirectoryLoader
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_chroma import Chroma
+import time
+import threading
+from concurrent.futures import Future
+from loguru import logger
+from sample_agent.tools.case_study_index import sync_index, load_manifest
+from sample_agent.tools.case_study_search import CaseStudySearch
+from sample_agent.tools.vector_index import create_vector_store
+from sample_agent.tools.embeddings import get_embeddings, get_embeddings_id
 
+# Build the absolute path to the case studies directory and the vector index,
+# both can be moved with CASE_STUDIES_DIR and CASE_STUDIES_INDEX_PATH
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASE_STUDIES_DIR = os.path.abspath(os.getenv("CASE_STUDIES_DIR", os.path.join(BASE_DIR, "data", "case_studies")))
+CASE_STUDIES_INDEX_PATH = os.path.abspath(os.getenv("CASE_STUDIES_INDEX_PATH", os.path.join(BASE_DIR, "database")))
+# "numpy" (in-process exact search, default) or "chroma", each backend has its own index folder
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "numpy").lower()
+# Re-index added or changed case studies when the vector store is opened
+CASE_STUDIES_AUTO_REFRESH = os.getenv("CASE_STUDIES_AUTO_REFRESH", "true").lower() in ("1", "true", "yes")
+# Concurrent case study lookups (parallel leads) arriving within this window are matched
+# together in one batch, 0 matches each lead on its own. Leads processed one after another
+# have nothing to batch, so the wait is only on by default when LEADS_CONCURRENCY > 1
+LEADS_PARALLEL = int(os.getenv("LEADS_CONCURRENCY", "1")) > 1
+CASE_STUDY_BATCH_WAIT_MS = float(os.getenv("CASE_STUDY_BATCH_WAIT_MS", "50" if LEADS_PARALLEL else "0"))
+
+_vector_store = None
+_case_study_search = None
+_vector_store_lock = threading.Lock()
+_pending_lookups = []
+_pending_lookups_lock = threading.Lock()
+
+
+def get_index_path():
+    # One index per backend and embedding model, switching either never mixes vectors
+    return os.path.join(CASE_STUDIES_INDEX_PATH, VECTOR_STORE_BACKEND, get_embeddings_id())
 
-def get_vector_store():
-    """Get or create the vector store."""
-    database_path = "database"
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
-
-    # Build the absolute path to the case studies directory
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    CASE_STUDIES_DIR = os.path.join(BASE_DIR, 'data', 'case_studies')
-
-    if os.path.exists(database_path) and os.listdir(database_path):
-        # Use the existing vector store
-        vectorstore = Chroma(persist_directory=database_path, embedding_function=embeddings)
-    else:
-        # Load documents and create a new vector store
-        loader = DirectoryLoader(CASE_STUDIES_DIR)
-        docs = loader.load()
-        vectorstore = Chroma.from_documents(docs, embeddings, persist_directory=database_path)
 
+def _create_vector_store():
+    """Open the persisted vector store and bring it up to date with the case studies folder."""
+    vectorstore = create_vector_store(VECTOR_STORE_BACKEND, get_index_path(), get_embeddings())
+    if CASE_STUDIES_AUTO_REFRESH or not os.path.exists(os.path.join(get_index_path(), "manifest.json")):
+        sync_index(vectorstore, CASE_STUDIES_DIR, get_index_path())
     return vectorstore
 
 
-def fetch_similar_case_study(description):
-    """Fetch the most similar case study to the given description."""
+def get_vector_store():
+    """Get the process-wide vector store, opened (or created) on first use and shared by all threads."""
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = _create_vector_store()
+    return _vector_store
+
+
+def get_case_study_search():
+    """Get the hybrid (BM25 + vector) case study search, built from the index manifest on first use."""
+    global _case_study_search
+    vectorstore = get_vector_store()
+    if _case_study_search is None:
+        with _vector_store_lock:
+            if _case_study_search is None:
+                _case_study_search = CaseStudySearch(vectorstore, load_manifest(get_index_path()) or {})
+    return _case_study_search
+
+
+def refresh_case_study_index():
+    """Embed the added or changed case studies and drop the deleted ones, returns the file counts."""
+    global _case_study_search
     vectorstore = get_vector_store()
-    vectorstore_retreiver = vectorstore.as_retriever(search_kwargs={"k": 1})
-    docs = vectorstore_retreiver.invoke(description)
-    return docs[0].page_content
\ No newline at end of file
+    with _vector_store_lock:
+        stats = sync_index(vectorstore, CASE_STUDIES_DIR, get_index_path())
+        # Rebuilt with the new chunks on next use
+        _case_study_search = None
+        return stats
+
+
+def preload_vector_store():
+    """Open the vector store ahead of the first lead, failures are logged and retried on first use."""
+    try:
+        get_case_study_search()
+        logger.info("Case studies vector store loaded from {}", get_index_path())
+    except Exception as e:
+        logger.warning("Failed to preload the case studies vector store: {}", e)
+
+
+def match_case_studies(descriptions, k=1):
+    """
+    Matches many leads at once, returns the `k` best case studies of each description
+    as [(source, digest, score)]. Descriptions are embedded in batched calls and scored
+    against all the case study sections together.
+    """
+    started_at = time.perf_counter()
+    results = get_case_study_search().search_batch(descriptions, k=k)
+    logger.info("Matched {} leads to case studies in {:.2f}s", len(descriptions), time.perf_counter() - started_at)
+    return results
+
+
+def _select_digest(results):
+    if not results:
+        raise ValueError(f"No case studies indexed from {CASE_STUDIES_DIR}")
+    source, digest, score = results[0]
+    logger.info("Selected case study {} (score {:.4f})", source, score)
+    return digest
+
+
+def fetch_similar_case_studies(descriptions):
+    """Fetch the digest of the most similar case study for each description."""
+    return [_select_digest(results) for results in match_case_studies(descriptions, k=1)]
+
+
+def fetch_similar_case_study(description):
+    """
+    Fetch the digest of the case study most similar to the given description,
+    sections are matched on both keywords and embeddings.
+
+    The first caller waits CASE_STUDY_BATCH_WAIT_MS for lookups of other leads
+    processed in parallel, then matches them all in one batch.
+    """
+    if CASE_STUDY_BATCH_WAIT_MS <= 0:
+        return _select_digest(get_case_study_search().search(description, k=1))
+
+    future = Future()
+    with _pending_lookups_lock:
+        _pending_lookups.append((description, future))
+        is_leader = len(_pending_lookups) == 1
+    if is_leader:
+        time.sleep(CASE_STUDY_BATCH_WAIT_MS / 1000)
+        with _pending_lookups_lock:
+            batch = _pending_lookups[:]
+            _pending_lookups.clear()
+        try:
+            results = match_case_studies([lookup_description for lookup_description, _ in batch], k=1)
+            for (_, lookup_future), lookup_results in zip(batch, results):
+                lookup_future.set_result(lookup_results)
+        except BaseException as e:
+            for _, lookup_future in batch:
+                if not lookup_future.done():
+                    lookup_future.set_exception(e)
+    return _select_digest(future.result())
+
+
+if __name__ == "__main__":
+    # Refresh the index after editing case studies: python -m sample_agent.tools.rag_tool
+    from dotenv import load_dotenv
+    load_dotenv()
+    print(refresh_case_study_index())
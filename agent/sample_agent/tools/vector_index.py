@@ -0,0 +1,140 @@
+import os
+import json
+import threading
+import numpy as np
+from langchain_core.documents import Document
+
+VECTORS_FILE = "vectors.npy"
+DOCUMENTS_FILE = "documents.json"
+
+
+class NumpyVectorStore:
+    """
+    Exact nearest-neighbor store for small corpora (up to a few thousand chunks).
+
+    Normalized embeddings are kept in a memory-mapped `.npy` matrix next to a JSON
+    file with the chunk ids, texts and metadata. A search is a single matrix-vector
+    product (cosine similarity) followed by a top-k selection. Implements the subset
+    of the LangChain vector store interface used by the case studies index.
+    """
+
+    def __init__(self, index_path, embedding_function):
+        self.index_path = index_path
+        self.embeddings = embedding_function
+        self._lock = threading.Lock()
+        self._vectors, self._documents = self._load()
+
+    def _load(self):
+        vectors_path = os.path.join(self.index_path, VECTORS_FILE)
+        documents_path = os.path.join(self.index_path, DOCUMENTS_FILE)
+        if not (os.path.exists(vectors_path) and os.path.exists(documents_path)):
+            return None, []
+        with open(documents_path) as f:
+            documents = json.load(f)
+        return np.load(vectors_path, mmap_mode="r"), documents
+
+    def _save(self, vectors, documents):
+        # Write then rename so readers never see a half written index
+        os.makedirs(self.index_path, exist_ok=True)
+        vectors_path = os.path.join(self.index_path, VECTORS_FILE)
+        documents_path = os.path.join(self.index_path, DOCUMENTS_FILE)
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, vectors)
+        with open(documents_path + ".tmp", "w") as f:
+            json.dump(documents, f)
+        # Windows can't replace a file that is still memory-mapped
+        self._release_vectors()
+        os.replace(vectors_path + ".tmp", vectors_path)
+        os.replace(documents_path + ".tmp", documents_path)
+        self._vectors, self._documents = self._load()
+
+    def _release_vectors(self):
+        # The mapping is closed once its last reference is gone, searches hold theirs only while scoring
+        self._vectors = None
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_documents(self, documents, ids):
+        if not documents:
+            return []
+        new_vectors = self._normalize(self.embeddings.embed_documents([doc.page_content for doc in documents]))
+        with self._lock:
+            replaced = set(ids)
+            keep = [i for i, doc in enumerate(self._documents) if doc["id"] not in replaced]
+            old_vectors = np.asarray(self._vectors[keep]) if self._vectors is not None and keep else np.empty((0, new_vectors.shape[1]), dtype=np.float32)
+            self._save(
+                np.vstack([old_vectors, new_vectors]),
+                [self._documents[i] for i in keep] + [
+                    {"id": doc_id, "page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc_id, doc in zip(ids, documents)
+                ]
+            )
+        return list(ids)
+
+    def delete(self, ids):
+        with self._lock:
+            removed = set(ids)
+            keep = [i for i, doc in enumerate(self._documents) if doc["id"] not in removed]
+            if len(keep) == len(self._documents):
+                return
+            vectors = np.asarray(self._vectors[keep]) if keep else np.empty((0, self._vectors.shape[1]), dtype=np.float32)
+            self._save(vectors, [self._documents[i] for i in keep])
+
+    def reset_collection(self):
+        with self._lock:
+            self._release_vectors()
+            for file_name in (VECTORS_FILE, DOCUMENTS_FILE):
+                path = os.path.join(self.index_path, file_name)
+                if os.path.exists(path):
+                    os.remove(path)
+            self._vectors, self._documents = None, []
+
+    def similarity_search_by_vectors_with_score(self, embeddings, k=4):
+        """
+        Scores several queries against every stored vector with a single matrix product,
+        returns the `k` best (document, score) of each query.
+        """
+        # Snapshot both so a concurrent write can't misalign rows and documents
+        vectors, documents = self._vectors, self._documents
+        if vectors is None or not documents or not len(embeddings):
+            return [[] for _ in embeddings]
+        scores = self._normalize(embeddings) @ vectors.T
+        k = min(k, len(documents))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for query_scores, query_top in zip(scores, top):
+            query_top = query_top[np.argsort(-query_scores[query_top])]
+            results.append([
+                (Document(page_content=documents[i]["page_content"], metadata=documents[i]["metadata"]), float(query_scores[i]))
+                for i in query_top
+            ])
+        return results
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4):
+        return self.similarity_search_by_vectors_with_score([embedding], k)[0]
+
+    def similarity_search_with_score(self, query, k=4):
+        return self.similarity_search_by_vector_with_score(self.embeddings.embed_query(query), k)
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+
+def create_vector_store(backend, index_path, embedding_function):
+    """
+    Opens the case studies vector store of the given backend ("numpy" or "chroma").
+    Chroma is only imported when it is used.
+    """
+    if backend == "numpy":
+        return NumpyVectorStore(index_path, embedding_function)
+    if backend == "chroma":
+        from langchain_chroma import Chroma
+        return Chroma(persist_directory=index_path, embedding_function=embedding_function)
+    raise ValueError(f"Unsupported vector store backend: {backend}")
@@ -1,123 +1,276 @@
 import re, os
+import time
+import threading
 import googleapiclient.discovery
+from googleapiclient.errors import HttpError
+from loguru import logger
+from sample_agent.cache import CompressedSQLiteCache, CACHE_DIR
+from sample_agent.tools.base.rate_limiter import rate_limited
+
+# Number of most recent uploads used for the average views and likes
+YOUTUBE_MAX_VIDEOS = int(os.getenv("YOUTUBE_MAX_VIDEOS", "200"))
+# Number of most recent videos listed in the report
+YOUTUBE_LATEST_VIDEOS = 15
+
+# Resolved channel IDs are kept forever, channel stats snapshots are reused during
+# YOUTUBE_STATS_TTL_HOURS and then updated with the videos uploaded since
+YOUTUBE_CACHE_PATH = os.getenv("YOUTUBE_CACHE_PATH", os.path.join(CACHE_DIR, "youtube_cache.sqlite"))
+YOUTUBE_STATS_TTL_HOURS = float(os.getenv("YOUTUBE_STATS_TTL_HOURS", "24"))
+
+# YouTube Data API quota cost of each method (units per call)
+QUOTA_COSTS = {
+    "search.list": 100,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+}
+
+_quota_usage = {}
+_quota_lock = threading.Lock()
+
+# The API client (httplib2) is not thread safe, each thread gets its own
+_thread_local = threading.local()
+
+_youtube_cache = None
+_youtube_cache_lock = threading.Lock()
+
+def get_youtube_client():
+    """
+    Returns the YouTube API client of the current thread, built on first use.
+    """
+    youtube = getattr(_thread_local, "youtube", None)
+    if youtube is None:
+        youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+        _thread_local.youtube = youtube
+    return youtube
+
+def get_youtube_cache():
+    """
+    Returns the store of resolved channel IDs and channel stats snapshots, opening it on first use.
+    """
+    global _youtube_cache
+    if _youtube_cache is None:
+        with _youtube_cache_lock:
+            if _youtube_cache is None:
+                _youtube_cache = CompressedSQLiteCache(YOUTUBE_CACHE_PATH)
+    return _youtube_cache
+
+def execute_request(request, method):
+    """
+    Executes a YouTube API request within the shared YouTube rate limit and
+    records the quota units spent by `method` (e.g. "videos.list").
+    """
+    with rate_limited("youtube") as slot:
+        response = request.execute()
+        slot.record(200)
+    with _quota_lock:
+        usage = _quota_usage.setdefault(method, {"calls": 0, "units": 0})
+        usage["calls"] += 1
+        usage["units"] += QUOTA_COSTS.get(method, 1)
+    return response
+
+def get_youtube_quota_usage():
+    """
+    Returns the YouTube API calls and quota units spent since startup, in total and per method.
+    """
+    with _quota_lock:
+        methods = {method: dict(usage) for method, usage in _quota_usage.items()}
+    return {"units": sum(usage["units"] for usage in methods.values()), "methods": methods}
 
 def extract_channel_name(url):
     # Regular expression to extract the channel name after '@'
-    match = re.search(r"@([a-zA-Z0-9_]+)", url)
+    match = re.search(r"@([a-zA-Z0-9_.\-]+)", url)
     if match:
         return match.group(1)
     else:
         return None
 
+def extract_channel_id(url):
+    # Channel URLs like youtube.com/channel/UC... already contain the ID
+    match = re.search(r"/channel/(UC[a-zA-Z0-9_\-]{22})", url)
+    return match.group(1) if match else None
+
+def extract_legacy_channel_name(url):
+    # Legacy channel URLs: youtube.com/user/<username> and youtube.com/c/<custom name>
+    match = re.search(r"/(user|c)/([^/?#]+)", url)
+    return (match.group(1), match.group(2)) if match else (None, None)
+
+def get_channel_id_by_username(username):
+    """
+    Get the channel ID from a legacy username (1 quota unit), searching it when the
+    username is unknown.
+    """
+    request = get_youtube_client().channels().list(part="id", forUsername=username)
+    response = execute_request(request, "channels.list")
+    if response.get("items"):
+        return response["items"][0]["id"]
+    return get_channel_id_by_name(username)
+
 def get_channel_id_by_name(channel_name):
     """
     Get the channel ID from the channel name.
+    Looks the name up as a handle first (1 quota unit), then searches it (100 units).
     """
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+    youtube = get_youtube_client()
+    request = youtube.channels().list(part="id", forHandle=channel_name)
+    response = execute_request(request, "channels.list")
+    if response.get("items"):
+        return response["items"][0]["id"]
+
     request = youtube.search().list(
         part="snippet",
         q=channel_name,
         type="channel",
         maxResults=1
     )
-    response = request.execute()
+    response = execute_request(request, "search.list")
     if response["items"]:
         return response["items"][0]["id"]["channelId"]
     else:
         raise ValueError(f"No channel found with the name: {channel_name}")
 
-def get_channel_videos_stats(channel_id):
+def resolve_channel_id(channel_url):
     """
-    Get total videos count, details of the last 15 videos, 
-    and average views and likes for all videos.
+    Returns the ID of the channel behind a YouTube URL, resolved handles are remembered.
     """
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
-    
-    # Fetch channel statistics for the total video count
-    channel_request = youtube.channels().list(
-        part="statistics",
-        id=channel_id
-    )
-    channel_response = channel_request.execute()
-    total_videos = int(channel_response["items"][0]["statistics"]["videoCount"])
-    subscriber_count = int(channel_response["items"][0]["statistics"]["subscriberCount"])
-
-    # Fetch the last 15 videos
-    video_ids = []
-    videos_request = youtube.search().list(
-        part="id,snippet",
-        channelId=channel_id,
-        maxResults=15,
-        order="date"  # Sort by date to get the latest videos
-    )
-    videos_response = videos_request.execute()
+    channel_id = extract_channel_id(channel_url)
+    if channel_id:
+        return channel_id
 
-    videos_data = []
-    for item in videos_response["items"]:
-        if item["id"]["kind"] == "youtube#video":
-            video_ids.append(item["id"]["videoId"])
-            videos_data.append({
-                "title": item["snippet"]["title"],
-                "description": item["snippet"]["description"],
-                "published_at": item["snippet"]["publishedAt"],
-            })
+    channel_name = extract_channel_name(channel_url)
+    if channel_name:
+        cache_key, resolve = f"handle:{channel_name.lower()}", get_channel_id_by_name
+    else:
+        kind, channel_name = extract_legacy_channel_name(channel_url)
+        if kind == "user":
+            cache_key, resolve = f"user:{channel_name.lower()}", get_channel_id_by_username
+        elif kind == "c":
+            # The API can't look custom URLs up, they usually match the handle or the channel name
+            cache_key, resolve = f"custom:{channel_name.lower()}", get_channel_id_by_name
+        else:
+            raise ValueError(f"No channel handle or ID in the URL: {channel_url}")
+    channel_id = get_youtube_cache().get(cache_key)
+    if channel_id is None:
+        channel_id = resolve(channel_name)
+        get_youtube_cache().set(cache_key, channel_id)
+    return channel_id
 
-    # Fetch statistics (views, likes, etc.) for all videos
-    all_video_ids = []
+def _fetch_channel(youtube, channel_id):
+    # Fetch channel statistics and the uploads playlist in a single call
+    request = youtube.channels().list(part="statistics,contentDetails", id=channel_id)
+    response = execute_request(request, "channels.list")
+    if not response.get("items"):
+        raise ValueError(f"No channel found with the ID: {channel_id}")
+    return response["items"][0]
+
+def _list_uploads(youtube, playlist_id, max_videos, known_video_ids):
+    """
+    Lists the most recent uploads, newest first, stopping at the first video already known.
+    """
+    videos = []
     page_token = None
-    while True:
-        search_request = youtube.search().list(
-            part="id",
-            channelId=channel_id,
-            maxResults=50,
+    while len(videos) < max_videos:
+        request = youtube.playlistItems().list(
+            part="snippet,contentDetails",
+            playlistId=playlist_id,
+            maxResults=min(50, max_videos - len(videos)),
             pageToken=page_token
         )
-        search_response = search_request.execute()
-
-        all_video_ids += [
-            item["id"]["videoId"]
-            for item in search_response["items"]
-            if item["id"]["kind"] == "youtube#video"
-        ]
+        response = execute_request(request, "playlistItems.list")
+        for item in response.get("items", []):
+            video_id = item["contentDetails"]["videoId"]
+            if video_id in known_video_ids:
+                return videos
+            videos.append({
+                "id": video_id,
+                "title": item["snippet"]["title"],
+                "description": item["snippet"].get("description", ""),
+                "published_at": item["contentDetails"].get("videoPublishedAt", item["snippet"].get("publishedAt", "")),
+                "views": 0,
+                "likes": 0,
+            })
 
         # Check for more pages
-        page_token = search_response.get("nextPageToken")
+        page_token = response.get("nextPageToken")
         if not page_token:
             break
+    return videos
 
-    # Divide video IDs into chunks of 50 (API limit)
-    video_chunks = [all_video_ids[i:i + 50] for i in range(0, len(all_video_ids), 50)]
-    total_views, total_likes, stats_count = 0, 0, 0
+def _fetch_video_stats(youtube, videos):
+    # Fetch statistics (views, likes, etc.) by batches of 50 videos (API limit)
+    videos_by_id = {video["id"]: video for video in videos}
+    video_ids = list(videos_by_id)
+    for i in range(0, len(video_ids), 50):
+        request = youtube.videos().list(part="statistics", id=",".join(video_ids[i:i + 50]))
+        response = execute_request(request, "videos.list")
+        for item in response["items"]:
+            stats = item["statistics"]
+            videos_by_id[item["id"]]["views"] = int(stats.get("viewCount", 0))
+            videos_by_id[item["id"]]["likes"] = int(stats.get("likeCount", 0))
 
-    for chunk in video_chunks:
-        stats_request = youtube.videos().list(
-            part="statistics",
-            id=",".join(chunk)
-        )
-        stats_response = stats_request.execute()
+def _summarize_snapshot(snapshot):
+    videos = snapshot["videos"]
+    stats_count = len(videos)
+    return {
+        "total_videos": snapshot["total_videos"],
+        "subscriber_count": snapshot["subscriber_count"],
+        "last_15_videos": [
+            {key: video[key] for key in ("title", "description", "published_at")}
+            for video in videos[:YOUTUBE_LATEST_VIDEOS]
+        ],
+        "average_views": sum(video["views"] for video in videos) / stats_count if stats_count > 0 else 0,
+        "average_likes": sum(video["likes"] for video in videos) / stats_count if stats_count > 0 else 0,
+        "videos_in_averages": stats_count
+    }
 
-        for item in stats_response["items"]:
-            stats = item["statistics"]
-            total_views += int(stats.get("viewCount", 0))
-            total_likes += int(stats.get("likeCount", 0))
-            stats_count += 1
+def get_channel_videos_stats(channel_id, max_videos=YOUTUBE_MAX_VIDEOS, force_refresh=False):
+    """
+    Get total videos count, details of the last 15 videos,
+    and average views and likes of the `max_videos` most recent videos.
 
-    # Calculate averages
-    avg_views = total_views / stats_count if stats_count > 0 else 0
-    avg_likes = total_likes / stats_count if stats_count > 0 else 0
+    Videos are listed from the channel uploads playlist and their statistics fetched
+    50 at a time with videos.list. A snapshot of the channel is stored locally: it is
+    reused as is during YOUTUBE_STATS_TTL_HOURS, then only the videos uploaded since
+    are fetched and added to it.
+    """
+    cache_key = f"stats:{channel_id}:{max_videos}"
+    snapshot = None if force_refresh else get_youtube_cache().get(cache_key)
+    if snapshot and time.time() - snapshot["fetched_at"] < YOUTUBE_STATS_TTL_HOURS * 3600:
+        logger.info("Using YouTube stats snapshot of channel {}", channel_id)
+        return _summarize_snapshot(snapshot)
 
-    return {
-        "total_videos": total_videos,
-        "subscriber_count": subscriber_count,
-        "last_15_videos": videos_data,
-        "average_views": avg_views,
-        "average_likes": avg_likes
+    youtube = get_youtube_client()
+    channel = _fetch_channel(youtube, channel_id)
+    known_videos = snapshot["videos"] if snapshot else []
+    new_videos = _list_uploads(
+        youtube,
+        channel["contentDetails"]["relatedPlaylists"]["uploads"],
+        max_videos,
+        {video["id"] for video in known_videos}
+    )
+    _fetch_video_stats(youtube, new_videos)
+    logger.info("Fetched {} new videos of channel {}", len(new_videos), channel_id)
+
+    snapshot = {
+        "fetched_at": time.time(),
+        "total_videos": int(channel["statistics"].get("videoCount", 0)),
+        "subscriber_count": int(channel["statistics"].get("subscriberCount", 0)),
+        "videos": (new_videos + known_videos)[:max_videos],
     }
-    
+    get_youtube_cache().set(cache_key, snapshot)
+    return _summarize_snapshot(snapshot)
+
 def get_youtube_stats(channel_url):
-    channel_name = extract_channel_name(channel_url)
-    channel_id = get_channel_id_by_name(channel_name)
-    result = get_channel_videos_stats(channel_id)
+    """
+    Returns the channel stats formatted for the LLM, or None when the channel can't be
+    found or the API call fails.
+    """
+    try:
+        channel_id = resolve_channel_id(channel_url)
+        result = get_channel_videos_stats(channel_id)
+    except (ValueError, HttpError) as e:
+        logger.warning("No YouTube data for {}: {}", channel_url, e)
+        return None
 
     last_15_videos_str = "\n".join([f"- {video['title']} (Published: {video['published_at']})" for video in result["last_15_videos"]])
 
@@ -125,8 +278,8 @@ def get_youtube_stats(channel_url):
     youtube_data = f"""
     Total Videos: {result['total_videos']}
     Number of Subscribers: {result['subscriber_count']}
-    Average Views: {result['average_views']}
-    Average Likes: {result['average_likes']}
+    Average Views (last {result['videos_in_averages']} videos): {result['average_views']}
+    Average Likes (last {result['videos_in_averages']} videos): {result['average_likes']}
     Last 15 Videos:
     {last_15_videos_str}
     """
@@ -1,10 +1,17 @@
 import os
+import json
+import hashlib
+import threading
 from datetime import datetime
+from pydantic import BaseModel
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from loguru import logger
+from sample_agent.cache import SQLiteCache, CACHE_DIR
+from sample_agent.tools.base.rate_limiter import rate_limited, arate_limited
 
 SCOPES = [
     'https://www.googleapis.com/auth/gmail.modify',
@@ -43,9 +50,9 @@ def get_report(reports, report_name: str):
             return report.content
     return ""
 
-def save_reports_locally(reports):
-    # Define the local folder path
-    reports_folder = "reports"
+def save_reports_locally(reports, subfolder=""):
+    # Define the local folder path, optionally one folder per lead
+    reports_folder = os.path.join("reports", subfolder) if subfolder else "reports"
     
     # Create folder if it does not exist
     if not os.path.exists(reports_folder):
@@ -57,46 +64,233 @@ def save_reports_locally(reports):
         with open(file_path, "w", encoding="utf-8") as file:
             file.write(report.content)
 
-def get_llm_by_provider(llm_provider, model):
-    # Else find provider
+# Process-wide registry of chat model clients and runnable chains.
+# Clients are keyed by (provider, model, temperature) and chains additionally by
+# the response schema, so every LLM call reuses the same client and its warm HTTP
+# connections. The lock makes the registry safe for LangGraph's parallel branches.
+_LLM_REGISTRY = {}
+_LLM_REGISTRY_LOCK = threading.RLock()
+_LLM_REGISTRY_STATS = {"hits": 0, "misses": 0}
+
+def _get_or_create_llm(key, factory):
+    with _LLM_REGISTRY_LOCK:
+        llm = _LLM_REGISTRY.get(key)
+        if llm is not None:
+            _LLM_REGISTRY_STATS["hits"] += 1
+            return llm
+        _LLM_REGISTRY_STATS["misses"] += 1
+        llm = factory()
+        _LLM_REGISTRY[key] = llm
+        logger.info("Created pooled LLM {} (registry stats: {})", key, _LLM_REGISTRY_STATS)
+        return llm
+
+def get_llm_registry_stats():
+    """
+    Returns the hit/miss counters and the number of cached LLM clients and chains.
+    """
+    with _LLM_REGISTRY_LOCK:
+        return {**_LLM_REGISTRY_STATS, "size": len(_LLM_REGISTRY)}
+
+def _create_llm(llm_provider, model, temperature):
+    # Find provider
     if llm_provider == "openai":
         from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model=model, temperature=0.1)
+        llm = ChatOpenAI(model=model, temperature=temperature)
     elif llm_provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
-        llm = ChatAnthropic(model=model, temperature=0.1)  # Use the correct model name
+        llm = ChatAnthropic(model=model, temperature=temperature)  # Use the correct model name
     elif llm_provider == "google":
         from langchain_google_genai import ChatGoogleGenerativeAI
-        llm = ChatGoogleGenerativeAI(model=model, temperature=0.1)  # Correct model name
+        llm = ChatGoogleGenerativeAI(model=model, temperature=temperature)  # Correct model name
     else:
         raise ValueError(f"Unsupported LLM provider: {llm_provider}")
     return llm
 
+def get_llm_by_provider(llm_provider, model, temperature=0.1):
+    """
+    Returns the shared chat model client for the given provider, model and temperature.
+    """
+    return _get_or_create_llm(
+        ("client", llm_provider, model, temperature),
+        lambda: _create_llm(llm_provider, model, temperature)
+    )
+
+def get_llm_chain(llm_provider, model, temperature=0.1, response_format=None):
+    """
+    Returns the shared runnable chain (structured output or string output) built on
+    top of the pooled chat model client.
+    """
+    def build_chain():
+        llm = get_llm_by_provider(llm_provider, model, temperature)
+        if response_format:
+            return llm.with_structured_output(response_format)
+        # Else use parse string output
+        return llm | StrOutputParser()
+
+    return _get_or_create_llm(
+        ("chain", llm_provider, model, temperature, response_format),
+        build_chain
+    )
+
+# Opt-in cache of LLM responses, persisted on disk and keyed by a hash of the full request.
+# Enable it with LLM_CACHE_ENABLED=true or per call with `invoke_llm(..., use_cache=True)`.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+_llm_cache_stats = {}
+
+def get_llm_cache():
+    """
+    Returns the process-wide LLM response cache, opening the SQLite store on first use.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = SQLiteCache(
+                    LLM_CACHE_PATH,
+                    ttl=LLM_CACHE_TTL_HOURS * 3600,
+                    max_entries=LLM_CACHE_MAX_ENTRIES,
+                    max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024)
+                )
+    return _llm_cache
+
+def get_llm_cache_stats():
+    """
+    Returns the LLM cache hits, misses and hit rate for each graph node.
+    """
+    with _llm_cache_lock:
+        return {
+            node: {**stats, "hit_rate": stats["hits"] / max(stats["hits"] + stats["misses"], 1)}
+            for node, stats in _llm_cache_stats.items()
+        }
+
+def _record_llm_cache_lookup(hit):
+    node = _current_graph_node()
+    with _llm_cache_lock:
+        stats = _llm_cache_stats.setdefault(node, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+def _current_graph_node():
+    # LangGraph exposes the running node in the config metadata
+    try:
+        from langgraph.config import get_config
+        return get_config().get("metadata", {}).get("langgraph_node", "unknown")
+    except Exception:
+        return "unknown"
+
+def _llm_cache_key(system_prompt, user_message, model, llm_provider, temperature, response_format):
+    request = {
+        "provider": llm_provider,
+        "model": model,
+        "temperature": temperature,
+        "system_prompt": system_prompt,
+        "user_message": user_message,
+        "response_format": response_format.model_json_schema() if response_format else None,
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _serialize_llm_output(output):
+    if isinstance(output, BaseModel):
+        return {"type": "model", "data": output.model_dump(mode="json")}
+    return {"type": "raw", "data": output}
+
+def _deserialize_llm_output(entry, response_format):
+    if entry["type"] == "model":
+        return response_format.model_validate(entry["data"])
+    return entry["data"]
+
+LLM_TEMPERATURE = 0.1
+
+def get_llm_rate_limit_service(llm_provider):
+    # Google models share the Gemini quota, other providers get their own bucket
+    return "gemini" if llm_provider == "google" else llm_provider
+
+def _build_llm_messages(system_prompt, user_message):
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_message),
+    ]
+
+def _get_cached_llm_output(cache_key, response_format):
+    cached = get_llm_cache().get(cache_key)
+    _record_llm_cache_lookup(hit=cached is not None)
+    if cached is None:
+        return None
+    return _deserialize_llm_output(cached, response_format)
+
 def invoke_llm(
     system_prompt,
     user_message,
     model="gemini-2.5-flash",  # Specify the model name according to the provider
     llm_provider="google",  # By default use Google as provider
-    response_format=None
+    response_format=None,
+    use_cache=None  # Defaults to LLM_CACHE_ENABLED
 ):
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_message),
-    ]  
+    use_cache = LLM_CACHE_ENABLED if use_cache is None else use_cache
     
-    # Get base llm
-    llm = get_llm_by_provider(llm_provider, model)
+    # Return the cached response of an identical request if there is one
+    if use_cache:
+        cache_key = _llm_cache_key(
+            system_prompt, user_message, model, llm_provider, LLM_TEMPERATURE, response_format
+        )
+        cached = _get_cached_llm_output(cache_key, response_format)
+        if cached is not None:
+            return cached
 
-    if response_format:
-        llm = llm.with_structured_output(response_format)
-    else: # Esle use parse string output
-        llm = llm | StrOutputParser()
-    
-    # Invoke LLM
-    output = llm.invoke(messages)
+    messages = _build_llm_messages(system_prompt, user_message)
+
+    # Get pooled llm chain
+    llm = get_llm_chain(llm_provider, model, LLM_TEMPERATURE, response_format=response_format)
+
+    # Invoke LLM within the provider rate limit
+    with rate_limited(get_llm_rate_limit_service(llm_provider)) as slot:
+        output = llm.invoke(messages)
+        slot.record(200)
+
+    if use_cache and output is not None:
+        get_llm_cache().set(cache_key, _serialize_llm_output(output))
     
     return output
 
+async def ainvoke_llm(
+    system_prompt,
+    user_message,
+    model="gemini-2.5-flash",
+    llm_provider="google",
+    response_format=None,
+    use_cache=None
+):
+    """
+    Async counterpart of `invoke_llm`, awaits the LLM without blocking the event loop.
+    """
+    use_cache = LLM_CACHE_ENABLED if use_cache is None else use_cache
+
+    if use_cache:
+        cache_key = _llm_cache_key(
+            system_prompt, user_message, model, llm_provider, LLM_TEMPERATURE, response_format
+        )
+        cached = _get_cached_llm_output(cache_key, response_format)
+        if cached is not None:
+            return cached
+
+    messages = _build_llm_messages(system_prompt, user_message)
+    llm = get_llm_chain(llm_provider, model, LLM_TEMPERATURE, response_format=response_format)
+
+    async with arate_limited(get_llm_rate_limit_service(llm_provider)) as slot:
+        output = await llm.ainvoke(messages)
+        slot.record(200)
+
+    if use_cache and output is not None:
+        get_llm_cache().set(cache_key, _serialize_llm_output(output))
+
+    return output
+
 
 if __name__=="__main__":
     get_google_credentials()
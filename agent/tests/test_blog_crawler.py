@@ -0,0 +1,59 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from sample_agent.tools.base import blog_crawler, markdown_scraper_tool
+from sample_agent.tools.base.blog_crawler import BlogPost, _digest_or_index, _read_post
+from sample_agent.tools.base.web_fetcher import FetchResult
+
+POST_HTML = """<html><head>
+<title>Fallback title</title>
+<link rel="canonical" href="/blog/robots">
+<meta property="og:title" content=" Robots in the warehouse ">
+<meta property="article:published_time" content="2024-05-02T10:00:00Z">
+</head><body><nav><a href="/">Home</a></nav>
+<article><p>Acme builds warehouse robots that pick, pack and ship orders around the clock,
+and the fleet platform schedules every robot and reports throughput in real time.</p></article>
+</body></html>"""
+
+
+@pytest.fixture(params=["lxml", "bs4"])
+def html_parser(request, monkeypatch):
+    if request.param == "bs4":
+        monkeypatch.setattr(blog_crawler, "parse_html", lambda html: None)
+    return request.param
+
+
+def test_post_metadata_and_content_are_read_from_the_page(html_parser):
+    post = _read_post(BlogPost(url="https://acme.com/blog/robots?utm_source=feed"), POST_HTML, max_tokens=1000)
+    assert post.url == "https://acme.com/blog/robots"
+    assert post.title == "Robots in the warehouse"
+    assert post.published_at == datetime(2024, 5, 2, 10, tzinfo=timezone.utc)
+    assert "warehouse robots" in post.content
+    assert "Fallback title" not in post.content
+
+
+def test_posts_are_not_parsed_again_with_beautifulsoup(monkeypatch):
+    def parse_again(*args, **kwargs):
+        raise AssertionError("the page was parsed twice")
+
+    monkeypatch.setattr(blog_crawler, "BeautifulSoup", parse_again)
+    monkeypatch.setattr(markdown_scraper_tool, "BeautifulSoup", parse_again)
+    post = _read_post(BlogPost(url="https://acme.com/blog/robots"), POST_HTML, max_tokens=1000)
+    assert post.title == "Robots in the warehouse"
+
+
+def test_post_content_is_cut_to_its_token_budget():
+    post = _read_post(BlogPost(url="https://acme.com/blog/robots"), POST_HTML, max_tokens=5)
+    assert len(post.content) <= 5 * 4 + len(" [...]")
+    assert post.content.endswith(" [...]")
+
+
+def test_index_page_fallback_is_cut_to_the_digest_budget(monkeypatch):
+    monkeypatch.setattr(blog_crawler, "BLOG_DIGEST_MAX_TOKENS", 10)
+    paragraphs = "".join(f"<p>Post {i} about warehouse robots and how they pick, pack and ship orders.</p>" for i in range(50))
+    index_result = FetchResult(url="https://acme.com/blog", text=f"<html><body>{paragraphs}</body></html>")
+    content = _digest_or_index("https://acme.com/blog", index_result, [], time.monotonic())
+    assert len(content) <= 10 * 4 + len(" [...]")
+    assert content.endswith(" [...]")
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sample_agent import cache as cache_module
+from sample_agent.cache import TTLCache
+from sample_agent.state import CompanyData
+from sample_agent.tools import company_store
+from sample_agent.tools.company_store import get_company_key, get_or_research
+
+
+def test_values_are_reused_until_they_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("key", compute) == 1
+    assert cache.get_or_compute("key", compute) == 1
+    now[0] += 11
+    assert cache.get_or_compute("key", compute) == 2
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_concurrent_lookups_share_a_single_computation():
+    cache = TTLCache(ttl=60)
+    started = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert cache.get_stats()["coalesced"] == 4
+
+
+def test_concurrent_async_lookups_share_a_single_computation():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def lookups():
+        return await asyncio.gather(*(cache.aget_or_compute("key", compute) for _ in range(5)))
+
+    assert asyncio.run(lookups()) == ["value"] * 5
+    assert calls == [1]
+
+
+def test_failures_are_raised_to_waiters_and_not_cached():
+    cache = TTLCache(ttl=60)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: "value") == "value"
+
+
+def test_values_rejected_by_cache_if_are_returned_but_not_stored():
+    cache = TTLCache(ttl=60)
+    assert cache.get_or_compute("key", lambda: (500, []), cache_if=lambda result: result[0] == 200) == (500, [])
+    assert cache.get_or_compute("key", lambda: (200, ["hit"]), cache_if=lambda result: result[0] == 200) == (200, ["hit"])
+    assert cache.get_or_compute("key", lambda: (500, []), cache_if=lambda result: result[0] == 200) == (200, ["hit"])
+
+
+@pytest.fixture
+def research_cache(monkeypatch):
+    research_cache = TTLCache(ttl=60)
+    monkeypatch.setattr(company_store, "company_research_cache", research_cache)
+    return research_cache
+
+
+@pytest.mark.parametrize("failed_research", [None, ""])
+def test_failed_company_research_is_not_shared(research_cache, failed_research):
+    assert get_or_research("domain:acme.com", "blog", lambda: failed_research) == failed_research
+    assert get_or_research("domain:acme.com", "blog", lambda: "report") == "report"
+    assert get_or_research("domain:acme.com", "blog", lambda: "other report") == "report"
+
+
+def test_company_research_is_not_shared_without_a_company_key(research_cache):
+    assert get_or_research("", "blog", lambda: "report") == "report"
+    assert get_or_research("", "blog", lambda: "other report") == "other report"
+
+
+def test_company_key_prefers_the_website_domain():
+    company_data = CompanyData(name="Acme Inc.", website="https://www.acme.com/about")
+    assert get_company_key(company_data) == "domain:acme.com"
+    assert get_company_key(CompanyData(), "Acme Inc.") == get_company_key(CompanyData(name="acme"))
+    assert get_company_key(CompanyData()) == ""
+
+
+def test_website_research_is_shared_only_once_analyzed():
+    from sample_agent.nodes import OutReachAutomationNodes
+
+    company_data = CompanyData(name="Acme", profile="LinkedIn URL: https://linkedin.com/company/acme")
+    is_analyzed = OutReachAutomationNodes._is_website_analyzed(company_data)
+    assert not is_analyzed(company_data.model_copy())
+    assert not is_analyzed(company_data.model_copy(update={"website": "https://acme.com"}))
+    assert is_analyzed(company_data.model_copy(update={"website": "https://acme.com", "profile": "Acme builds robots."}))
+
+
+def test_digital_presence_report_is_shared_by_the_leads_of_a_company(research_cache, monkeypatch):
+    from sample_agent import nodes
+    from sample_agent.state import Report
+
+    calls = []
+    monkeypatch.setattr(nodes, "invoke_llm", lambda **request: calls.append(request) or "Digital presence")
+    state = {
+        "company_key": "domain:acme.com",
+        "company_data": CompanyData(name="Acme"),
+        "reports": [Report(title="Blog Analysis Report", content="Blog")],
+    }
+    node = nodes.OutReachAutomationNodes.__new__(nodes.OutReachAutomationNodes)
+    first = node.generate_digital_presence_report(state)
+    second = node.generate_digital_presence_report(state)
+    assert len(calls) == 1
+    assert first == second
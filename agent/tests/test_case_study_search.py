@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+from langchain_core.documents import Document
+
+from sample_agent.tools import rag_tool
+from sample_agent.tools.case_study_search import BM25Index, CaseStudySearch, reciprocal_rank_fusion
+from sample_agent.tools.embeddings import HashingEmbeddings
+from sample_agent.tools.vector_index import create_vector_store
+
+MANIFEST = {
+    "logistics.md": {
+        "digest": "Fleet routing for a logistics company",
+        "chunks": [
+            {"id": "logistics-0", "text": "We optimized delivery routes and fleet scheduling for a logistics company."},
+            {"id": "logistics-1", "text": "Drivers saved fuel thanks to real time route planning."},
+        ],
+    },
+    "retail.md": {
+        "digest": "Demand forecasting for a retail chain",
+        "chunks": [
+            {"id": "retail-0", "text": "Demand forecasting reduced stock outs across retail stores."},
+        ],
+    },
+    "health.md": {
+        "digest": "Patient intake automation for clinics",
+        "chunks": [
+            {"id": "health-0", "text": "Clinics automated patient intake forms and appointment reminders."},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def case_study_search(tmp_path):
+    store = create_vector_store("numpy", str(tmp_path), HashingEmbeddings())
+    chunks = [
+        (chunk["id"], chunk["text"], source)
+        for source, entry in MANIFEST.items() for chunk in entry["chunks"]
+    ]
+    store.add_documents(
+        [Document(page_content=text, metadata={"source": source, "chunk_id": chunk_id}) for chunk_id, text, source in chunks],
+        ids=[chunk_id for chunk_id, _, _ in chunks]
+    )
+    return CaseStudySearch(store, MANIFEST)
+
+
+def test_bm25_ranks_matching_chunks_first():
+    index = BM25Index([(chunk["id"], chunk["text"]) for entry in MANIFEST.values() for chunk in entry["chunks"]])
+    assert index.search("retail demand forecasting", k=2)[0] == "retail-0"
+    assert index.search("unrelated words only", k=2) == []
+
+
+def test_bm25_rare_terms_weigh_more():
+    index = BM25Index([("a", "sales sales growth"), ("b", "sales team"), ("c", "sales pipeline")])
+    assert index.search("sales growth", k=3)[0] == "a"
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]], k=60)
+    assert scores["a"] == pytest.approx(scores["b"])
+    assert scores["a"] > scores["c"] > 0
+    assert scores["c"] == pytest.approx(scores["d"])
+    assert scores["a"] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_case_studies_score_as_their_best_chunk(case_study_search):
+    results = case_study_search.search("logistics company fleet routes", k=3)
+    sources = [source for source, _, _ in results]
+    assert sources[0] == "logistics.md"
+    assert len(sources) == len(set(sources))
+    assert results[0][1] == MANIFEST["logistics.md"]["digest"]
+
+
+def test_search_batch_matches_single_searches(case_study_search):
+    queries = ["retail stock forecasting", "patient appointment reminders for clinics"]
+    assert case_study_search.search_batch(queries, k=1) == [case_study_search.search(query, k=1) for query in queries]
+
+
+def test_concurrent_lookups_are_matched_in_one_batch(monkeypatch):
+    batches = []
+
+    def match_case_studies(descriptions, k=1):
+        batches.append(list(descriptions))
+        return [[(description, f"digest of {description}", 1.0)] for description in descriptions]
+
+    monkeypatch.setattr(rag_tool, "CASE_STUDY_BATCH_WAIT_MS", 200)
+    monkeypatch.setattr(rag_tool, "match_case_studies", match_case_studies)
+
+    descriptions = [f"lead {i}" for i in range(4)]
+    digests = {}
+    threads = [
+        threading.Thread(target=lambda d=description: digests.__setitem__(d, rag_tool.fetch_similar_case_study(d)))
+        for description in descriptions
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(batches) == 1
+    assert sorted(batches[0]) == descriptions
+    assert digests == {description: f"digest of {description}" for description in descriptions}
+
+
+def test_lookups_are_not_delayed_without_batch_wait(monkeypatch):
+    class Search:
+        def search(self, description, k=1):
+            return [(description, f"digest of {description}", 1.0)]
+
+    monkeypatch.setattr(rag_tool, "CASE_STUDY_BATCH_WAIT_MS", 0)
+    monkeypatch.setattr(rag_tool, "get_case_study_search", lambda: Search())
+    assert rag_tool.fetch_similar_case_study("lead") == "digest of lead"
+
+
+def test_index_is_unmapped_before_its_files_are_replaced(tmp_path, monkeypatch):
+    from sample_agent.tools import vector_index
+
+    store = create_vector_store("numpy", str(tmp_path), HashingEmbeddings())
+    store.add_documents([Document(page_content="Fleet routing", metadata={})], ids=["a"])
+    replace = vector_index.os.replace
+    mapped = []
+
+    def checked_replace(src, dst):
+        mapped.append(store._vectors is not None)
+        replace(src, dst)
+
+    monkeypatch.setattr(vector_index.os, "replace", checked_replace)
+    store.add_documents([Document(page_content="Demand forecasting", metadata={})], ids=["b"])
+    store.delete(["a"])
+    assert mapped and not any(mapped)
+    assert [doc.page_content for doc in store.similarity_search("forecasting", k=1)] == ["Demand forecasting"]
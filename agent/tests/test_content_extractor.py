@@ -0,0 +1,79 @@
+import pytest
+
+from sample_agent.tools.base import content_extractor
+from sample_agent.tools.base.content_extractor import extract_main_content, get_content_extraction_stats
+
+PRODUCT_PARAGRAPH = (
+    "Acme builds warehouse robots that pick, pack and ship orders around the clock. "
+    "Our fleet management platform schedules every robot and reports throughput in real time."
+)
+
+
+def page(*blocks):
+    return "\n\n".join(blocks)
+
+
+@pytest.mark.parametrize("banner", [
+    "We use cookies to improve your experience. [Accept all](https://acme.com/accept) [Reject all](https://acme.com/reject)",
+    "This site uses cookies. By continuing you agree to our use of cookies. Got it",
+    "[Privacy policy](https://acme.com/privacy) | [Cookie settings](https://acme.com/cookies)",
+    "Subscribe to our newsletter. Enter your email address below.",
+    "All rights reserved.",
+])
+def test_banners_and_legal_notices_are_dropped(banner):
+    content = extract_main_content(page(PRODUCT_PARAGRAPH, banner))
+    assert content == PRODUCT_PARAGRAPH
+
+
+@pytest.mark.parametrize("paragraph", [
+    "We help companies manage cookie consent and GDPR compliance across all their websites, "
+    "with a single dashboard for legal teams and automatic scans of every page.",
+    "Our privacy policy engine turns regulations into rules your engineers can test, "
+    "so product teams ship features without waiting for a legal review.",
+])
+def test_product_paragraphs_about_consent_are_kept(paragraph):
+    content = extract_main_content(page(PRODUCT_PARAGRAPH, paragraph))
+    assert paragraph in content
+
+
+def test_navigation_menus_are_dropped():
+    menu = "[Home](https://acme.com/) [Products](https://acme.com/products) [Pricing](https://acme.com/pricing) [Contact](https://acme.com/contact)"
+    assert extract_main_content(page(menu, PRODUCT_PARAGRAPH)) == PRODUCT_PARAGRAPH
+
+
+def test_article_links_and_headings_are_kept():
+    article = "[How we cut picking errors by 40% with computer vision in our warehouses](https://acme.com/blog/vision)"
+    heading = "## Cookies"
+    content = extract_main_content(page(heading, article, PRODUCT_PARAGRAPH))
+    assert heading in content
+    assert article in content
+
+
+def test_repeated_blocks_are_kept_once():
+    content = extract_main_content(page(PRODUCT_PARAGRAPH, PRODUCT_PARAGRAPH))
+    assert content == PRODUCT_PARAGRAPH
+
+
+def test_links_are_not_appended_to_the_content():
+    paragraph = "Read about [our robots](https://acme.com/robots) and how they work with your existing team and tools every day."
+    content = extract_main_content(page(PRODUCT_PARAGRAPH, paragraph))
+    assert "## Links" not in content
+    assert content.count("https://acme.com/robots") == 1
+
+
+def test_pages_made_only_of_links_are_returned_as_is():
+    markdown = page(*(f"[Post {i}](https://acme.com/blog/{i}) [Read](https://acme.com/blog/{i})" for i in range(5)))
+    assert extract_main_content(markdown) == markdown
+
+
+def test_extraction_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(content_extractor, "CONTENT_EXTRACTION_ENABLED", False)
+    markdown = page(PRODUCT_PARAGRAPH, "All rights reserved.")
+    assert extract_main_content(markdown) == markdown
+
+
+def test_token_savings_are_recorded_per_label():
+    extract_main_content(page(PRODUCT_PARAGRAPH, "All rights reserved."), label="test-page")
+    stats = get_content_extraction_stats()["test-page"]
+    assert stats["pages"] >= 1
+    assert stats["tokens_after"] < stats["tokens_before"]
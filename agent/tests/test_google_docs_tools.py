@@ -0,0 +1,67 @@
+import threading
+import time
+
+from sample_agent.cache import TTLCache
+from sample_agent.tools.google_docs_tools import GoogleDocsManager
+
+
+class Manager(GoogleDocsManager):
+    # Folder resolution only, Drive calls are replaced by slow counters
+    def __init__(self):
+        self._folders = TTLCache(ttl=float("inf"), max_entries=4096)
+        self.lookups = []
+        self.shares = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _find_or_create_folder(self, folder_name):
+        with self.lock:
+            self.lookups.append(folder_name)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(0.1)
+        with self.lock:
+            self.in_flight -= 1
+        return {"id": f"id-{folder_name}-{len(self.lookups)}", "link": f"https://drive/{folder_name}", "shared": False}
+
+    def _share_folder(self, folder_id):
+        self.shares.append(folder_id)
+        return True
+
+
+def resolve_concurrently(manager, folder_names, make_shareable=False):
+    results = {}
+    threads = [
+        threading.Thread(target=lambda i=i, name=name: results.__setitem__(i, manager._get_or_create_folder(name, make_shareable)))
+        for i, name in enumerate(folder_names)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[i] for i in range(len(folder_names))]
+
+
+def test_leads_saving_to_the_same_folder_share_one_lookup():
+    manager = Manager()
+    results = resolve_concurrently(manager, ["Jane_Acme"] * 4, make_shareable=True)
+    assert manager.lookups == ["Jane_Acme"]
+    assert len(set(results)) == 1
+    assert manager.shares == [results[0][0]]
+
+
+def test_different_folders_are_resolved_concurrently():
+    manager = Manager()
+    resolve_concurrently(manager, ["Jane_Acme", "John_Globex", "Ann_Initech"])
+    assert sorted(manager.lookups) == ["Ann_Initech", "Jane_Acme", "John_Globex"]
+    assert manager.peak_in_flight > 1
+
+
+def test_folders_are_looked_up_again_after_the_cache_is_cleared():
+    manager = Manager()
+    first_id, _ = manager._get_or_create_folder("Jane_Acme")
+    assert manager._get_or_create_folder("Jane_Acme")[0] == first_id
+    manager.clear_folder_cache()
+    assert manager._get_or_create_folder("Jane_Acme")[0] != first_id
+    assert manager.lookups == ["Jane_Acme", "Jane_Acme"]
@@ -0,0 +1,159 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from sample_agent.graph import OutReachAutomation
+from sample_agent.nodes import OutReachAutomationNodes
+from sample_agent.state import GraphState
+
+
+class LeadLoader:
+    def __init__(self, leads):
+        self.leads = leads
+        self.updated = {}
+
+    def fetch_records(self):
+        return [{"id": lead_id, "First Name": "Lead", "Last Name": lead_id, "Company": "Acme"} for lead_id in self.leads]
+
+    def update_record(self, lead_id, data):
+        self.updated[lead_id] = data
+
+
+class DocsManager:
+    def clear_folder_cache(self):
+        pass
+
+
+class Nodes(OutReachAutomationNodes):
+    # The real nodes (and their state type hints) without the Google Docs client
+    def __init__(self, loader):
+        self.lead_loader = loader
+        self.docs_manager = DocsManager()
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("parallel", [False, True])
+def test_workflow_compiles(parallel, use_async):
+    workflow = OutReachAutomation.build_workflow(
+        Nodes(LeadLoader([])), GraphState, parallel=parallel, max_concurrency=2, use_async=use_async
+    )
+    assert "summarize_run" in workflow.compile().get_graph().nodes
+
+
+class StubNodes(Nodes):
+    """
+    Lead pipeline nodes that only track how many leads are in flight, the lead
+    `failing_lead` raises in its first node.
+    """
+
+    def __init__(self, loader, failing_lead=None, delay=0.05):
+        super().__init__(loader)
+        self.failing_lead = failing_lead
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _enter(self, state):
+        with self.lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if state["current_lead"].id == self.failing_lead:
+            with self.lock:
+                self.in_flight -= 1
+            raise RuntimeError("LinkedIn scraping failed")
+        return {"reports": []}
+
+    def _leave(self, state):
+        with self.lock:
+            self.in_flight -= 1
+        return {"processed_leads": [state["current_lead"].id]}
+
+    def fetch_linkedin_profile_data(self, state: GraphState):
+        result = self._enter(state)
+        time.sleep(self.delay)
+        return result
+
+    async def afetch_linkedin_profile_data(self, state: GraphState):
+        result = self._enter(state)
+        await asyncio.sleep(self.delay)
+        return result
+
+    def update_CRM(self, state: GraphState):
+        return self._leave(state)
+
+    def save_reports_to_google_docs(self, state: GraphState):
+        return {"google_docs_timings": [{"lead": state["current_lead"].id, "title": "Report", "seconds": 0.1, "uploaded": True}]}
+
+    def score_lead(self, state: GraphState):
+        return {"lead_score": "3"}
+
+    async def ascore_lead(self, state: GraphState):
+        return self.score_lead(state)
+
+    def _report(self, state: GraphState):
+        return {"reports": []}
+
+    async def _areport(self, state: GraphState):
+        return {"reports": []}
+
+    review_company_website = analyze_blog_content = analyze_social_media_content = analyze_recent_news = _report
+    generate_digital_presence_report = generate_full_lead_research_report = _report
+    areview_company_website = aanalyze_blog_content = aanalyze_social_media_content = aanalyze_recent_news = _areport
+    agenerate_digital_presence_report = agenerate_full_lead_research_report = _areport
+
+
+def run_parallel(nodes, use_async, max_concurrency):
+    app = OutReachAutomation.build_workflow(
+        nodes, GraphState, parallel=True, max_concurrency=max_concurrency, use_async=use_async
+    ).compile()
+    if use_async:
+        return asyncio.run(app.ainvoke({"leads_ids": []}))
+    return app.invoke({"leads_ids": []})
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_parallel_leads_are_fanned_out_up_to_the_concurrency_limit(use_async):
+    leads = [str(i) for i in range(6)]
+    nodes = StubNodes(LeadLoader(leads))
+    # The served agent and the CLI pass LEADS_CONCURRENCY as max_concurrency
+    state = run_parallel(nodes, use_async, max_concurrency=3)
+
+    assert sorted(state["processed_leads"]) == leads
+    assert state.get("failed_leads", []) == []
+    assert nodes.peak_in_flight == 3
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_failing_lead_does_not_stop_the_others(use_async):
+    leads = [str(i) for i in range(4)]
+    nodes = StubNodes(LeadLoader(leads), failing_lead="2")
+    state = run_parallel(nodes, use_async, max_concurrency=2)
+
+    assert state["failed_leads"] == ["2"]
+    assert sorted(state["processed_leads"]) == ["0", "1", "3"]
+    assert sorted(timing["lead"] for timing in state["google_docs_timings"]) == ["0", "1", "3"]
+
+
+def test_every_lead_is_sent_to_its_own_lead_subgraph_run():
+    nodes = Nodes(LeadLoader(["1", "2"]))
+    sends = nodes.fan_out_leads(nodes.get_new_leads({"leads_ids": []}))
+    assert [send.node for send in sends] == ["process_lead", "process_lead"]
+    assert [send.arg["current_lead"].id for send in sends] == ["1", "2"]
+    assert all(send.arg["reports"] == [] for send in sends)
+    assert nodes.fan_out_leads({"leads_data": []}) == "summarize_run"
+
+
+def test_run_summary_reports_the_llm_caches():
+    from loguru import logger
+
+    messages = []
+    sink = logger.add(messages.append, format="{message}")
+    try:
+        OutReachAutomationNodes.summarize_run({"processed_leads": ["1"], "run_started_at": time.time()})
+    finally:
+        logger.remove(sink)
+    assert any(message.startswith("LLM response cache stats:") for message in messages)
+    assert any(message.startswith("LLM client registry stats:") for message in messages)
@@ -0,0 +1,40 @@
+import pytest
+
+from sample_agent.tools.base import link_classifier
+from sample_agent.tools.base.link_classifier import classify_social_links
+
+
+@pytest.fixture(params=["tldextract", "host"])
+def domain_matching(request, monkeypatch):
+    if request.param == "tldextract":
+        pytest.importorskip("tldextract")
+    else:
+        monkeypatch.setattr(link_classifier, "_extract_domain", None)
+    return request.param
+
+
+def test_blog_on_other_site_of_a_multi_part_tld_is_ignored(domain_matching):
+    links = [("https://www.example.co.uk/blog", "Blog")]
+    assert classify_social_links(links, "https://www.acme.co.uk").blog == ""
+
+
+def test_blog_subdomain_of_a_multi_part_tld_is_kept(domain_matching):
+    links = [("https://www.example.co.uk/blog", "Blog"), ("https://blog.acme.co.uk/", "Blog")]
+    assert classify_social_links(links, "https://www.acme.co.uk").blog == "https://blog.acme.co.uk/"
+
+
+def test_blog_index_is_preferred_over_posts(domain_matching):
+    links = [("https://acme.com/blog/launch-post", ""), ("https://acme.com/blog/", "Blog")]
+    assert classify_social_links(links, "https://acme.com").blog == "https://acme.com/blog/"
+
+
+def test_social_profiles_skip_share_links():
+    links = [
+        ("https://twitter.com/intent/tweet?url=acme", "Share"),
+        ("https://twitter.com/acme?ref=site", "Twitter"),
+        ("https://www.youtube.com/watch?v=123", "Video"),
+        ("https://www.youtube.com/@acme", "YouTube"),
+    ]
+    social_media_links = classify_social_links(links, "https://acme.com")
+    assert social_media_links.twitter == "https://twitter.com/acme"
+    assert social_media_links.youtube == "https://www.youtube.com/@acme"
@@ -0,0 +1,50 @@
+import pytest
+from sample_agent.tools.base.linkedin_tools import (
+    LINKEDIN_MATCH_THRESHOLD,
+    match_linkedin_url,
+    score_linkedin_result,
+)
+
+
+def result(slug, title="", snippet=""):
+    return {"link": f"https://www.linkedin.com/in/{slug}", "title": title, "snippet": snippet}
+
+
+def test_name_and_company_match_scores_high():
+    score = score_linkedin_result(
+        result("jane-doe-123", "Jane Doe - Head of Sales - Acme", "Jane leads sales at Acme."),
+        "Jane Doe", "Acme Inc"
+    )
+    assert score == pytest.approx(1.0)
+
+
+def test_name_without_company_evidence_scores_zero():
+    score = score_linkedin_result(result("jane-doe", "Jane Doe - Engineer - Globex"), "Jane Doe", "Acme Inc")
+    assert score == 0.0
+
+
+def test_non_profile_urls_score_zero():
+    search_result = {"link": "https://www.linkedin.com/company/acme", "title": "Jane Doe - Acme"}
+    assert score_linkedin_result(search_result, "Jane Doe", "Acme") == 0.0
+
+
+def test_full_name_namesake_is_not_matched():
+    search_results = [result("jane-doe", "Jane Doe - Engineer - Globex", "Jane works at Globex.")]
+    assert match_linkedin_url(search_results, "Jane Doe", "Acme") is None
+
+
+def test_confident_match_is_returned():
+    search_results = [
+        result("jane-doe-acme", "Jane Doe - Acme", "Head of Sales at Acme"),
+        result("jane-doe", "Jane Doe - Globex"),
+    ]
+    assert match_linkedin_url(search_results, "Jane Doe", "Acme") == "https://www.linkedin.com/in/jane-doe-acme"
+
+
+def test_ambiguous_profiles_fall_back_to_the_llm():
+    search_results = [
+        result("jane-doe-1", "Jane Doe - Acme"),
+        result("jane-doe-2", "Jane Doe - Acme"),
+    ]
+    assert score_linkedin_result(search_results[0], "Jane Doe", "Acme") >= LINKEDIN_MATCH_THRESHOLD
+    assert match_linkedin_url(search_results, "Jane Doe", "Acme") is None
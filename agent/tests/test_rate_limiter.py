@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from sample_agent.tools.base import rate_limiter
+from sample_agent.tools.base.rate_limiter import TokenBucket, arate_limited, rate_limited
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    return clock
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = TokenBucket("test", max_rate=10.0, burst=2)
+    monkeypatch.setitem(rate_limiter._limiters, "test", limiter)
+    return limiter
+
+
+def test_burst_is_free_then_requests_are_spaced(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=2)
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(0.1)
+    assert bucket._reserve() == pytest.approx(0.2)
+
+
+def test_tokens_refill_at_the_current_rate(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=2)
+    bucket._reserve()
+    bucket._reserve()
+    clock.now += 0.15
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(0.05)
+
+
+def test_throttling_halves_the_rate_and_drops_the_burst(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=5)
+    bucket.record_response(429, 0.1)
+    assert bucket.rate == pytest.approx(5.0)
+    assert bucket.tokens <= 0
+    assert bucket._reserve() > 0
+    bucket.record_response(503, 0.1)
+    assert bucket.rate == pytest.approx(2.5)
+
+
+def test_rate_never_drops_below_the_minimum(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=1)
+    for _ in range(20):
+        bucket.record_response(429, 0.1)
+    assert bucket.rate == pytest.approx(bucket.min_rate)
+
+
+def test_successes_recover_the_rate_additively_up_to_the_maximum(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=1, increase_step=1.0)
+    bucket.record_response(429, 0.1)
+    bucket.record_response(200, 0.1)
+    assert bucket.rate == pytest.approx(6.0)
+    for _ in range(10):
+        bucket.record_response(200, 0.1)
+    assert bucket.rate == pytest.approx(10.0)
+
+
+def test_errors_other_than_throttling_leave_the_rate_unchanged(clock):
+    bucket = TokenBucket("test", max_rate=10.0, burst=1)
+    bucket.record_response(429, 0.1)
+    bucket.record_response(500, 0.1)
+    bucket.record_response(None, 0.1)
+    assert bucket.rate == pytest.approx(5.0)
+    assert bucket.get_metrics()["requests"] == 3
+    assert bucket.get_metrics()["throttled"] == 1
+
+
+def test_rate_limited_records_the_reported_status(limiter):
+    with rate_limited("test") as slot:
+        slot.record(429)
+    assert limiter.throttled == 1
+    assert limiter.rate == pytest.approx(5.0)
+
+
+def test_rate_limited_records_throttling_exceptions(limiter):
+    class ResourceExhausted(Exception):
+        pass
+
+    with pytest.raises(ResourceExhausted):
+        with rate_limited("test"):
+            raise ResourceExhausted("429 RESOURCE_EXHAUSTED")
+    assert limiter.throttled == 1
+
+
+def test_arate_limited_records_the_reported_status(limiter):
+    async def request():
+        async with arate_limited("test") as slot:
+            slot.record(200)
+
+    asyncio.run(request())
+    assert limiter.requests == 1
+    assert limiter.throttled == 0